@@ -7,19 +7,23 @@
 ############################
 # User interface           #
 #                          #
-# Last update : 2025/08/27 #
+# Last update : 2026/10/18 #
 ############################
 
 import math
+import time
 import streamlit as st
-from services.search import run_search, DEFAULT_ORDER
+from services.search import DEFAULT_ORDER
+from services.resultset import ResultSet
 from services.i18n import detect_lang, translate_to_fr, lang_badge_html
-from services import paid_static
+from services import breaker, latency, metrics, page_prep, paid_static, posters, singleflight, tracing, warmup
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Config
 # ──────────────────────────────────────────────────────────────────────────────
 st.set_page_config(page_title="🎬 Movie Finder : agrégateur légal de films", page_icon="🎬", layout="wide")
+warmup.start()  # une fois par processus : profils langdetect + pools HTTP en arrière-plan
+metrics.start()  # export Prometheus si MOVIEFINDER_METRICS_FILE / _PORT
 st.title("🎬 Movie Finder : agrégateur légal de films")
 st.write("""
 Cette application agrège **uniquement** des sources *légales* :
@@ -40,10 +44,12 @@ if "loaded" not in st.session_state:
     st.session_state.loaded = False
 if "loaded_params" not in st.session_state:
     st.session_state.loaded_params = {}
-if "results_data" not in st.session_state:
-    st.session_state.results_data = {}
+if "result_set" not in st.session_state:
+    st.session_state.result_set = None
 if "last_query_text" not in st.session_state:
     st.session_state.last_query_text = ""
+if "traces" not in st.session_state:
+    st.session_state.traces = []  # spans (services.tracing) : dernière recherche, page affichée
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Widgets
@@ -73,77 +79,9 @@ with st.sidebar:
     )
     include_sub = st.checkbox("Inclure les offres d'abonnement", value=False)
     auto_translate = st.checkbox("Traduire automatiquement les résumés en français", value=True)
-    st.caption("Définissez YOUTUBE_API_KEY / TMDB_API_KEY dans les secrets Streamlit (Cloud) ou .streamlit/secrets.toml (local).")
-
-# ──────────────────────────────────────────────────────────────────────────────
-# Cache
-# ──────────────────────────────────────────────────────────────────────────────
-@st.cache_data(show_spinner=False, ttl=600)
-def cached_search(q: str, order: tuple[str, ...], enrich: bool, mode: str, include_sub: bool):
-    return run_search(
-        q,
-        max_results=50,
-        order=list(order),
-        enrich_tmdb=enrich,
-        mode=mode,
-        include_subscriptions=include_sub,
-    )
-
-# ──────────────────────────────────────────────────────────────────────────────
-# Bouton Rechercher seulement quand la requête change
-# ──────────────────────────────────────────────────────────────────────────────
-current_params = {
-    "query": (query or "").strip(),
-    "providers": tuple(st.session_state.get("providers_sel", DEFAULT_ORDER)),  # ← lit la valeur du multiselect
-    "enrich_tmdb": bool(enrich_tmdb),
-    "mode": mode,
-    "include_sub": bool(include_sub),
-}
-
-query_changed = current_params["query"] != st.session_state.last_query_text
-non_query_changed = (
-    st.session_state.loaded and
-    (current_params["providers"] != tuple(st.session_state.loaded_params.get("providers", ())) or
-     current_params["enrich_tmdb"] != st.session_state.loaded_params.get("enrich_tmdb") or
-     current_params["mode"] != st.session_state.loaded_params.get("mode") or
-     current_params["include_sub"] != st.session_state.loaded_params.get("include_sub"))
-)
-
-col_btn, col_info = st.columns([1, 3])
-with col_btn:
-    do_search = st.button("Rechercher", use_container_width=True, disabled=(not current_params["query"]))
-with col_info:
-    if query_changed and current_params["query"]:
-        st.caption("Nouvelle requête détectée → cliquez sur **Rechercher** pour lancer la recherche.")
-    elif not current_params["query"]:
-        st.caption("Saisissez une requête puis cliquez sur **Rechercher**.")
-
-should_run_now = (
-    (do_search and current_params["query"]) or
-    (non_query_changed and current_params["query"]) or
-    (not st.session_state.loaded and current_params["query"])
-)
-
-if should_run_now:
-    with st.spinner("Recherche en cours…"):
-        data = cached_search(
-            current_params["query"],
-            current_params["providers"],
-            current_params["enrich_tmdb"],
-            current_params["mode"],
-            current_params["include_sub"],
-        )
-    st.session_state.results_data = data
-    st.session_state.loaded = True
-    st.session_state.loaded_params = {
-        "providers": current_params["providers"],
-        "enrich_tmdb": current_params["enrich_tmdb"],
-        "mode": current_params["mode"],
-        "include_sub": current_params["include_sub"],
-    }
-    if do_search or not st.session_state.last_query_text:
-        st.session_state.page_free = 1
-        st.session_state.last_query_text = current_params["query"]
+    prefetch_next = st.checkbox("Précharger la page suivante", value=False,
+                                help="Récupère en arrière-plan les résultats de la page suivante.")
+    st.caption("Définissez YOUTUBE_API_KEY / TMDB_API_KEY dans les secrets Streamlit (Cloud), .streamlit/secrets.toml (local) ou en variables d'environnement.")
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Helpers
@@ -170,23 +108,28 @@ def _cmp_key(t: str) -> str:
     t = re.sub(r"\s+", " ", t)
     return t
 
-def _card(movie, auto_translate: bool):
+def _card(movie, auto_translate: bool, prep=None):
+    """`prep` : page_prep.CardText précalculé (langue, traduction) ; sinon calcul à la volée."""
     cols = st.columns([1, 3])
     with cols[0]:
         if movie.poster_url:
-            st.image(movie.poster_url, use_container_width=True)
+            # miniature locale si déjà en cache, sinon l'URL d'origine
+            st.image(posters.get(movie.poster_url) or movie.poster_url, use_container_width=True)
     with cols[1]:
         header_cols = st.columns([6, 1])
         with header_cols[0]:
             st.markdown(f"### {movie.title}")
         with header_cols[1]:
-            # échantillon plus riche pour la détection (titre + résumé)
-            desc = movie.description
-            if isinstance(desc, list):
-                desc = " ".join([str(x) for x in desc if x])
-            desc = (desc or "")
-            sample_text = f"{movie.title}\n{desc}"
-            st.markdown(lang_badge_html(sample_text), unsafe_allow_html=True)
+            if prep is not None:
+                st.markdown(lang_badge_html("", code=prep.lang), unsafe_allow_html=True)
+            else:
+                # échantillon plus riche pour la détection (titre + résumé)
+                desc = movie.description
+                if isinstance(desc, list):
+                    desc = " ".join([str(x) for x in desc if x])
+                desc = (desc or "")
+                sample_text = f"{movie.title}\n{desc}"
+                st.markdown(lang_badge_html(sample_text), unsafe_allow_html=True)
 
         meta = []
         if movie.year:
@@ -210,11 +153,17 @@ def _card(movie, auto_translate: bool):
             desc = (desc or "").strip()
 
             if auto_translate:
-                # Traduire si détection ≠ fr OU inconnue
-                code = detect_lang(f"{movie.title}\n{desc}")
-                need_translate = (code != "fr") or (code is None)
+                if prep is not None and prep.translated:
+                    # traduction déjà faite pour la page visible (None = inutile)
+                    need_translate = prep.translation is not None
+                    res = prep.translation
+                else:
+                    # Traduire si détection ≠ fr OU inconnue
+                    code = detect_lang(f"{movie.title}\n{desc}")
+                    need_translate = (code != "fr") or (code is None)
+                    res = translate_to_fr(desc) if need_translate else None
                 if need_translate:
-                    translated, ok, _ = _unpack_translate(translate_to_fr(desc))
+                    translated, ok, _ = _unpack_translate(res)
                     if ok and translated and (_cmp_key(translated) != _cmp_key(desc)):
                         with st.expander("Traduction (FR)"):
                             st.write(translated)
@@ -239,58 +188,220 @@ def _card(movie, auto_translate: bool):
             if movie.stream_url:
                 st.code(movie.stream_url)
 
-def _paginate(items, page, per_page):
-    total = len(items)
-    total_pages = max(1, int((total + per_page - 1) // per_page))
-    page = max(1, min(page, total_pages))
-    start = (page - 1) * per_page
-    end = start + per_page
-    return items[start:end], page, total_pages, total
+def _go_page(delta: int):
+    st.session_state.page_free = max(1, st.session_state.page_free + delta)
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Cache
+# ──────────────────────────────────────────────────────────────────────────────
+SEARCH_TTL = 600  # secondes
+SEARCH_DEADLINE_MS = 8000  # au-delà, on affiche ce qui est arrivé (résultats partiels)
+
+@st.cache_resource(show_spinner=False)
+def _search_cache() -> dict:
+    # Partagé entre sessions : {params: (horodatage, résultats)}
+    return {}
+
+@st.cache_resource(show_spinner=False)
+def _search_inflight() -> singleflight.Group:
+    # Recherches identiques simultanées (plusieurs sessions) : une seule exécution
+    return singleflight.Group()
+
+def cached_search(q: str, order: tuple[str, ...], mode: str, include_sub: bool,
+                  page_size: int, on_result=None) -> ResultSet:
+    """
+    ResultSet en cache (TTL) sinon nouveau ResultSet dont seule la 1ʳᵉ page de
+    chaque provider est récupérée, en streaming : `on_result(partial)` est appelé
+    à chaque provider terminé. Les pages suivantes ne sont chargées que si
+    l'utilisateur avance (voir ResultSet.page). L'enrichissement TMDB et la
+    traduction ne sont pas faits ici mais page par page (voir page_prep).
+    Chaque tour est borné par SEARCH_DEADLINE_MS (voir `rs.timed_out`).
+    Une session qui lance la même recherche qu'une autre déjà en cours attend
+    son résultat au lieu d'interroger à nouveau les providers (sans affichage progressif).
+    """
+    # page_size en fait partie : la taille des tours du ResultSet en dépend
+    key = (singleflight.normalize(q), order, mode, include_sub, page_size)
+    hit = _search_cache().get(key)
+    if hit and time.time() - hit[0] < SEARCH_TTL:
+        metrics.cache("search", True)
+        return hit[1]
+    metrics.cache("search", False)
+    return _search_inflight().do(key, _start_search, key, q, order, mode, include_sub, page_size, on_result)
+
+def _start_search(key, q, order, mode, include_sub, page_size, on_result):
+    rs = ResultSet(
+        q,
+        list(order),
+        page_size=page_size,
+        enrich_tmdb=False,  # fait à l'affichage, pour la page visible seulement
+        mode=mode,
+        include_subscriptions=include_sub,
+        deadline_ms=SEARCH_DEADLINE_MS,
+    )
+    rs.fetch_round(on_result)
+    if rs.partial:
+        return rs  # pas de mise en cache des résultats incomplets
+
+    cache = _search_cache()
+    now = time.time()
+    for old in [k for k, (ts, _) in cache.items() if now - ts >= SEARCH_TTL]:
+        cache.pop(old, None)
+    cache[key] = (now, rs)
+    return rs
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Bouton Rechercher seulement quand la requête change
+# ──────────────────────────────────────────────────────────────────────────────
+current_params = {
+    "query": (query or "").strip(),
+    "providers": tuple(st.session_state.get("providers_sel", DEFAULT_ORDER)),  # ← lit la valeur du multiselect
+    "enrich_tmdb": bool(enrich_tmdb),
+    "mode": mode,
+    "include_sub": bool(include_sub),
+}
+
+query_changed = current_params["query"] != st.session_state.last_query_text
+non_query_changed = (
+    st.session_state.loaded and
+    (current_params["providers"] != tuple(st.session_state.loaded_params.get("providers", ())) or
+     current_params["enrich_tmdb"] != st.session_state.loaded_params.get("enrich_tmdb") or
+     current_params["mode"] != st.session_state.loaded_params.get("mode") or
+     current_params["include_sub"] != st.session_state.loaded_params.get("include_sub"))
+)
+
+col_btn, col_info = st.columns([1, 3])
+with col_btn:
+    do_search = st.button("Rechercher", use_container_width=True, disabled=(not current_params["query"]))
+with col_info:
+    if query_changed and current_params["query"]:
+        st.caption("Nouvelle requête détectée → cliquez sur **Rechercher** pour lancer la recherche.")
+    elif not current_params["query"]:
+        st.caption("Saisissez une requête puis cliquez sur **Rechercher**.")
+
+should_run_now = (
+    (do_search and current_params["query"]) or
+    (non_query_changed and current_params["query"]) or
+    (not st.session_state.loaded and current_params["query"])
+)
+
+if should_run_now:
+    # Affichage progressif : les résultats gratuits apparaissent provider par provider
+    live = st.empty()
+    live_free_keys = [k for k in current_params["providers"] if k != "paid"]
+
+    def _render_partial(partial):
+        received = []
+        for k in live_free_keys:
+            received.extend(partial.get(k, []))
+        pending = [k for k in live_free_keys if k not in partial]
+        if not pending:
+            return
+        with live.container():
+            st.subheader("Résultats – Gratuit")
+            st.caption(f"{len(received)} éléments reçus — en attente : {', '.join(pending)}…")
+            # aperçu sans traduction : la page complète (traduite) s'affiche à la fin
+            for m in received[:per_page]:
+                _card(m, False)
+
+    with st.spinner("Recherche en cours…"), \
+            tracing.span("search", root=True, query=current_params["query"]) as search_trace:
+        rs = cached_search(
+            current_params["query"],
+            current_params["providers"],
+            current_params["mode"],
+            current_params["include_sub"],
+            page_size=per_page,
+            on_result=_render_partial,
+        )
+    live.empty()
+    st.session_state.traces = [search_trace]
+    st.session_state.result_set = rs
+    st.session_state.loaded = True
+    st.session_state.loaded_params = {
+        "providers": current_params["providers"],
+        "enrich_tmdb": current_params["enrich_tmdb"],
+        "mode": current_params["mode"],
+        "include_sub": current_params["include_sub"],
+    }
+    if do_search or not st.session_state.last_query_text:
+        st.session_state.page_free = 1
+        st.session_state.last_query_text = current_params["query"]
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Affichage des résultats
 # ──────────────────────────────────────────────────────────────────────────────
-if st.session_state.loaded and st.session_state.results_data:
-    free_keys = [k for k in current_params["providers"] if k != "paid"]
-    free_all = []
-    for k in free_keys:
-        free_all.extend(st.session_state.results_data.get(k, []))
+# Fragment : les boutons de pagination et les expanders ne relancent que cette
+# zone (pas la barre latérale, la saisie ni le debug). Le fragment reçoit le
+# ResultSet déjà calculé par la recherche ; à ses reruns, Streamlit le rappelle
+# avec les arguments du dernier rerun complet.
+@st.fragment
+def _results(rs, params: dict, per_page: int, auto_translate: bool, prefetch_next: bool):
+    free_keys = [k for k in params["providers"] if k != "paid"]
 
     st.subheader("Résultats – Gratuit")
-    if not free_all:
-        st.caption("(aucun résultat gratuit)")
-    else:
-        page_items, st.session_state.page_free, total_pages, total = _paginate(
-            free_all, st.session_state.page_free, per_page
+    # ne récupère la page suivante des providers que si l'on avance
+    with st.spinner("Chargement de la page…"), \
+            tracing.span("page", root=True, page=st.session_state.page_free) as page_trace:
+        page_items, st.session_state.page_free, has_next = rs.page(
+            st.session_state.page_free, per_page, free_keys
+        )
+        # enrichissement TMDB + détection/traduction : uniquement la page visible
+        page_cards = page_prep.prepare(
+            page_items, enrich_tmdb=params["enrich_tmdb"], auto_translate=auto_translate
+        )
+    # trace de la recherche (si lancée à ce rerun) + trace de la page affichée
+    st.session_state.traces = st.session_state.traces[:1] + [page_trace]
+
+    if rs.timed_out:
+        st.warning(
+            f"Résultats partiels — sans réponse après {SEARCH_DEADLINE_MS // 1000} s : "
+            f"{', '.join(rs.timed_out)}. Relancez la recherche pour réessayer."
+        )
+    if rs.skipped:
+        st.warning(
+            f"Sources momentanément ignorées (service en panne, nouvel essai automatique) : "
+            f"{', '.join(rs.skipped)}."
         )
 
+    if not page_items:
+        st.caption("(aucun résultat gratuit)")
+    else:
+        loaded = len(rs.items(free_keys))
         nav1, info, nav2 = st.columns([1, 2, 1])
         with nav1:
-            if st.button("⬅️ Précédent", disabled=(st.session_state.page_free <= 1), key="prev_free_btn"):
-                st.session_state.page_free -= 1
+            st.button("⬅️ Précédent", disabled=(st.session_state.page_free <= 1), key="prev_free_btn",
+                      on_click=_go_page, args=(-1,))
         with info:
-            st.write(f"Page {st.session_state.page_free} / {total_pages} — {total} éléments")
+            suffix = " (d'autres à venir)" if has_next else ""
+            st.write(f"Page {st.session_state.page_free} — {loaded} éléments chargés{suffix}")
         with nav2:
-            if st.button("Suivant ➡️", disabled=(st.session_state.page_free >= total_pages), key="next_free_btn"):
-                st.session_state.page_free += 1
+            st.button("Suivant ➡️", disabled=not has_next, key="next_free_btn",
+                      on_click=_go_page, args=(1,))
+
+        # copies enrichies (TMDB) : les Movie du ResultSet partagé restent intacts
+        for m, prep in page_cards:
+            _card(m, auto_translate, prep)
 
-        for m in page_items:
-            _card(m, auto_translate)
+        # miniatures de la page suivante (si déjà chargée), en arrière-plan
+        nxt = st.session_state.page_free * per_page
+        posters.prefetch(m.poster_url for m in rs.items(free_keys)[nxt:nxt + per_page])
+        if prefetch_next and has_next:
+            rs.prefetch(st.session_state.page_free + 1, per_page, free_keys)
 
     # ——— Section payante (après la partie “Résultats – Gratuit”) ———
-    if "paid" in current_params["providers"] and current_params["mode"] != "autres":
+    if "paid" in params["providers"] and params["mode"] != "autres":
         st.subheader("Pistes – Payant (achat/location confirmés)")
-        paid_list = st.session_state.results_data.get("paid", []) or []
+        paid_list = rs.items(["paid"])
 
         if paid_list:
-            for m in paid_list:
-                _card(m, auto_translate)
+            for m, prep in page_prep.prepare(paid_list, enrich_tmdb=False, auto_translate=auto_translate):
+                _card(m, auto_translate, prep)
         else:
             st.caption("Aucune plateforme payante confirmée (achat/location) pour ce titre en FR via JustWatch.")
             # ✅ Mode hybride : l’utilisateur peut choisir d’afficher des liens de recherche génériques
             with st.expander("Afficher aussi des liens de recherche génériques (JustWatch, YouTube VOD)"):
-                if current_params["query"]:
-                    fallbacks = paid_static.search(current_params["query"], max_results=6, country="FR")
+                if params["query"]:
+                    fallbacks = paid_static.search(params["query"], max_results=6, country="FR")
                     for m in fallbacks:
                         cols = st.columns([3, 1])
                         with cols[0]:
@@ -301,6 +412,9 @@ if st.session_state.loaded and st.session_state.results_data:
                 else:
                     st.info("Saisissez une requête pour voir des liens de recherche génériques.")
 
+
+if st.session_state.loaded and st.session_state.result_set is not None:
+    _results(st.session_state.result_set, current_params, per_page, auto_translate, prefetch_next)
 else:
     st.info("Entrez une requête puis cliquez sur **Rechercher** pour lancer la première recherche.")
 
@@ -316,10 +430,27 @@ if st.sidebar.button("Réinitialiser options"):
 # Debug temporaire (sécurisé)
 # ──────────────────────────────────────────────────────────────────────────────
 with st.expander("🔧 Debug (temporaire)"):
-    res = st.session_state.results_data or {}
+    rs = st.session_state.result_set
     st.write("Providers actifs:", current_params["providers"])
     st.write("Mode:", current_params["mode"])
-    st.write("Clés résultats:", list(res.keys()))
-    st.write("Nb options payantes:", len(res.get("paid", [])))
-
-
+    st.write("Clés résultats:", list(rs.order) if rs else [])
+    st.write("Pages chargées (tours):", rs.rounds if rs else 0)
+    st.write("Nb options payantes:", len(rs.items(["paid"])) if rs else 0)
+    st.write("Coupe-circuits :", breaker.states() or "aucun appel")
+    st.write("Latences amont (délais adaptatifs) :")
+    st.dataframe(latency.stats(), use_container_width=True)
+    m = metrics.snapshot()
+    st.write("Latences (ms) :")
+    st.dataframe(m["latencies"], use_container_width=True)
+    st.write("Caches :")
+    st.dataframe(m["caches"], use_container_width=True)
+    if m["counters"]:
+        st.write("Erreurs / délais / réponses vides :")
+        st.dataframe(m["counters"], use_container_width=True)
+    for i, trace in enumerate(st.session_state.traces):
+        st.write(f"Trace « {trace.name} » — {trace.duration * 1000:.0f} ms")
+        st.code(tracing.waterfall(trace), language=None)
+        st.download_button(
+            "Télécharger (JSON)", tracing.to_json(trace), file_name=f"trace-{trace.name}.json",
+            mime="application/json", key=f"trace_json_{i}",
+        )
@@ -0,0 +1,7 @@
+############################
+# Benchmarks               #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Benchmarks hors ligne (serveur amont factice) : voir bench/run.py.
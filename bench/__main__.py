@@ -0,0 +1,11 @@
+############################
+# Benchmarks (CLI)         #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import sys
+
+from .run import main
+
+sys.exit(main())
@@ -0,0 +1,219 @@
+############################
+# Bench : load test        #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Test de charge : N sessions simultanées (un thread chacune, comme Streamlit)
+# enchaînent des recherches contre bench.stub_server.
+#     python -m bench.load --sessions 1,10,25,50 --duration 20 --slo-ms 2000
+#     python -m bench.load --path run_search      # ancien chemin (CLI, batch)
+#
+# Chemin « ui » (défaut) : celui de app.py pour une recherche non encore en
+# cache — ResultSet.fetch_round (1ʳᵉ page de chaque provider), ResultSet.page,
+# puis page_prep.prepare (TMDB, langue, miniatures) pour la page gratuite et
+# les offres payantes. La traduction passe par Google Translate, que le stub
+# ne simule pas : elle n'est mesurée qu'avec --translate (réseau réel).
+#
+# Par palier : débit, percentiles de latence, erreurs, pic de threads et de
+# RSS ; avec --slo-ms, le plus grand palier dont le p95 tient l'objectif.
+
+import argparse
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .run import QUERIES, Stub, _configure, _percentile, _reset_caches
+
+# Part des recherches tirées des titres populaires (le reste : requêtes uniques).
+POPULAR_SHARE = 0.6
+SAMPLE_INTERVAL = 0.05
+PER_PAGE = 12           # valeur par défaut du curseur « Éléments par page »
+DEADLINE_MS = 8000      # app.SEARCH_DEADLINE_MS
+
+
+@dataclass
+class Level:
+    sessions: int
+    searches: int
+    errors: int
+    throughput_qps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    peak_threads: int
+    peak_rss_mib: float
+
+
+def rss_mib() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Sampler:
+    """Background sampling of thread count and RSS peaks."""
+
+    def __init__(self):
+        self.peak_threads = 0
+        self.peak_rss = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="load-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+            self.peak_rss = max(self.peak_rss, rss_mib())
+            self._stop.wait(SAMPLE_INTERVAL)
+
+    def __enter__(self) -> "Sampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _query(rng: random.Random, counter: List[int]) -> str:
+    if rng.random() < POPULAR_SHARE:
+        return rng.choice(QUERIES)
+    counter[0] += 1
+    return f"{rng.choice(QUERIES)} {counter[0]}"
+
+
+def _ui_search(query: str, translate: bool = False) -> None:
+    """One search as app.py runs it (cache miss), up to the rendered first page."""
+    from services import page_prep
+    from services.resultset import ResultSet
+    from services.search import DEFAULT_ORDER
+
+    rs = ResultSet(query, DEFAULT_ORDER, page_size=PER_PAGE, enrich_tmdb=False, deadline_ms=DEADLINE_MS)
+    rs.fetch_round()
+    free_keys = [k for k in rs.order if k != "paid"]
+    items, _, _ = rs.page(1, PER_PAGE, free_keys)
+    page_prep.prepare(items, enrich_tmdb=True, auto_translate=translate)
+    page_prep.prepare(rs.items(["paid"]), enrich_tmdb=False, auto_translate=translate)
+
+
+def run_level(sessions: int, duration: float, think: float, seed: int, path: str = "ui",
+              translate: bool = False) -> Level:
+    from services.search import run_search
+
+    if path == "ui":
+        search = lambda q: _ui_search(q, translate)
+    else:
+        search = run_search
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def session(i: int) -> None:
+        rng = random.Random(seed + i)
+        counter = [i * 1_000_000]
+        while time.monotonic() < deadline:
+            q = _query(rng, counter)
+            start = time.perf_counter()
+            try:
+                search(q)
+                ok = True
+            except Exception:
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    errors[0] += 1
+            if think:
+                time.sleep(rng.expovariate(1 / think))
+
+    start = time.perf_counter()
+    with Sampler() as sampler:
+        threads = [threading.Thread(target=session, args=(i,), name=f"session-{i}") for i in range(sessions)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    wall = time.perf_counter() - start
+    lat = latencies or [0.0]
+    return Level(
+        sessions=sessions,
+        searches=len(latencies),
+        errors=errors[0],
+        throughput_qps=round(len(latencies) / wall, 2),
+        p50_ms=round(_percentile(lat, 0.5), 1),
+        p95_ms=round(_percentile(lat, 0.95), 1),
+        p99_ms=round(_percentile(lat, 0.99), 1),
+        max_ms=round(max(lat), 1),
+        peak_threads=sampler.peak_threads,
+        peak_rss_mib=round(sampler.peak_rss, 1),
+    )
+
+
+def _table(levels: List[Level]) -> str:
+    cols = list(Level.__dataclass_fields__)
+    rows = [[str(getattr(l, c)) for c in cols] for l in levels]
+    widths = [max(len(c), *(len(row[i]) for row in rows)) for i, c in enumerate(cols)]
+    line = lambda cells: "  ".join(cell.rjust(w) for cell, w in zip(cells, widths))
+    return "\n".join([line(cols)] + [line(r) for r in rows])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.load", description="Concurrent-session load test.")
+    p.add_argument("--sessions", default="1,5,10,25",
+                   help="comma-separated concurrent session counts, one level each (default: %(default)s)")
+    p.add_argument("--duration", type=float, default=15.0, help="seconds per level")
+    p.add_argument("--think", type=float, default=1.0, help="mean think time between searches (seconds)")
+    p.add_argument("--latency", type=float, default=0.05, help="stub upstream latency (seconds)")
+    p.add_argument("--slo-ms", type=float, default=None, help="p95 latency target used to size a replica")
+    p.add_argument("--warm", action="store_true", help="keep caches between levels (default: cold per level)")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--path", choices=["ui", "run_search"], default="ui",
+                   help="ui: ResultSet + page_prep as app.py does (default); run_search: batch path")
+    p.add_argument("--translate", action="store_true",
+                   help="ui path: translate summaries (Google Translate, not stubbed: real network)")
+    args = p.parse_args(argv)
+    counts = [int(x) for x in args.sessions.split(",") if x]
+
+    stub = Stub()
+    cache_dir = tempfile.mkdtemp(prefix="moviefinder-load-")
+    levels: List[Level] = []
+    try:
+        _configure(stub, cache_dir)
+        stub.control("latency", {"*": args.latency})
+        for n in counts:
+            if not args.warm:
+                _reset_caches(cache_dir)
+            print(f"… {n} sessions, {args.duration:g} s, chemin {args.path}", file=sys.stderr, flush=True)
+            levels.append(run_level(n, args.duration, args.think, args.seed, args.path, args.translate))
+    finally:
+        stub.close()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(_table(levels))
+    if args.slo_ms is not None:
+        ok = [l.sessions for l in levels if l.p95_ms <= args.slo_ms and not l.errors]
+        if ok:
+            print(f"\np95 ≤ {args.slo_ms:g} ms jusqu'à {max(ok)} sessions simultanées par réplique")
+        else:
+            print(f"\np95 > {args.slo_ms:g} ms dès {counts[0]} sessions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
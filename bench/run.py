@@ -0,0 +1,219 @@
+############################
+# Bench : scenarios        #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Benchmark hors ligne de run_search contre bench.stub_server :
+#     python -m bench                         # tous les scénarios
+#     python -m bench -s warm -n 50 -c 8 --json baseline.json
+#     python -m bench.load --sessions 1,10,25   # test de charge (bench/load.py)
+#
+# Pour chaque scénario : latence de bout en bout (séquentielle), débit
+# (requêtes concurrentes), allocations (tracemalloc, passe séparée pour ne pas
+# fausser les temps) et requêtes reçues par l'amont.
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+QUERIES = ["nosferatu", "metropolis", "buster keaton", "charade", "western muet", "the kid"]
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    latency: Dict[str, float]
+    cold: bool = False           # caches vidés avant chaque recherche
+    enrich_tmdb: bool = True
+
+
+SCENARIOS: Dict[str, Scenario] = {s.name: s for s in [
+    Scenario("cold", "caches vides avant chaque recherche, amont à 20 ms", {"*": 0.02}, cold=True),
+    Scenario("warm", "caches chauds (TMDB, JustWatch), amont à 20 ms", {"*": 0.02}),
+    Scenario("slow_upstream", "caches vides, amont à 300 ms et JustWatch à 1 s",
+             {"*": 0.3, "apis.justwatch.com": 1.0}, cold=True),
+]}
+
+
+@dataclass
+class Result:
+    scenario: str
+    searches: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    throughput_qps: float
+    concurrency: int
+    alloc_peak_kib: float
+    alloc_blocks: int
+    gc_gen0: int
+    upstream_requests: Dict[str, int] = field(default_factory=dict)
+
+
+# ── Stub server ────────────────────────────────────────────────────────────
+class Stub:
+    """bench.stub_server in a child process (keeps its GIL out of the timings)."""
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "bench.stub_server", "--port", "0"],
+            stdout=subprocess.PIPE, text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+        self.port = int(self.proc.stdout.readline())
+        self.base = f"http://127.0.0.1:{self.port}"
+
+    def control(self, path: str, payload: Optional[dict] = None) -> dict:
+        data = None if payload is None else json.dumps(payload).encode("utf-8")
+        with urllib.request.urlopen(f"{self.base}/_control/{path}", data=data, timeout=5) as r:
+            return json.loads(r.read() or b"{}")
+
+    def close(self) -> None:
+        self.proc.terminate()
+        self.proc.wait(timeout=5)
+
+
+# ── Environment ────────────────────────────────────────────────────────────
+def _configure(stub: Stub, cache_dir: str) -> None:
+    os.environ["MOVIEFINDER_BASE_URLS"] = f"*={stub.base}"
+    os.environ["MOVIEFINDER_CACHE_DIR"] = cache_dir
+    os.environ.setdefault("TMDB_API_KEY", "bench")
+    os.environ.setdefault("YOUTUBE_API_KEY", "bench")
+    from services import ratelimit
+    # mesurer le code, pas les quotas des APIs réelles
+    for host in list(ratelimit.RATES):
+        ratelimit.configure(host, 1e6)
+
+
+def _reset_caches(cache_dir: str) -> None:
+    """Back to a just-started process: empty disk caches, in-process memos,
+    clients and pools."""
+    from services import http_client, langid, page_prep, paid_dynamic
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(cache_dir, exist_ok=True)
+    page_prep.reset()
+    langid.reset()
+    paid_dynamic._clients.clear()
+    paid_dynamic._providers.clear()
+    with http_client._lock:
+        for s in http_client._sessions.values():
+            s.close()
+        http_client._sessions.clear()
+
+
+def _search(query: str, scenario: Scenario) -> None:
+    from services.search import run_search
+    run_search(query, enrich_tmdb=scenario.enrich_tmdb)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run_scenario(scenario: Scenario, stub: Stub, cache_dir: str, iterations: int, concurrency: int) -> Result:
+    stub.control("latency", scenario.latency)
+    _reset_caches(cache_dir)
+    if not scenario.cold:
+        for q in QUERIES:   # amorçage : caches chauds
+            _search(q, scenario)
+    stub.control("reset", {})
+
+    # 1) latence, séquentielle
+    latencies = []
+    gc0 = gc.get_stats()[0]["collections"]
+    for i in range(iterations):
+        if scenario.cold:
+            _reset_caches(cache_dir)
+        start = time.perf_counter()
+        _search(QUERIES[i % len(QUERIES)], scenario)
+        latencies.append((time.perf_counter() - start) * 1000)
+    gc0 = gc.get_stats()[0]["collections"] - gc0
+    upstream = stub.control("stats")
+
+    # 2) débit, requêtes concurrentes (caches dans l'état du scénario au départ)
+    if scenario.cold:
+        _reset_caches(cache_dir)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        list(ex.map(lambda i: _search(QUERIES[i % len(QUERIES)], scenario), range(iterations)))
+    qps = iterations / (time.perf_counter() - start)
+
+    # 3) allocations, passe séparée (tracemalloc ralentit tout)
+    if scenario.cold:
+        _reset_caches(cache_dir)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for q in QUERIES:
+        _search(q, scenario)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(max(0, d.count_diff) for d in after.compare_to(before, "filename"))
+
+    return Result(
+        scenario=scenario.name,
+        searches=iterations,
+        mean_ms=round(statistics.mean(latencies), 1),
+        p50_ms=round(_percentile(latencies, 0.5), 1),
+        p95_ms=round(_percentile(latencies, 0.95), 1),
+        max_ms=round(max(latencies), 1),
+        throughput_qps=round(qps, 2),
+        concurrency=concurrency,
+        alloc_peak_kib=round(peak / 1024, 1),
+        alloc_blocks=blocks,
+        gc_gen0=gc0,
+        upstream_requests=upstream,
+    )
+
+
+def _table(results: List[Result]) -> str:
+    cols = ["scenario", "searches", "mean_ms", "p50_ms", "p95_ms", "max_ms", "throughput_qps",
+            "alloc_peak_kib", "alloc_blocks", "gc_gen0"]
+    rows = [[str(getattr(r, c)) for c in cols] for r in results]
+    widths = [max(len(c), *(len(row[i]) for row in rows)) for i, c in enumerate(cols)]
+    line = lambda cells: "  ".join(cell.rjust(w) for cell, w in zip(cells, widths))
+    return "\n".join([line(cols)] + [line(r) for r in rows])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench", description="Offline run_search benchmarks.")
+    p.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                   help="scenario to run (repeatable; default: all)")
+    p.add_argument("-n", "--iterations", type=int, default=30, help="searches per pass")
+    p.add_argument("-c", "--concurrency", type=int, default=4, help="threads for the throughput pass")
+    p.add_argument("--json", default=None, help="also write the results to this file")
+    args = p.parse_args(argv)
+
+    stub = Stub()
+    cache_dir = tempfile.mkdtemp(prefix="moviefinder-bench-")
+    try:
+        _configure(stub, cache_dir)
+        results = []
+        for name in args.scenario or list(SCENARIOS):
+            print(f"… {name} : {SCENARIOS[name].description}", file=sys.stderr, flush=True)
+            results.append(run_scenario(SCENARIOS[name], stub, cache_dir, args.iterations, args.concurrency))
+    finally:
+        stub.close()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(_table(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": [asdict(r) for r in results]}, f, indent=2)
+    return 0
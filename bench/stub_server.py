@@ -0,0 +1,223 @@
+############################
+# Bench : stub upstreams   #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Faux serveur des APIs amont (Archive.org, YouTube, TMDB, iTunes, JustWatch,
+# MyMemory) rejouant les réponses de bench/fixtures, avec latence injectée.
+# Les services y sont redirigés par MOVIEFINDER_BASE_URLS="*=http://127.0.0.1:<port>" :
+# https://<hôte>/<chemin> devient http://127.0.0.1:<port>/<hôte>/<chemin>.
+#
+#     python -m bench.stub_server --port 8700 --latency 0.02 --latency apis.justwatch.com=0.5
+#
+# Contrôle à chaud :
+#     POST /_control/latency   {"*": 0.05, "apis.justwatch.com": 0.8}
+#     GET  /_control/stats     nombre de requêtes reçues par hôte
+#     POST /_control/reset     remet les compteurs à zéro
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_fixtures: Dict[str, Any] = {}
+_latency: Dict[str, float] = {"*": 0.0}
+_counts: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def fixture(name: str) -> Any:
+    data = _fixtures.get(name)
+    if data is None:
+        with open(os.path.join(FIXTURES_DIR, f"{name}.json"), encoding="utf-8") as f:
+            data = _fixtures[name] = json.load(f)
+    return data
+
+
+def _first(qs: Dict[str, List[str]], key: str, default: str = "") -> str:
+    return (qs.get(key) or [default])[0]
+
+
+# ── Routes : (hôte, regex du chemin) -> handler(match, query, body) ─────────
+def _archive_search(m, qs, body):
+    docs = fixture("archive_search")["docs"]
+    rows = int(_first(qs, "rows", "20"))
+    page = int(_first(qs, "page", "1"))
+    start = (page - 1) * rows
+    return {"responseHeader": {"status": 0}, "response": {"numFound": len(docs), "start": start,
+                                                          "docs": docs[start:start + rows]}}
+
+
+def _archive_scrape(m, qs, body):
+    docs = fixture("archive_search")["docs"]
+    return {"items": docs, "count": len(docs), "total": len(docs)}
+
+
+def _youtube_search(m, qs, body):
+    items = fixture("youtube_search")["items"]
+    size = int(_first(qs, "maxResults", "20"))
+    start = int(_first(qs, "pageToken", "0") or 0)
+    out = {"kind": "youtube#searchListResponse", "items": items[start:start + size]}
+    if start + size < len(items):
+        out["nextPageToken"] = str(start + size)
+    return out
+
+
+def _tmdb_search(m, qs, body):
+    data = fixture("tmdb_search")
+    title = _first(qs, "query")
+    results = [dict(r, title=title or r["title"]) for r in data["results"]]
+    return dict(data, results=results)
+
+
+def _tmdb_movie(m, qs, body):
+    return dict(fixture("tmdb_movie"), id=int(m.group(1)))
+
+
+def _itunes_search(m, qs, body):
+    results = fixture("itunes_search")["results"]
+    limit = int(_first(qs, "limit", "50"))
+    offset = int(_first(qs, "offset", "0"))
+    page = results[offset:offset + limit]
+    return {"resultCount": len(page), "results": page}
+
+
+def _justwatch(name: str) -> Callable:
+    return lambda m, qs, body: fixture(name)
+
+
+def _justwatch_title(m, qs, body):
+    return dict(fixture("justwatch_title"), id=int(m.group(1)))
+
+
+def _mymemory(m, qs, body):
+    return {"responseData": {"translatedText": f"[fr] {_first(qs, 'q')}", "match": 1},
+            "responseStatus": 200}
+
+
+ROUTES: List[Tuple[str, "re.Pattern[str]", Callable]] = [
+    ("archive.org", re.compile(r"^/advancedsearch\.php$"), _archive_search),
+    ("archive.org", re.compile(r"^/services/search/v1/scrape$"), _archive_scrape),
+    ("www.googleapis.com", re.compile(r"^/youtube/v3/search$"), _youtube_search),
+    ("api.themoviedb.org", re.compile(r"^/3/search/movie$"), _tmdb_search),
+    ("api.themoviedb.org", re.compile(r"^/3/movie/(\d+)$"), _tmdb_movie),
+    ("itunes.apple.com", re.compile(r"^/search$"), _itunes_search),
+    ("apis.justwatch.com", re.compile(r"^/content/locales/state$"), _justwatch("justwatch_locales")),
+    ("apis.justwatch.com", re.compile(r"^/content/providers/locale/\w+$"), _justwatch("justwatch_providers")),
+    ("apis.justwatch.com", re.compile(r"^/content/titles/\w+/popular$"), _justwatch("justwatch_popular")),
+    ("apis.justwatch.com", re.compile(r"^/content/titles/movie/(\d+)/locale/\w+$"), _justwatch_title),
+    ("api.mymemory.translated.net", re.compile(r"^/get$"), _mymemory),
+]
+
+
+def latency_for(host: str) -> float:
+    return _latency.get(host, _latency.get("*", 0.0))
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, comme les vrais serveurs
+
+    def _send(self, status: int, payload: Any = None) -> None:
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _control(self, path: str, body: bytes) -> None:
+        if path == "/_control/latency" and self.command == "POST":
+            with _lock:
+                _latency.update({k: float(v) for k, v in json.loads(body or b"{}").items()})
+            self._send(200, dict(_latency))
+        elif path == "/_control/stats":
+            with _lock:
+                self._send(200, dict(_counts))
+        elif path == "/_control/reset" and self.command == "POST":
+            with _lock:
+                _counts.clear()
+            self._send(200, {})
+        else:
+            self._send(404, {"error": "unknown control"})
+
+    def _handle(self) -> None:
+        parts = urlsplit(self.path)
+        body = self._body()
+        if parts.path.startswith("/_control/"):
+            self._control(parts.path, body)
+            return
+        host, _, rest = parts.path.lstrip("/").partition("/")
+        rest = "/" + rest
+        with _lock:
+            _counts[host] = _counts.get(host, 0) + 1
+        delay = latency_for(host)
+        if delay > 0:
+            time.sleep(delay)
+        if self.command == "HEAD":
+            self._send(200)
+            return
+        qs = parse_qs(parts.query)
+        for route_host, pattern, handler in ROUTES:
+            if route_host != host:
+                continue
+            m = pattern.match(rest)
+            if m:
+                self._send(200, handler(m, qs, body))
+                return
+        self._send(404, {"error": f"no fixture for {host}{rest}"})
+
+    do_GET = do_POST = do_HEAD = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port: int = 0, host: str = "127.0.0.1", latency: Optional[Dict[str, float]] = None) -> ThreadingHTTPServer:
+    if latency:
+        _latency.update(latency)
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def _parse_latency(items: List[str]) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for item in items:
+        host, sep, value = item.rpartition("=")
+        out[host if sep else "*"] = float(value)
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.stub_server", description="Stub upstream APIs.")
+    p.add_argument("--port", type=int, default=8700, help="0 = any free port")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--latency", action="append", default=[],
+                   help="seconds added to every response, or HOST=SECONDS (repeatable)")
+    args = p.parse_args(argv)
+    server = serve(args.port, args.host, _parse_latency(args.latency))
+    # première ligne = port effectif (lu par bench.run)
+    print(server.server_address[1], flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,12 @@
 ############################
 # Language detection       #
 #                          #
-# Last update : 2025/08/25 #
+# Last update : 2026/10/18 #
 ############################
 
 # services/i18n.py
 # Détection de langue + traduction FR + badge HTML
-# Dépendances : langdetect, deep-translator
+# Dépendances : deep-translator (langdetect en option, via services.langid)
 
 # services/i18n.py
 from __future__ import annotations
@@ -15,20 +15,11 @@ from typing import Optional, Tuple, List
 from functools import lru_cache
 import html
 import re
-import requests
 
-# ── Détection locale (langdetect) ─────────────────────────────────────────────
-try:
-    from langdetect import detect, DetectorFactory
-    DetectorFactory.seed = 0  # stabiliser les résultats
-except Exception:
-    detect = None
+from services import http_client, langid, lazy, ratelimit, tracing, translation_memory
 
-# ── Provider de traduction (secours) ──────────────────────────────────────────
-try:
-    from deep_translator import GoogleTranslator
-except Exception:
-    GoogleTranslator = None
+# ── Provider de traduction (secours, importé au premier besoin) ──────────────
+_google_translator = lazy.optional("deep_translator", "GoogleTranslator")
 
 _LANG_LABELS = {
     "fr": "FR", "en": "EN", "es": "ES", "de": "DE", "it": "IT", "pt": "PT",
@@ -74,90 +65,68 @@ def _split_chunks(t: str, max_len: int = 450) -> List[str]:
         parts.append(" ".join(cur))
     return parts
 
-# ── Détection via API (fallback) ──────────────────────────────────────────────
-@lru_cache(maxsize=2048)
-def _remote_detect(text: str) -> Optional[str]:
-    """
-    Utilise l'API MyMemory pour obtenir la langue détectée (sans se fier à la traduction).
-    """
-    try:
-        r = requests.get(
-            "https://api.mymemory.translated.net/get",
-            params={"q": text[:5000], "langpair": "auto|fr"},
-            headers={"User-Agent": "MovieFinder/1.0"},
-            timeout=10,
-        )
-        r.raise_for_status()
-        data = r.json()
-        code = data.get("responseData", {}).get("detectedLanguage")
-        if isinstance(code, str) and code:
-            return code.lower()
-    except Exception:
-        pass
-    return None
-
+# ── Détection (hors ligne) ────────────────────────────────────────────────────
 def detect_lang(text: Optional[str]) -> Optional[str]:
     """
-    Essaie langdetect localement (si dispo), sinon fallback API MyMemory.
-    Nettoie aussi HTML, joint les listes, compacte le texte.
+    Détection locale uniquement (services.langid : mots-outils puis langdetect),
+    mémoïsée par texte normalisé. Nettoie aussi HTML, joint les listes, compacte le texte.
     """
     if not text:
         return None
     if isinstance(text, list):
         text = " ".join([str(x) for x in text if x])
-    text = _normalize_text(text)
-    if not text:
-        return None
-
-    # 1) tentative locale
-    if detect:
-        try:
-            code = detect(text)
-            if isinstance(code, str) and code:
-                return code.lower()
-        except Exception:
-            pass
-
-    # 2) fallback réseau
-    return _remote_detect(text)
+    return langid.detect(_normalize_text(text))
 
 # ── Traduction ────────────────────────────────────────────────────────────────
 def _google_translate_chunk(s: str) -> Optional[str]:
-    if not GoogleTranslator:
+    translator = _google_translator()
+    if not translator:
         return None
     try:
-        return GoogleTranslator(source="auto", target="fr").translate(s)
+        with tracing.span("translate", engine="google", chars=len(s)):
+            ratelimit.acquire("translate.google.com", timeout=10)
+            t = translator(source="auto", target="fr").translate(s)
     except Exception:
         return None
+    if t:
+        translation_memory.put(s, t, engine="google")
+    return t
 
 @lru_cache(maxsize=1024)
 def _mymemory_translate_chunk(s: str) -> Optional[str]:
     try:
-        r = requests.get(
-            "https://api.mymemory.translated.net/get",
-            params={"q": s, "langpair": "auto|fr"},
-            headers={"User-Agent": "MovieFinder/1.0"},
-            timeout=12,
-        )
+        with tracing.span("translate", engine="mymemory", chars=len(s)):
+            r = http_client.get(
+                "https://api.mymemory.translated.net/get",
+                provider="mymemory",
+                params={"q": s, "langpair": "auto|fr"},
+            )
         r.raise_for_status()
         data = r.json()
         t = data.get("responseData", {}).get("translatedText", "")
-        return html.unescape(t) if t else None
+        t = html.unescape(t) if t else None
+        # les quotas dépassés reviennent aussi en "traduction" : ne pas les mémoriser
+        if t and str(data.get("responseStatus")) == "200":
+            translation_memory.put(s, t, engine="mymemory")
+        return t
     except Exception:
         return None
 
 def _translate_long_text(text: str) -> str:
     """
-    Essaie Google chunk par chunk, puis fallback MyMemory par chunk,
-    sinon renvoie l'original.
+    Mémoire de traduction d'abord, puis Google chunk par chunk, puis fallback
+    MyMemory par chunk, sinon renvoie l'original.
     """
     chunks = _split_chunks(text, max_len=450)
+    memo = [translation_memory.get(c) for c in chunks]
+    if all(m is not None for m in memo):
+        return "\n\n".join(memo).strip()
 
     # 1) Google (si dispo)
     out: List[str] = []
-    if GoogleTranslator:
-        for c in chunks:
-            t = _google_translate_chunk(c)
+    if _google_translator():
+        for c, m in zip(chunks, memo):
+            t = m if m is not None else _google_translate_chunk(c)
             out.append(t if t else c)
         joined = "\n\n".join(out).strip()
         if _cmp_key(joined) != _cmp_key(text):
@@ -165,8 +134,8 @@ def _translate_long_text(text: str) -> str:
 
     # 2) MyMemory
     out = []
-    for c in chunks:
-        t = _mymemory_translate_chunk(c)
+    for c, m in zip(chunks, memo):
+        t = m if m is not None else _mymemory_translate_chunk(c)
         out.append(t if t else c)
     return "\n\n".join(out).strip()
 
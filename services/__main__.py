@@ -0,0 +1,91 @@
+############################
+# Batch search CLI         #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Recherche par lots, sans interface :
+#     python -m services queries.txt -o results.jsonl --concurrency 4
+# Une requête par ligne (lignes vides et commentaires « # » ignorés, « - » = stdin) ;
+# une ligne JSON par requête en sortie, dans l'ordre du fichier.
+
+import argparse
+import dataclasses
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from . import metrics
+from .search import DEFAULT_ORDER, run_search
+
+
+def _read_queries(path: str) -> List[str]:
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        lines = [line.strip() for line in f]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def _run_one(query: str, args: argparse.Namespace) -> Dict:
+    start = time.perf_counter()
+    try:
+        res = run_search(
+            query,
+            max_results=args.max_results,
+            order=args.providers,
+            enrich_tmdb=not args.no_enrich,
+            mode=args.mode,
+            country=args.country,
+            include_subscriptions=args.include_subscriptions,
+            deadline_ms=args.deadline_ms,
+        )
+    except Exception as err:
+        return {"query": query, "error": repr(err)}
+    return {
+        "query": query,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        "timed_out": res.timed_out,
+        "skipped": res.skipped,
+        "counts": {k: len(v) for k, v in res.items()},
+        "results": {k: [dataclasses.asdict(m) for m in v] for k, v in res.items()},
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m services", description="Batch search without the Streamlit UI.")
+    p.add_argument("queries", help="file with one query per line, or - for stdin")
+    p.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    p.add_argument("-c", "--concurrency", type=int, default=4, help="searches run in parallel")
+    p.add_argument("-n", "--max-results", type=int, default=20)
+    p.add_argument("--providers", type=lambda s: [x for x in s.split(",") if x], default=list(DEFAULT_ORDER),
+                   help="comma-separated provider keys (default: %(default)s)")
+    p.add_argument("--mode", choices=["films", "autres", "tout"], default="films")
+    p.add_argument("--country", default="FR")
+    p.add_argument("--include-subscriptions", action="store_true")
+    p.add_argument("--no-enrich", action="store_true", help="skip TMDB enrichment")
+    p.add_argument("--deadline-ms", type=int, default=None)
+    p.add_argument("--metrics", default=None, help="write Prometheus metrics to this file at the end")
+    args = p.parse_args(argv)
+
+    queries = _read_queries(args.queries)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as ex:
+            for record in ex.map(lambda q: _run_one(q, args), queries):
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if args.metrics:
+            metrics.write_textfile(args.metrics)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+############################
+# Archives (local index)   #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Miroir local des métadonnées de films Archive.org (SQLite FTS5), alimenté par :
+#     python -m services.archive_local               # ingestion complète
+#     python -m services.archive_local --limit 5000  # essai (index partiel, non utilisé)
+# En mode « films », les recherches sont servies depuis l'index, classées par
+# téléchargements. L'index ne couvre que collection:(feature_films) : quand ses
+# résultats s'épuisent, la suite vient de l'API en ligne (archive_org), sans
+# les éléments déjà servis localement. Index absent ou autre mode : API seule.
+
+import argparse
+import re
+import sqlite3
+import sys
+import time
+from typing import Iterator, List, Optional, Set, Tuple
+
+from .models import Movie
+from . import archive_org, http_client, metrics, storage
+
+DB_FILE = "archive_index.sqlite3"
+
+SCRAPE_URL = "https://archive.org/services/search/v1/scrape"
+INGEST_QUERY = "mediatype:(movies) AND collection:(feature_films)"
+INGEST_FIELDS = ["identifier", "title", "year", "description", "downloads", "mediatype"]
+INGEST_BATCH = 5000   # documents per scrape request (API minimum is 100)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id          INTEGER PRIMARY KEY,
+    identifier  TEXT UNIQUE NOT NULL,
+    title       TEXT,
+    year        INTEGER,
+    description TEXT,
+    downloads   INTEGER NOT NULL DEFAULT 0,
+    mediatype   TEXT,
+    ingested_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_downloads ON items(downloads DESC);
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title, description, content='items', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO items_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _conn() -> sqlite3.Connection:
+    return storage.connect(DB_FILE, _SCHEMA)
+
+
+def ingested_at() -> Optional[float]:
+    """Time of the last complete ingestion, or None if none has completed."""
+    try:
+        row = _conn().execute("SELECT value FROM meta WHERE key = 'ingested_at'").fetchone()
+    except sqlite3.Error:
+        return None
+    return float(row[0]) if row else None
+
+
+# ── Query ──────────────────────────────────────────────────────────────────
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _match_expr(query: str) -> str:
+    """FTS5 expression: every word of ``query`` must appear (prefix match on the last)."""
+    words = _TOKEN.findall(query or "")
+    if not words:
+        return ""
+    terms = [f'"{w}"' for w in words[:-1]] + [f'"{words[-1]}"*']
+    return " ".join(terms)
+
+
+def _text(value) -> Optional[str]:
+    if isinstance(value, list):
+        value = " ".join(str(x) for x in value if x)
+    return value or None
+
+
+def _row_to_movie(row) -> Movie:
+    identifier, title, year, description, downloads, mediatype = row
+    return archive_org.to_movie({
+        "identifier": identifier,
+        "title": title,
+        "year": year,
+        "description": description,
+        "mediatype": mediatype,
+    })
+
+
+def local_page(query: str, page_size: int = 20, offset: int = 0) -> Tuple[List[Movie], Optional[int]]:
+    """One page from the local index; returns the movies and the next offset."""
+    expr = _match_expr(query)
+    if not expr:
+        return [], None
+    rows = _conn().execute(
+        """
+        SELECT i.identifier, i.title, i.year, i.description, i.downloads, i.mediatype
+        FROM items_fts JOIN items i ON i.id = items_fts.rowid
+        WHERE items_fts MATCH ?
+        ORDER BY i.downloads DESC
+        LIMIT ? OFFSET ?
+        """,
+        (expr, page_size + 1, offset),
+    ).fetchall()
+    next_offset = offset + page_size if len(rows) > page_size else None
+    return [_row_to_movie(r) for r in rows[:page_size]], next_offset
+
+
+def search(query: str, max_results: int = 20, mode: str = "films") -> List[Movie]:
+    movies, _ = search_page(query, max_results, None, mode)
+    return movies
+
+
+def _served_locally(query: str, identifiers: List[str]) -> Set[str]:
+    """Those of ``identifiers`` that the local index matches for ``query``."""
+    expr = _match_expr(query)
+    if not expr or not identifiers:
+        return set()
+    marks = ",".join("?" * len(identifiers))
+    rows = _conn().execute(
+        f"""
+        SELECT i.identifier FROM items_fts JOIN items i ON i.id = items_fts.rowid
+        WHERE items_fts MATCH ? AND i.identifier IN ({marks})
+        """,
+        (expr, *identifiers),
+    ).fetchall()
+    return {r[0] for r in rows}
+
+
+def _live_page(query: str, page_size: int, page: int, mode: str, start: int = 0,
+               limit: Optional[int] = None) -> Tuple[List[Movie], object]:
+    """Live API page ``page`` from its ``start``-th result on, without the items
+    the local pages already returned, and at most ``limit`` movies.
+
+    When ``limit`` stops it early, the cursor is ``("live", page, position)``.
+    """
+    movies, next_page = archive_org.search_page(query, page_size, page, mode)
+    ids = [m.extra["identifier"] for m in movies if m.extra and m.extra.get("identifier")]
+    try:
+        seen = _served_locally(query, ids)
+    except sqlite3.Error:
+        seen = set()
+    out: List[Movie] = []
+    for i in range(start, len(movies)):
+        if limit is not None and len(out) >= limit:
+            return out, ("live", page, i)
+        m = movies[i]
+        if not (m.extra and m.extra.get("identifier") in seen):
+            out.append(m)
+    return out, None if next_page is None else ("live", next_page)
+
+
+def search_page(
+    query: str,
+    page_size: int = 20,
+    cursor=None,
+    mode: str = "films",
+) -> Tuple[List[Movie], object]:
+    """Same contract as ``archive_org.search_page``, served locally when possible.
+
+    Local cursors are ``("local", offset)``. The page where the local
+    results run out is completed up to ``page_size`` from the first live API
+    page, and ``("live", page[, position])`` cursors continue on the live
+    API; both leave out what the local pages returned. Any other cursor
+    belongs to the live API (index not used) and is passed through.
+    """
+    if isinstance(cursor, tuple) and cursor[0] == "live":
+        _, page, *position = cursor
+        return _live_page(query, page_size, page, mode, position[0] if position else 0)
+    if isinstance(cursor, tuple) and cursor[0] == "local":
+        movies, offset = local_page(query, page_size, cursor[1])
+    elif cursor is None and (mode or "films").lower() == "films" and ingested_at() is not None:
+        try:
+            movies, offset = local_page(query, page_size, 0)
+        except sqlite3.Error:
+            movies, offset = [], None   # e.g. FTS5 syntax the index cannot parse: ask the live API
+        metrics.cache("archive_local", bool(movies))
+        if not movies:
+            return archive_org.search_page(query, page_size, cursor, mode)
+    else:
+        return archive_org.search_page(query, page_size, cursor, mode)
+    if offset is not None:
+        return movies, ("local", offset)
+    # local results exhausted: the rest of the collection and beyond is online
+    if len(movies) >= page_size:
+        return movies, ("live", 1)
+    try:
+        live, next_cursor = _live_page(query, page_size, 1, mode, limit=page_size - len(movies))
+    except Exception:
+        return movies, ("live", 1)   # retried by the next round
+    return movies + live, next_cursor
+
+
+# ── Ingestion ──────────────────────────────────────────────────────────────
+def _scrape(query: str, batch: int) -> Iterator[dict]:
+    cursor = None
+    while True:
+        params = {"q": query, "fields": ",".join(INGEST_FIELDS), "count": batch}
+        if cursor:
+            params["cursor"] = cursor
+        resp = http_client.get(SCRAPE_URL, provider="archive", params=params, timeout=60)
+        resp.raise_for_status()
+        data = resp.json()
+        yield from data.get("items", [])
+        cursor = data.get("cursor")
+        if not cursor:
+            return
+
+
+def _year(value) -> Optional[int]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    try:
+        return int(str(value)[:4]) if value else None
+    except ValueError:
+        return None
+
+
+def ingest(query: str = INGEST_QUERY, batch: int = INGEST_BATCH, limit: Optional[int] = None,
+           progress=None) -> int:
+    """Mirror the metadata matching ``query`` into the local index.
+
+    Items are upserted batch by batch; once the whole catalog has been read,
+    items that disappeared upstream are removed and the ingestion time is
+    recorded (see ``ingested_at``). A run stopped by ``limit`` records
+    neither: a partial index is not used for searches. Returns the number of
+    items ingested.
+    """
+    conn = _conn()
+    started = time.time()
+    count = 0
+    rows = []
+
+    def flush():
+        conn.execute("BEGIN")
+        conn.executemany(
+            """
+            INSERT INTO items (identifier, title, year, description, downloads, mediatype, ingested_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(identifier) DO UPDATE SET
+                title = excluded.title, year = excluded.year, description = excluded.description,
+                downloads = excluded.downloads, mediatype = excluded.mediatype,
+                ingested_at = excluded.ingested_at
+            """,
+            rows,
+        )
+        conn.execute("COMMIT")
+        rows.clear()
+        if progress:
+            progress(count)
+
+    for d in _scrape(query, batch):
+        if not d.get("identifier"):
+            continue
+        rows.append((
+            d["identifier"],
+            _text(d.get("title")),
+            _year(d.get("year")),
+            _text(d.get("description")),
+            int(d.get("downloads") or 0),
+            _text(d.get("mediatype")),
+            started,
+        ))
+        count += 1
+        if len(rows) >= batch:
+            flush()
+        if limit and count >= limit:
+            break
+    if rows:
+        flush()
+
+    if not limit:
+        conn.execute("BEGIN")
+        conn.execute("DELETE FROM items WHERE ingested_at < ?", (started,))
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('ingested_at', ?)", (str(time.time()),))
+        conn.execute("COMMIT")
+    return count
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m services.archive_local",
+                                description="Build the local Archive.org movie index.")
+    p.add_argument("--query", default=INGEST_QUERY, help="advancedsearch query to mirror (default: %(default)s)")
+    p.add_argument("--batch", type=int, default=INGEST_BATCH)
+    p.add_argument("--limit", type=int, default=None, help="stop after N items (trial run: keeps older items, "
+                   "and a partial index is not used for searches)")
+    args = p.parse_args(argv)
+    start = time.perf_counter()
+    n = ingest(args.query, args.batch, args.limit,
+               progress=lambda c: print(f"{c} items…", file=sys.stderr, flush=True))
+    print(f"{n} items indexed in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,13 +2,13 @@
 ############################
 # Archives                 #
 #                          #
-# Last update : 2025/08/24 #
+# Last update : 2026/10/18 #
 ############################
 
 
-import requests
-from typing import List
+from typing import List, Optional, Tuple
 from .models import Movie
+from . import http_client
 
 SEARCH_URL = "https://archive.org/advancedsearch.php"
 
@@ -26,34 +26,53 @@ def _mediatype_clause(mode: str) -> str:
     return ""  # tout
 
 def search(query: str, max_results: int = 20, mode: str = "films") -> List[Movie]:
+    movies, _ = search_page(query, max_results, None, mode)
+    return movies
+
+def search_page(
+    query: str,
+    page_size: int = 20,
+    cursor: Optional[int] = None,
+    mode: str = "films",
+) -> Tuple[List[Movie], Optional[int]]:
+    """One page of results; ``cursor`` is the 1-based page number (None = first).
+
+    Returns the movies and the cursor of the next page, or None when exhausted.
+    """
+    page = cursor or 1
     q = f"({query}) {_mediatype_clause(mode)}".strip()
     params = {
         "q": q,
         "fl[]": ["identifier", "title", "description", "year", "downloads", "mediatype"],
-        "rows": max_results,
-        "page": 1,
+        "rows": page_size,
+        "page": page,
         "output": "json",
         "sort[]": ["downloads desc"],
     }
-    data = requests.get(SEARCH_URL, params=params, timeout=20).json()
-    docs = data.get("response", {}).get("docs", [])
-    out: List[Movie] = []
-    for d in docs:
-        identifier = d.get("identifier")
-        title = d.get("title") or identifier
-        try:
-            year = int(d.get("year")) if d.get("year") else None
-        except Exception:
-            year = None
-        page = f"https://archive.org/details/{identifier}"
-        out.append(Movie(
-            title=title,
-            year=year,
-            description=d.get("description"),
-            poster_url=f"https://archive.org/services/img/{identifier}",
-            stream_url=page,
-            download_url=page,
-            source=f"Archive.org ({d.get('mediatype','')})",
-            extra={"identifier": identifier},
-        ))
-    return out
+    data = http_client.get(SEARCH_URL, provider="archive", params=params).json()
+    response = data.get("response", {})
+    docs = response.get("docs", [])
+    num_found = response.get("numFound") or 0
+    next_cursor = page + 1 if len(docs) >= page_size and page * page_size < num_found else None
+    return [to_movie(d) for d in docs], next_cursor
+
+
+def to_movie(d: dict) -> Movie:
+    """Build a Movie from an advancedsearch/scrape document."""
+    identifier = d.get("identifier")
+    title = d.get("title") or identifier
+    try:
+        year = int(d.get("year")) if d.get("year") else None
+    except Exception:
+        year = None
+    page = f"https://archive.org/details/{identifier}"
+    return Movie(
+        title=title,
+        year=year,
+        description=d.get("description"),
+        poster_url=f"https://archive.org/services/img/{identifier}",
+        stream_url=page,
+        download_url=page,
+        source=f"Archive.org ({d.get('mediatype','')})",
+        extra={"identifier": identifier},
+    )
@@ -0,0 +1,172 @@
+############################
+# Circuit breakers         #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# One breaker per upstream host, shared by every thread of the process.
+# closed    : requests flow; FAILURE_THRESHOLD consecutive failures (errors,
+#             timeouts, 5xx) open the circuit.
+# open      : requests fail at once with CircuitOpen for the cool-down.
+# half-open : after the cool-down a single probe request is let through;
+#             success closes the circuit, failure reopens it with a doubled
+#             cool-down (up to MAX_OPEN_SECONDS).
+# Thresholds can be overridden without code changes:
+#     MOVIEFINDER_BREAKER="failures=5,open=30,max_open=300"
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from . import metrics
+
+FAILURE_THRESHOLD = 5
+OPEN_SECONDS = 30.0
+MAX_OPEN_SECONDS = 300.0
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+def _overrides() -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for item in os.environ.get("MOVIEFINDER_BREAKER", "").split(","):
+        key, _, value = item.strip().partition("=")
+        try:
+            out[key] = float(value)
+        except ValueError:
+            continue
+    return out
+
+
+class CircuitOpen(requests.RequestException):
+    """The upstream's circuit is open: the request was not sent."""
+
+
+class Breaker:
+    def __init__(self, host: str, failures: int = FAILURE_THRESHOLD, open_seconds: float = OPEN_SECONDS,
+                 max_open_seconds: float = MAX_OPEN_SECONDS):
+        self.host = host
+        self.failures = failures
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.state = CLOSED
+        self._consecutive = 0
+        self._cooldown = open_seconds
+        self._retry_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a request may be sent now (and, when half-open, claims the probe)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN and now >= self._retry_at:
+                self._set(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def is_open(self) -> bool:
+        """True while requests would be refused (open, cool-down not over)."""
+        with self._lock:
+            return self.state == OPEN and time.monotonic() < self._retry_at
+
+    def success(self) -> None:
+        with self._lock:
+            self._consecutive = 0
+            self._probing = False
+            if self.state != CLOSED:
+                self._cooldown = self.open_seconds
+                self._set(CLOSED)
+
+    def failure(self) -> None:
+        with self._lock:
+            self._consecutive += 1
+            if self.state == HALF_OPEN:
+                self._probing = False
+                self._cooldown = min(self._cooldown * 2, self.max_open_seconds)
+                self._open()
+            elif self.state == CLOSED and self._consecutive >= self.failures:
+                self._open()
+
+    def release(self) -> None:
+        """Give the probe back without a verdict (e.g. the call was cancelled)."""
+        with self._lock:
+            self._probing = False
+
+    def _open(self) -> None:
+        self._retry_at = time.monotonic() + self._cooldown
+        self._set(OPEN)
+
+    def _set(self, state: str) -> None:
+        if state != self.state:
+            self.state = state
+            metrics.inc("breaker_transitions_total", host=self.host, state=state)
+
+    def retry_in(self) -> float:
+        with self._lock:
+            return max(0.0, self._retry_at - time.monotonic()) if self.state == OPEN else 0.0
+
+
+_breakers: Dict[str, Breaker] = {}
+_lock = threading.Lock()
+
+
+def _host(url_or_host: str) -> str:
+    return urlsplit(url_or_host).netloc if "://" in url_or_host else url_or_host
+
+
+def breaker_for(url_or_host: str) -> Breaker:
+    host = _host(url_or_host)
+    b = _breakers.get(host)
+    if b is None:
+        o = _overrides()
+        with _lock:
+            b = _breakers.setdefault(host, Breaker(
+                host,
+                failures=int(o.get("failures", FAILURE_THRESHOLD)),
+                open_seconds=o.get("open", OPEN_SECONDS),
+                max_open_seconds=o.get("max_open", MAX_OPEN_SECONDS),
+            ))
+    return b
+
+
+def check(url_or_host: str) -> Breaker:
+    """Return the host's breaker, or raise CircuitOpen if no request may go out."""
+    b = breaker_for(url_or_host)
+    if not b.allow():
+        metrics.inc("breaker_rejected_total", host=b.host)
+        raise CircuitOpen(f"circuit open for {b.host}, retry in {b.retry_in():.0f}s")
+    return b
+
+
+def is_open(url_or_host: str) -> bool:
+    b = _breakers.get(_host(url_or_host))
+    return b is not None and b.is_open()
+
+
+def open_hosts() -> List[str]:
+    """Hosts currently refusing requests."""
+    return sorted(h for h, b in list(_breakers.items()) if b.is_open())
+
+
+def states() -> List[Dict[str, object]]:
+    return [
+        {"host": h, "state": b.state, "retry_in_s": round(b.retry_in(), 1)}
+        for h, b in sorted(_breakers.items())
+    ]
+
+
+def reset(host: Optional[str] = None) -> None:
+    with _lock:
+        if host is None:
+            _breakers.clear()
+        else:
+            _breakers.pop(_host(host), None)
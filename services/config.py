@@ -0,0 +1,78 @@
+############################
+# Configuration            #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Lecture des secrets sans dépendre de Streamlit, par ordre de priorité :
+#   1. variables d'environnement (YOUTUBE_API_KEY, TMDB_API_KEY, …)
+#   2. fichier TOML : $MOVIEFINDER_SECRETS_FILE, sinon .streamlit/secrets.toml
+#      (répertoire courant puis ~/.streamlit) ; clés à la racine ou dans une section
+#   3. st.secrets, seulement si Streamlit est déjà chargé (Streamlit Cloud)
+
+import os
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+
+def _secrets_files():
+    explicit = os.environ.get("MOVIEFINDER_SECRETS_FILE")
+    if explicit:
+        return [explicit]
+    return [
+        os.path.join(os.getcwd(), ".streamlit", "secrets.toml"),
+        os.path.join(os.path.expanduser("~"), ".streamlit", "secrets.toml"),
+    ]
+
+
+@lru_cache(maxsize=1)
+def _file_secrets() -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    if tomllib is None:
+        return out
+    for path in _secrets_files():  # the first file wins, for root and section keys alike
+        try:
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        except (OSError, ValueError):
+            continue
+        # within a file, a root key beats the same key in a section
+        flat = {k: v for k, v in data.items() if not isinstance(v, dict)}
+        for value in data.values():
+            if isinstance(value, dict):
+                for sub_key, sub_value in value.items():
+                    flat.setdefault(sub_key, sub_value)
+        for key, value in flat.items():
+            out.setdefault(key, value)
+    return out
+
+
+def _streamlit_secret(name: str) -> Optional[Any]:
+    st = sys.modules.get("streamlit")
+    if st is None:
+        return None
+    try:
+        return st.secrets.get(name)
+    except Exception:
+        return None
+
+
+def secret(name: str, default: Optional[Any] = None) -> Optional[Any]:
+    value = os.environ.get(name)
+    if value:
+        return value
+    value = _file_secrets().get(name)
+    if value:
+        return value
+    return _streamlit_secret(name) or default
+
+
+def reload() -> None:
+    """Forget the parsed secrets files (after editing them)."""
+    _file_secrets.cache_clear()
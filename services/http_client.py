@@ -0,0 +1,330 @@
+############################
+# HTTP client              #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import breaker, latency, metrics, ratelimit
+
+# Timeout ceiling (seconds) per provider; the actual timeout adapts to each
+# host's observed latency (see latency.py). Callers may still pass ``timeout=``.
+DEFAULT_TIMEOUT = 15
+TIMEOUTS: Dict[str, float] = {
+    "archive": 20,
+    "youtube": 20,
+    "tmdb": 20,
+    "itunes": 10,
+    "mymemory": 12,
+    "justwatch": 12,
+    "posters": 10,
+}
+
+# Keep-alive connections kept open per host.
+POOL_MAXSIZE = int(os.environ.get("MOVIEFINDER_HTTP_POOL_SIZE", "16"))
+POOL_SIZES: Dict[str, int] = {}
+
+USER_AGENT = "MovieFinder/1.0"
+
+# Upstream base URL overrides (benchmarks, staging), in "host=base" pairs:
+#     MOVIEFINDER_BASE_URLS="archive.org=http://localhost:9000"
+#     MOVIEFINDER_BASE_URLS="*=http://127.0.0.1:8700"   # https://host/path -> base/host/path
+# Rate limits, pools' metrics and timeouts still apply to the original host.
+_ENV_BASE_URLS = "MOVIEFINDER_BASE_URLS"
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+# Hedged requests (opt-in): an idempotent request still unanswered after the
+# host's p95 latency gets a duplicate, and the first answer wins.
+HEDGE = os.environ.get("MOVIEFINDER_HEDGE", "") not in ("", "0")
+HEDGE_WORKERS = 32
+
+# Providers whose traffic gets its own circuit breaker, rate limit and latency
+# window on each host ("posters@archive.org"), so that bulk downloads cannot
+# throttle, slow down or trip the API served by the same host.
+ISOLATED_PROVIDERS = frozenset({"posters"})
+
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+
+def _retry() -> Retry:
+    # Only idempotent methods are retried; POSTs fail on the first error.
+    return Retry(
+        total=2,
+        connect=2,
+        read=1,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=IDEMPOTENT_METHODS,
+        raise_on_status=False,
+    )
+
+
+def _new_session(host: str) -> requests.Session:
+    size = POOL_SIZES.get(host, POOL_MAXSIZE)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size, max_retries=_retry())
+    s = requests.Session()
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers["User-Agent"] = USER_AGENT
+    return s
+
+
+def session_for(url: str) -> requests.Session:
+    """Return the shared keep-alive session for the host of ``url``."""
+    host = urlsplit(url).netloc
+    s = _sessions.get(host)
+    if s is None:
+        with _lock:
+            s = _sessions.get(host)
+            if s is None:
+                s = _sessions[host] = _new_session(host)
+    return s
+
+
+@lru_cache(maxsize=4)
+def _parse_base_urls(spec: str) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for item in spec.split(","):
+        host, _, base = item.strip().partition("=")
+        if host and base:
+            out[host] = base.rstrip("/")
+    return out
+
+
+def resolve(url: str) -> str:
+    """``url`` with its scheme and host replaced per MOVIEFINDER_BASE_URLS."""
+    spec = os.environ.get(_ENV_BASE_URLS)
+    if not spec:
+        return url
+    bases = _parse_base_urls(spec)
+    parts = urlsplit(url)
+    base = bases.get(parts.netloc)
+    if base is not None:
+        return base + url[len(f"{parts.scheme}://{parts.netloc}"):]
+    base = bases.get("*")
+    if base is not None:
+        return f"{base}/{parts.netloc}" + url[len(f"{parts.scheme}://{parts.netloc}"):]
+    return url
+
+
+def upstream_key(host: str, provider: Optional[str] = None) -> str:
+    """Key of the breaker, rate limit and latency window for ``provider`` on ``host``."""
+    return f"{provider}@{host}" if provider in ISOLATED_PROVIDERS else host
+
+
+def timeout_for(provider: Optional[str], host: Optional[str] = None) -> float:
+    ceiling = TIMEOUTS.get(provider or "", DEFAULT_TIMEOUT)
+    return latency.timeout_for(host, ceiling) if host else ceiling
+
+
+def _total(timeout) -> Optional[float]:
+    if isinstance(timeout, tuple):
+        return sum(t for t in timeout if t)
+    return timeout
+
+
+def request(method: str, url: str, provider: Optional[str] = None, **kwargs) -> requests.Response:
+    """Send a request through the host's pool, within its rate limit.
+
+    Waiting for a rate-limit token counts against the request timeout. On a
+    429 the host's bucket is paused for Retry-After; idempotent requests are
+    then retried once if that pause is short enough.
+
+    Each host has a circuit breaker: errors, timeouts and 5xx answers count
+    as failures, and while the circuit is open requests fail at once with
+    ``breaker.CircuitOpen`` instead of waiting for the timeout.
+
+    Breaker, rate limit and adaptive timeout are per ``upstream_key``: the
+    host, or provider@host for ISOLATED_PROVIDERS.
+    """
+    key = upstream_key(urlsplit(url).netloc, provider)
+    b = breaker.check(key)
+    try:
+        resp = _request(method, url, key, provider, kwargs)
+    except ratelimit.RateLimitExceeded:
+        b.release()   # never sent: says nothing about the upstream
+        raise
+    except requests.RequestException:
+        b.failure()
+        raise
+    except BaseException:
+        b.release()
+        raise
+    if resp.status_code >= 500:
+        b.failure()
+    else:
+        b.success()
+    return resp
+
+
+def _request(method: str, url: str, host: str, provider: Optional[str], kwargs) -> requests.Response:
+    # ``host`` is the upstream key (see upstream_key)
+    kwargs.setdefault("timeout", timeout_for(provider, host))
+    target = resolve(url)
+    session = session_for(target)
+    budget = _total(kwargs["timeout"])
+    try:
+        ratelimit.acquire(host, timeout=budget)
+    except ratelimit.RateLimitExceeded:
+        metrics.inc("upstream_errors_total", host=host, kind="ratelimit")
+        raise
+    resp = _send_hedged(session, method, target, host, kwargs)
+    if resp.status_code == 429:
+        delay = ratelimit.backoff(host, resp.headers.get("Retry-After"))
+        if method.upper() in IDEMPOTENT_METHODS and delay <= ratelimit.MAX_RETRY_AFTER:
+            ratelimit.acquire(host, timeout=None if budget is None else delay + budget)
+            resp = _send(session, method, target, host, kwargs)
+            if resp.status_code == 429:
+                ratelimit.backoff(host, resp.headers.get("Retry-After"))
+    return resp
+
+
+def _send(session: requests.Session, method: str, url: str, host: str, kwargs) -> requests.Response:
+    """``session.request`` with latency and error metrics for ``host``."""
+    start = time.perf_counter()
+    try:
+        resp = session.request(method, url, **kwargs)
+    except requests.Timeout:
+        metrics.inc("upstream_errors_total", host=host, kind="timeout")
+        latency.record(host, time.perf_counter() - start)   # a lower bound, still informative
+        raise
+    except requests.RequestException:
+        metrics.inc("upstream_errors_total", host=host, kind="connection")
+        raise
+    finally:
+        metrics.observe("upstream_request_seconds", time.perf_counter() - start, host=host)
+    if resp.status_code == 429 or resp.status_code >= 500:
+        metrics.inc("upstream_errors_total", host=host, kind=f"http_{resp.status_code}")
+    else:
+        latency.record(host, resp.elapsed.total_seconds())
+    return resp
+
+
+_hedge_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _hedge_pool
+    if _hedge_pool is None:
+        with _lock:
+            if _hedge_pool is None:
+                _hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="http-hedge")
+    return _hedge_pool
+
+
+def _discard(fut) -> None:
+    if not fut.cancelled() and fut.exception() is None:
+        fut.result().close()
+
+
+def _send_hedged(session: requests.Session, method: str, target: str, host: str,
+                 kwargs) -> requests.Response:
+    """``_send``, duplicated once the host's p95 has passed (HEDGE only).
+
+    The duplicate needs a rate-limit token available right away; the losing
+    response is closed when it arrives.
+    """
+    delay = latency.hedge_after(host)
+    if not HEDGE or delay is None or method.upper() not in IDEMPOTENT_METHODS or kwargs.get("stream"):
+        return _send(session, method, target, host, kwargs)
+    first = _pool().submit(_send, session, method, target, host, kwargs)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+    bucket = ratelimit.bucket_for(host)
+    if bucket is not None and not bucket.acquire(timeout=0):
+        return first.result()
+    metrics.inc("hedged_requests_total", host=host)
+    second = _pool().submit(_send, session, method, target, host, kwargs)
+    pending = {first, second}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            try:
+                resp = fut.result()
+            except Exception as err:
+                error = err
+                continue
+            if fut is second:
+                metrics.inc("hedge_wins_total", host=host)
+            for other in (pending | done) - {fut}:
+                other.add_done_callback(_discard)
+            return resp
+    raise error
+
+
+def get(url: str, provider: Optional[str] = None, **kwargs) -> requests.Response:
+    return request("GET", url, provider, **kwargs)
+
+
+def post(url: str, provider: Optional[str] = None, **kwargs) -> requests.Response:
+    return request("POST", url, provider, **kwargs)
+
+
+class Client:
+    """Minimal ``requests``-like object bound to one provider.
+
+    Lets third-party libraries that call ``self.requests.get(...)`` (e.g.
+    justwatch) go through the shared pools and provider timeouts.
+    """
+
+    def __init__(self, provider: str):
+        self.provider = provider
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return request(method, url, self.provider, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+def pooled(cls: type, provider: str) -> type:
+    """Subclass of ``cls`` whose ``self.requests`` is always ``Client(provider)``.
+
+    For libraries that assign ``self.requests`` and use it in ``__init__``
+    (justwatch resolves its locale there): swapping the attribute after
+    construction would leave that first round trip unpooled and without a
+    timeout, so the assignment is ignored instead.
+    """
+    client = Client(provider)
+    return type(f"Pooled{cls.__name__}", (cls,), {
+        "requests": property(lambda self: client, lambda self, value: None),
+    })
+
+
+# Hosts contacted by the providers; ``warm_up`` opens a pooled connection to each.
+WARM_URLS = (
+    "https://archive.org/",
+    "https://api.themoviedb.org/",
+    "https://www.googleapis.com/",
+    "https://itunes.apple.com/",
+    "https://api.mymemory.translated.net/",
+    "https://apis.justwatch.com/",
+)
+
+
+def warm_up(urls=WARM_URLS, timeout: float = 5) -> None:
+    """Pay the TCP/TLS handshakes up front so the first search reuses them."""
+    for url in urls:
+        try:
+            target = resolve(url)
+            session_for(target).head(target, timeout=timeout, allow_redirects=False)
+        except Exception:
+            pass
@@ -2,24 +2,17 @@
 ############################
 # Language detection       #
 #                          #
-# Last update : 2025/08/25 #
+# Last update : 2026/10/18 #
 ############################
 
 # services/i18n.py
 # Détection de langue + traduction FR + badge HTML
-# Dépendances : langdetect, deep-translator
+# Dépendances : deep-translator (langdetect en option, via langid)
 
 from typing import Optional
+from . import lazy, langid, ratelimit, tracing, translation_memory
 
-try:
-    from langdetect import detect
-except Exception:
-    detect = None
-
-try:
-    from deep_translator import GoogleTranslator
-except Exception:
-    GoogleTranslator = None
+_google_translator = lazy.optional("deep_translator", "GoogleTranslator")
 
 _LANG_LABELS = {
     "fr": "FR",
@@ -30,29 +23,44 @@ _LANG_LABELS = {
     "pt": "PT",
 }
 
+class TranslationUnavailable(Exception):
+    """Aucune traduction obtenue (moteur absent, erreur réseau, quota)."""
+
 def detect_lang(text: Optional[str]) -> Optional[str]:
-    if not text or not detect:
-        return None
-    try:
-        code = detect(text)
-        if not isinstance(code, str):
-            return None
-        return code.lower()
-    except Exception:
-        return None
+    return langid.detect(text)
 
-def translate_to_fr(text: str) -> str:
+def translate_to_fr(text: str, strict: bool = False) -> str:
+    """Traduction FR de `text` ; en cas d'échec, `text` inchangé,
+    ou TranslationUnavailable si `strict` (l'appelant pourra réessayer)."""
     if not text:
         return ""
-    if not GoogleTranslator:
+    cached = translation_memory.get(text)
+    if cached is not None:
+        return cached
+    translator = _google_translator()
+    if not translator:
+        if strict:
+            raise TranslationUnavailable("deep-translator absent")
         return text
     try:
-        return GoogleTranslator(source="auto", target="fr").translate(text)
-    except Exception:
+        with tracing.span("translate", engine="google", chars=len(text)):
+            ratelimit.acquire("translate.google.com", timeout=10)
+            translated = translator(source="auto", target="fr").translate(text)
+    except Exception as err:
+        if strict:
+            raise TranslationUnavailable(str(err)) from err
         return text
+    if translated:
+        translation_memory.put(text, translated, engine="google")
+    elif strict:
+        raise TranslationUnavailable("traduction vide")
+    return translated
 
-def lang_badge_html(sample_text: str) -> str:
-    code = detect_lang(sample_text) or ""
+def lang_badge_html(sample_text: str, code: Optional[str] = None) -> str:
+    """Badge HTML ; `code` évite une nouvelle détection quand la langue est déjà connue."""
+    if code is None:
+        code = detect_lang(sample_text)
+    code = code or ""
     tag = _LANG_LABELS.get(code, (code.upper()[:2] if code else "??"))
     # Couleurs simples : FR (vert clair), EN (bleu clair), autres (violet clair)
     if tag == "FR":
@@ -0,0 +1,130 @@
+############################
+# Language identification  #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Détection de langue hors ligne pour les échantillons courts (titre + résumé) :
+# score par mots-outils + caractères typiques, langdetect en second recours.
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional
+from . import lazy
+
+_langdetect_module = lazy.optional("langdetect")
+
+
+@lru_cache(maxsize=1)
+def _langdetect():
+    """langdetect.detect, importé et initialisé au premier besoin (None si absent)."""
+    mod = _langdetect_module()
+    if mod is None:
+        return None
+    mod.DetectorFactory.seed = 0  # stabiliser les résultats
+    return mod.detect
+
+_STOPWORDS: Dict[str, FrozenSet[str]] = {
+    "fr": frozenset("""
+        le la les un une des du de et est en que qui dans pour pas sur au aux avec ce cette
+        ces son sa ses il elle ils elles nous vous mais ou où donc ne se sont été être avoir
+        par plus tout comme leur leurs lui y dont très sans sous entre après avant chez
+    """.split()),
+    "en": frozenset("""
+        the and of to in is was that for it with as his her he she on by at from this which
+        be are were an or but not they their have has had who when into after about its one
+        all him them there been would out up
+    """.split()),
+    "es": frozenset("""
+        el la los las un una unos unas de del y en que es por con para se su sus lo al como
+        más pero sin sobre entre cuando muy también fue ha son está este esta ese esa película
+    """.split()),
+    "de": frozenset("""
+        der die das und ist nicht ein eine einen dem den des mit von zu im auf für sich auch
+        als wird wie bei aus er sie es nach noch dass wurde sind oder über zum zur durch
+    """.split()),
+    "it": frozenset("""
+        il lo la gli le un una uno di del della dei delle e è che per non con su al alla come
+        più ma anche sono nel nella questo questa suo sua ha era dopo tra
+    """.split()),
+    "pt": frozenset("""
+        o a os as um uma uns umas de do da dos das e é que em no na nos nas por para com não
+        se seu sua ao como mais mas foi são ele ela também pelo pela filme
+    """.split()),
+}
+
+# Caractères quasi exclusifs à une langue (bonus par occurrence).
+_CHAR_HINTS: Dict[str, str] = {
+    "fr": "èêëçœùûîï",
+    "es": "ñ¿¡",
+    "de": "äöüß",
+    "pt": "ãõ",
+    "it": "ì",
+}
+
+_WORD_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+MIN_SCORE = 2.0   # en dessous, l'échantillon est trop pauvre pour trancher
+MIN_MARGIN = 1.0  # écart minimal avec la 2ᵉ langue
+
+
+def normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def score(text: str) -> Optional[str]:
+    """Stopword / character scoring; None when the sample is ambiguous."""
+    lowered = text.casefold()
+    scores = {lang: 0.0 for lang in _STOPWORDS}
+    for word in _WORD_RE.findall(lowered):
+        for lang, words in _STOPWORDS.items():
+            if word in words:
+                scores[lang] += 1.0
+    for lang, chars in _CHAR_HINTS.items():
+        scores[lang] += 0.5 * sum(lowered.count(c) for c in chars)
+
+    ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+    (best, s1), (_, s2) = ranked[0], ranked[1]
+    if s1 < MIN_SCORE or s1 - s2 < max(MIN_MARGIN, 0.2 * s1):
+        return None
+    return best
+
+
+@lru_cache(maxsize=8192)
+def _detect_normalized(text: str) -> Optional[str]:
+    code = score(text)
+    if code:
+        return code
+    fallback = _langdetect()
+    if fallback:
+        try:
+            code = fallback(text)
+            if isinstance(code, str) and code:
+                return code.lower()
+        except Exception:
+            pass
+    return None
+
+
+def reset() -> None:
+    _detect_normalized.cache_clear()
+
+
+def detect(text: Optional[str]) -> Optional[str]:
+    """Return an ISO 639-1 code for ``text`` or None. Never touches the network."""
+    if not text:
+        return None
+    text = normalize(text)
+    if not text:
+        return None
+    return _detect_normalized(text)
+
+
+def warm_up() -> None:
+    """Import langdetect and load its language profiles ahead of the first request."""
+    fallback = _langdetect()
+    if fallback:
+        try:
+            fallback("warm-up sample text")
+        except Exception:
+            pass
@@ -0,0 +1,94 @@
+############################
+# Adaptive timeouts        #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Rolling latency window per upstream host, used by http_client to size
+# request timeouts (p99 × TIMEOUT_FACTOR, clamped between MIN_TIMEOUT and the
+# provider's configured timeout) and to decide when to hedge a request (p95).
+# Until MIN_SAMPLES requests have been seen, the configured timeout applies.
+
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+WINDOW = 200          # latest requests kept per host
+MIN_SAMPLES = 20
+TIMEOUT_FACTOR = 3.0
+MIN_TIMEOUT = 2.0     # seconds; never go below, however fast the host is
+
+
+class Window:
+    def __init__(self, size: int = WINDOW):
+        self._values: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._values.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if len(self._values) < MIN_SAMPLES:
+                return None
+            values = sorted(self._values)
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+
+_windows: Dict[str, Window] = {}
+_lock = threading.Lock()
+
+
+def _window(host: str) -> Window:
+    w = _windows.get(host)
+    if w is None:
+        with _lock:
+            w = _windows.setdefault(host, Window())
+    return w
+
+
+def record(host: str, seconds: float) -> None:
+    """Add one observed request duration (successes and timeouts)."""
+    _window(host).add(seconds)
+
+
+def quantile(host: str, q: float) -> Optional[float]:
+    w = _windows.get(host)
+    return None if w is None else w.quantile(q)
+
+
+def timeout_for(host: str, ceiling: float) -> float:
+    """Timeout for the next request to ``host``: p99 × TIMEOUT_FACTOR within
+    [MIN_TIMEOUT, ceiling], or ``ceiling`` while too few samples are known."""
+    p99 = quantile(host, 0.99)
+    if p99 is None:
+        return ceiling
+    return max(MIN_TIMEOUT, min(ceiling, p99 * TIMEOUT_FACTOR))
+
+
+def hedge_after(host: str) -> Optional[float]:
+    """Delay after which a duplicate request is worth sending (the p95)."""
+    return quantile(host, 0.95)
+
+
+def stats() -> List[Dict[str, object]]:
+    rows = []
+    for host, w in sorted(_windows.items()):
+        p50, p95, p99 = w.quantile(0.5), w.quantile(0.95), w.quantile(0.99)
+        rows.append({
+            "host": host,
+            "samples": len(w),
+            "p50_ms": None if p50 is None else round(p50 * 1000),
+            "p95_ms": None if p95 is None else round(p95 * 1000),
+            "p99_ms": None if p99 is None else round(p99 * 1000),
+        })
+    return rows
+
+
+def reset() -> None:
+    with _lock:
+        _windows.clear()
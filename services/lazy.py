@@ -0,0 +1,36 @@
+############################
+# Lazy imports             #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import importlib
+import threading
+from typing import Any, Callable, Optional
+
+_MISSING = object()
+
+
+def optional(module: str, attr: Optional[str] = None) -> Callable[[], Any]:
+    """Return a loader importing ``module`` (and ``attr`` from it) on first call.
+
+    The loader returns None when the dependency is not installed, which keeps
+    the existing ``if not X: ...`` fallbacks working without paying for the
+    import at startup.
+    """
+    lock = threading.Lock()
+    value = _MISSING
+
+    def load() -> Any:
+        nonlocal value
+        if value is _MISSING:
+            with lock:
+                if value is _MISSING:
+                    try:
+                        mod = importlib.import_module(module)
+                        value = getattr(mod, attr) if attr else mod
+                    except Exception:
+                        value = None
+        return value
+
+    return load
@@ -0,0 +1,246 @@
+############################
+# Metrics                  #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# In-process counters and latency histograms, shared by every thread.
+# Exposed three ways:
+#   - ``snapshot()`` for the Debug expander of app.py;
+#   - a Prometheus text file rewritten every METRICS_INTERVAL seconds when
+#     MOVIEFINDER_METRICS_FILE is set (node_exporter textfile collector);
+#   - an HTTP endpoint (GET /metrics) when MOVIEFINDER_METRICS_PORT is set.
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+PREFIX = "moviefinder_"
+
+# Histogram upper bounds, in seconds.
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0)
+
+METRICS_INTERVAL = 15.0
+
+HELP = {
+    "provider_seconds": "Provider call latency (one page of results).",
+    "provider_errors_total": "Provider calls that raised.",
+    "provider_timeouts_total": "Providers cut off by the search deadline.",
+    "provider_empty_total": "Provider calls that returned no result.",
+    "upstream_request_seconds": "HTTP request latency per upstream host.",
+    "upstream_errors_total": "HTTP errors per upstream host, by kind.",
+    "cache_requests_total": "Cache lookups, by cache and result (hit/miss).",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Labels], float] = {}
+_histograms: Dict[Tuple[str, Labels], "Histogram"] = {}
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile (None if empty)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    key = (name, _labels(labels))
+    with _lock:
+        h = _histograms.get(key)
+        if h is None:
+            h = _histograms[key] = Histogram()
+        h.observe(seconds)
+
+
+@contextmanager
+def timed(name: str, **labels):
+    """Observe the duration of the block in the ``name`` histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def cache(name: str, hit: bool) -> None:
+    inc("cache_requests_total", cache=name, result="hit" if hit else "miss")
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+# ── Reading ────────────────────────────────────────────────────────────────
+def snapshot() -> Dict[str, List[dict]]:
+    """Plain rows for display: latencies (count, mean, p50, p95), counters
+    and cache hit ratios."""
+    with _lock:
+        hists = [(n, dict(l), h.count, h.sum, h.quantile(0.5), h.quantile(0.95))
+                 for (n, l), h in _histograms.items()]
+        counters = [(n, dict(l), v) for (n, l), v in _counters.items()]
+    latencies = [
+        {"metric": n, **l, "count": c, "mean_ms": round(s / c * 1000, 1) if c else None,
+         "p50_ms": _ms(p50), "p95_ms": _ms(p95)}
+        for n, l, c, s, p50, p95 in sorted(hists, key=lambda r: (r[0], sorted(r[1].items())))
+    ]
+    caches: Dict[str, Dict[str, float]] = {}
+    other = []
+    for n, l, v in sorted(counters, key=lambda r: (r[0], sorted(r[1].items()))):
+        if n == "cache_requests_total":
+            caches.setdefault(l["cache"], {"hit": 0, "miss": 0})[l["result"]] += v
+        else:
+            other.append({"metric": n, **l, "value": v})
+    cache_rows = [
+        {"cache": name, "hits": int(c["hit"]), "misses": int(c["miss"]),
+         "hit_ratio": round(c["hit"] / (c["hit"] + c["miss"]), 3) if c["hit"] + c["miss"] else None}
+        for name, c in sorted(caches.items())
+    ]
+    return {"latencies": latencies, "counters": other, "caches": cache_rows}
+
+
+def _ms(v: Optional[float]) -> Optional[float]:
+    if v is None:
+        return None
+    return v * 1000 if v != float("inf") else v
+
+
+def _fmt_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    items = labels + extra
+    if not items:
+        return ""
+    body = ",".join('%s="%s"' % (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+                    for k, v in items)
+    return "{" + body + "}"
+
+
+def prometheus_text() -> str:
+    """All metrics in the Prometheus text exposition format (0.0.4)."""
+    with _lock:
+        counters = sorted(_counters.items())
+        hists = sorted((k, (list(h.counts), h.sum, h.count)) for k, h in _histograms.items())
+    lines: List[str] = []
+    typed = set()
+
+    def header(name: str, kind: str) -> None:
+        if name in typed:
+            return
+        typed.add(name)
+        if name in HELP:
+            lines.append(f"# HELP {PREFIX}{name} {HELP[name]}")
+        lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+    for (name, labels), value in counters:
+        header(name, "counter")
+        lines.append(f"{PREFIX}{name}{_fmt_labels(labels)} {value:g}")
+    for (name, labels), (counts, total, count) in hists:
+        header(name, "histogram")
+        cumulative = 0
+        for bound, c in zip(BUCKETS + (float("inf"),), counts):
+            cumulative += c
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append(f"{PREFIX}{name}_bucket{_fmt_labels(labels, (('le', le),))} {cumulative}")
+        lines.append(f"{PREFIX}{name}_sum{_fmt_labels(labels)} {total:.6f}")
+        lines.append(f"{PREFIX}{name}_count{_fmt_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str) -> None:
+    """Atomically rewrite ``path`` with the current metrics."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+# ── Exporters ──────────────────────────────────────────────────────────────
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve GET /metrics on ``host:port`` from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start() -> None:
+    """Start the exporters configured in the environment, once per process."""
+    global _started
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+    port = os.environ.get("MOVIEFINDER_METRICS_PORT")
+    if port:
+        try:
+            serve(int(port), os.environ.get("MOVIEFINDER_METRICS_HOST", "127.0.0.1"))
+        except (OSError, ValueError):
+            pass  # port taken (another worker process already exports)
+    path = os.environ.get("MOVIEFINDER_METRICS_FILE")
+    if path:
+        def loop():
+            while True:
+                try:
+                    write_textfile(path)
+                except OSError:
+                    pass
+                time.sleep(METRICS_INTERVAL)
+
+        threading.Thread(target=loop, name="metrics-file", daemon=True).start()
@@ -2,12 +2,12 @@
 ############################
 # Models                   #
 #                          #
-# Last update : 2025/08/24 #
+# Last update : 2026/10/18 #
 ############################
 
 
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 @dataclass
 class Movie:
@@ -21,3 +21,18 @@ class Movie:
     price: Optional[str] = None
     source: str = ""
     extra: Optional[Dict] = None
+
+
+class SearchResults(dict):
+    """Movies keyed by provider, plus the providers cut off by the deadline
+    and those skipped because their upstream's circuit breaker is open."""
+
+    def __init__(self, *args, timed_out: Optional[List[str]] = None, skipped: Optional[List[str]] = None,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timed_out: List[str] = list(timed_out or [])
+        self.skipped: List[str] = list(skipped or [])
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.timed_out or self.skipped)
@@ -0,0 +1,165 @@
+############################
+# Page preparation         #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Travail « à la demande » pour les seuls éléments affichés : enrichissement TMDB,
+# détection de langue et traduction, mémoïsés par identité d'élément. Les échecs
+# (TMDB indisponible, traduction impossible) ne sont pas mémoïsés : ils sont
+# retentés au rendu suivant.
+
+import dataclasses
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from .models import Movie
+from . import posters, tmdb, tracing
+from .i18n import TranslationUnavailable, detect_lang, translate_to_fr
+
+PREP_WORKERS = 8
+# Seconds the page waits for its poster thumbnails; later ones keep the remote URL.
+POSTER_WAIT = 3.0
+MEMO_SIZE = 5000
+
+_NOT_DONE = object()
+
+
+@dataclass
+class CardText:
+    lang: Optional[str]          # langue détectée (titre + résumé), pour le badge
+    description: str             # résumé nettoyé
+    translation: Any = _NOT_DONE  # résultat brut de translate_to_fr, ou None si inutile
+
+    @property
+    def translated(self) -> bool:
+        return self.translation is not _NOT_DONE
+
+
+class _Memo:
+    """Small thread-safe LRU keyed by item identity."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_tmdb_memo = _Memo(MEMO_SIZE)
+_text_memo = _Memo(MEMO_SIZE)
+
+
+def reset() -> None:
+    _tmdb_memo.clear()
+    _text_memo.clear()
+
+
+def item_key(movie: Movie) -> str:
+    return movie.stream_url or f"{movie.source}|{movie.title}|{movie.year or ''}"
+
+
+def description_of(movie: Movie) -> str:
+    desc = movie.description
+    if isinstance(desc, list):
+        desc = " ".join([str(x) for x in desc if x])
+    return (desc or "").strip()
+
+
+def _lookup(movie: Movie) -> Tuple[Optional[str], Optional[int]]:
+    try:
+        info = tmdb.info_for(movie.title, movie.year, strict=True)
+    except tmdb.Unavailable as err:
+        return err.info
+    _tmdb_memo.put(item_key(movie), info)
+    return info
+
+
+def _text(movie: Movie, auto_translate: bool) -> CardText:
+    key = item_key(movie)
+    prep = _text_memo.get(key)
+    if prep is None:
+        desc = description_of(movie)
+        prep = CardText(lang=detect_lang(f"{movie.title}\n{desc}"), description=desc)
+    if auto_translate and not prep.translated:
+        if prep.description and prep.lang != "fr":
+            try:
+                prep.translation = translate_to_fr(prep.description, strict=True)
+            except TranslationUnavailable:
+                # langue mémorisée, traduction retentée au prochain rendu ;
+                # ce rendu-ci affiche le texte original
+                _text_memo.put(key, prep)
+                return dataclasses.replace(prep, translation=prep.description)
+        else:
+            prep.translation = None
+    _text_memo.put(key, prep)
+    return prep
+
+
+def prepare(
+    movies: List[Movie],
+    enrich_tmdb: bool = True,
+    auto_translate: bool = True,
+    workers: int = PREP_WORKERS,
+) -> List[Tuple[Movie, Optional[CardText]]]:
+    """Enrich and translate ``movies`` (the visible page) concurrently, then
+    cache their poster thumbnails (see ``posters``).
+
+    Returns ``(movie, card_text)`` pairs in input order. With ``enrich_tmdb``
+    the movie is a copy carrying TMDB's poster and runtime: the given Movie
+    objects belong to a result set shared between sessions and are never
+    modified. ``card_text`` is None when its preparation failed. Items
+    already processed are served from memory, so reruns and revisited pages
+    cost nothing.
+    """
+    shown = list(movies)
+    texts: List[Optional[CardText]] = [None] * len(shown)
+    tmdb_jobs, text_jobs = [], []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        for i, m in enumerate(shown):
+            key = item_key(m)
+            if enrich_tmdb:
+                info = _tmdb_memo.get(key, _NOT_DONE)
+                if info is _NOT_DONE:
+                    tmdb_jobs.append((i, tracing.submit(ex, _lookup, m)))
+                else:
+                    shown[i] = tmdb.enriched(m, info)
+            cached = _text_memo.get(key)
+            if cached is not None and (cached.translated or not auto_translate):
+                texts[i] = cached
+            else:
+                text_jobs.append((i, tracing.submit(ex, _text, m, auto_translate)))
+
+        for i, fut in tmdb_jobs:
+            try:
+                shown[i] = tmdb.enriched(shown[i], fut.result())
+            except Exception:
+                pass
+        for i, fut in text_jobs:
+            try:
+                texts[i] = fut.result()
+            except Exception:
+                pass
+    # affiches (y compris celles apportées par TMDB) : miniatures locales
+    posters.fetch_many([m.poster_url for m in shown], timeout=POSTER_WAIT)
+    return list(zip(shown, texts))
@@ -1,12 +1,13 @@
-
 ############################
 # Paid combo               #
 #                          #
-# Last update : 2025/08/25 #
+# Last update : 2026/10/18 #
 ############################
 
 
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 from .models import Movie
 from . import (
     paid_dynamic,
@@ -14,8 +15,32 @@ from . import (
     paid_google_play,
     paid_amazon,
     paid_rakuten,
+    tracing,
 )
 
+# Stores in merge priority order: (name, search(query, max_results, country, include_subscriptions)).
+# iTunes answers with its first page, (movies, next offset), so that later
+# pages can be requested from it alone (see ``search_page``).
+STORES: List[Tuple[str, Callable[[str, int, str, bool], object]]] = [
+    ("dynamic", lambda q, n, c, sub: paid_dynamic.search(q, max_results=n, country=c, include_subscriptions=sub)),
+    ("itunes", lambda q, n, c, sub: paid_itunes.search_page(q, n, None, c)),
+    ("google_play", lambda q, n, c, sub: paid_google_play.search(q, country=c)),
+    ("amazon", lambda q, n, c, sub: paid_amazon.search(q, country=c)),
+    ("rakuten", lambda q, n, c, sub: paid_rakuten.search(q, country=c)),
+]
+
+# Seconds each store may take, counted from the start of the fan-out.
+DEFAULT_STORE_TIMEOUT = 5
+STORE_TIMEOUTS: Dict[str, float] = {
+    "dynamic": 15,
+    "itunes": 10,
+}
+
+
+def _store_call(name: str, fn, *args) -> List[Movie]:
+    with tracing.span(f"store:{name}"):
+        return fn(*args)
+
 
 def search(
     query: str,
@@ -25,33 +50,75 @@ def search(
 ) -> List[Movie]:
     """Aggregate paid offers from various providers.
 
-    The dynamic provider (JustWatch) is queried first, then direct
-    store lookups such as iTunes, Google Play, Amazon/Prime Video and
-    Rakuten. Results are deduplicated based on their URL.
+    The dynamic provider (JustWatch) and the direct store lookups (iTunes,
+    Google Play, Amazon/Prime Video, Rakuten) are queried concurrently, each
+    with its own timeout from ``STORE_TIMEOUTS``; a store that fails or runs
+    late contributes nothing. Results are merged in ``STORES`` order (dynamic
+    first) and deduplicated based on their URL.
     """
+    offers, _ = search_page(query, max_results, None, country, include_subscriptions)
+    return offers
+
+
+def search_page(
+    query: str,
+    page_size: int = 20,
+    cursor: Optional[int] = None,
+    country: str = "FR",
+    include_subscriptions: bool = False,
+) -> Tuple[List[Movie], Optional[int]]:
+    """One page of paid offers; ``cursor`` is an iTunes result offset.
+
+    The first page (``cursor`` None) is the full fan-out of ``search``; only
+    iTunes can page further, so later pages are iTunes results from
+    ``cursor`` on. Returns the offers and the next iTunes offset, or None
+    when there is nothing more to fetch.
+    """
+    if cursor is not None:
+        return paid_itunes.search_page(query, page_size, cursor, country)
 
     offers: List[Movie] = []
     seen_urls = set()
+    itunes_positions: List[Optional[int]] = []
+    itunes_next: Optional[int] = None
 
-    def add(items: List[Movie]) -> None:
+    def add(items: List[Movie]) -> List[Optional[int]]:
+        """Append the new items; return each one's index in ``offers`` (None if dropped)."""
+        positions: List[Optional[int]] = []
         for it in items:
             url = it.stream_url
             if url and url not in seen_urls:
+                positions.append(len(offers))
                 offers.append(it)
                 seen_urls.add(url)
+            else:
+                positions.append(None)
+        return positions
+
+    start = time.monotonic()
+    ex = ThreadPoolExecutor(max_workers=len(STORES))
+    try:
+        futures = [
+            (name, tracing.submit(ex, _store_call, name, fn, query, page_size, country, include_subscriptions))
+            for name, fn in STORES
+        ]
+        for name, fut in futures:
+            budget = STORE_TIMEOUTS.get(name, DEFAULT_STORE_TIMEOUT)
+            try:
+                items = fut.result(timeout=max(0.0, start + budget - time.monotonic()))
+            except Exception:
+                continue
+            if name == "itunes":
+                items, itunes_next = items
+                itunes_positions = add(items)
+            else:
+                add(items)
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
 
-    add(
-        paid_dynamic.search(
-            query,
-            max_results=max_results,
-            country=country,
-            include_subscriptions=include_subscriptions,
-        )
-    )
-
-    add(paid_itunes.search(query, max_results=max_results, country=country))
-    add(paid_google_play.search(query, country=country))
-    add(paid_amazon.search(query, country=country))
-    add(paid_rakuten.search(query, country=country))
-
-    return offers[:max_results]
+    # the next iTunes page starts at its first result cut off by the truncation;
+    # results dropped as duplicates were consumed all the same
+    for i, pos in enumerate(itunes_positions):
+        if pos is not None and pos >= page_size:
+            return offers[:page_size], i
+    return offers[:page_size], itunes_next
@@ -2,19 +2,23 @@
 ############################
 # Paid dynamic             #
 #                          #
-# Last update : 2025/08/25 #
+# Last update : 2026/10/18 #
 ############################
 
 
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from .models import Movie
+from . import http_client, lazy, storage, tracing
+import json
 import logging
+import os
+import threading
+import time
 import requests
 
-try:
-    from justwatch import JustWatch
-except Exception:
-    JustWatch = None
+_justwatch_cls = lazy.optional("justwatch", "JustWatch")
+_justwatch_headers = lazy.optional("justwatch.justwatchapi", "HEADER")
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +26,134 @@ MONETIZATION_PRIORITIES = ["buy", "rent", "flatrate", "ads", "free"]
 
 _CURRENCY_SYMBOLS = {"EUR": "€", "USD": "$", "GBP": "£"}
 
+# Concurrent get_title calls per search.
+DETAIL_WORKERS = 4
+
+# The provider list changes about weekly: serve it from memory/disk and
+# refresh it in the background once it is older than this.
+PROVIDERS_TTL = 24 * 3600
+
+# Fields of the popular-titles search body (the library sends them all, null when unused).
+_SEARCH_FIELDS = (
+    "age_certifications", "content_types", "presentation_types", "providers", "genres", "languages",
+    "release_year_from", "release_year_until", "monetization_types", "min_price", "max_price",
+    "nationwide_cinema_releases_only", "scoring_filter_types", "cinema_release", "query", "page",
+    "page_size", "timeline_type",
+)
+
+_clients: Dict[str, "JustWatch"] = {}
+_providers: Dict[str, Tuple[float, Dict[int, str]]] = {}
+_refreshing: Set[str] = set()
+_lock = threading.Lock()
+_pooled = None
+
+
+def _pooled_cls():
+    """JustWatch subclass whose HTTP calls, including the locale lookup made
+    by the constructor, all go through http_client (pools, timeouts, rate
+    limit, base URL overrides)."""
+    global _pooled
+    if _pooled is None:
+        _pooled = http_client.pooled(_justwatch_cls(), "justwatch")
+    return _pooled
+
+
+def _client(country: str) -> "JustWatch":
+    """Return the process-wide JustWatch client for ``country``.
+
+    The constructor costs a locale round trip, so clients are built once.
+    When that lookup fails the library silently falls back to en_AU: such a
+    client is neither cached nor used (LookupError), the next call retries.
+    """
+    jw = _clients.get(country)
+    if jw is None:
+        jw = _pooled_cls()(country=country, use_sessions=False, api_domain="https://apiv2.justwatch.com")
+        if not str(jw.locale).upper().endswith(f"_{country.upper()}"):
+            raise LookupError(f"JustWatch locale for {country} unavailable (got {jw.locale})")
+        with _lock:
+            jw = _clients.setdefault(country, jw)
+    return jw
+
+
+def _search_items(jw: "JustWatch", query: str) -> Dict:
+    """``jw.search_for_item(query=query, content_types=["movie"])`` without
+    touching the client: the library keeps its arguments in ``jw.kwargs``,
+    which concurrent searches on the shared client would overwrite."""
+    payload = dict.fromkeys(_SEARCH_FIELDS)
+    payload.update(query=query, content_types=["movie"])
+    url = jw.api_base_template.format(path=f"titles/{jw.locale}/popular")
+    r = jw.requests.post(url, json=payload, headers=_justwatch_headers())
+    r.raise_for_status()
+    return r.json()
+
+
+def _providers_file(country: str) -> str:
+    return os.path.join(storage.cache_dir(), f"justwatch_providers_{country.upper()}.json")
+
+
+def _load_providers(country: str) -> Optional[Tuple[float, Dict[int, str]]]:
+    try:
+        with open(_providers_file(country), encoding="utf-8") as f:
+            raw = json.load(f)
+        return float(raw["fetched_at"]), {int(k): v for k, v in raw["providers"].items()}
+    except Exception:
+        return None
+
+
+def _fetch_providers(country: str) -> Optional[Dict[int, str]]:
+    try:
+        jw = _client(country)
+        providers = {p["id"]: p["clear_name"] for p in jw.get_providers()}
+    except Exception:
+        logger.warning("JustWatch provider list unavailable for %s", country, exc_info=True)
+        return None
+    fetched_at = time.time()
+    _providers[country] = (fetched_at, providers)
+    try:
+        path = _providers_file(country)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": fetched_at, "providers": providers}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return providers
+
+
+def _refresh_in_background(country: str) -> None:
+    with _lock:
+        if country in _refreshing:
+            return
+        _refreshing.add(country)
+
+    def run():
+        try:
+            _fetch_providers(country)
+        finally:
+            with _lock:
+                _refreshing.discard(country)
+
+    threading.Thread(target=run, name=f"justwatch-providers-{country}", daemon=True).start()
+
+
+def providers_map(country: str) -> Dict[int, str]:
+    """Provider id → display name for ``country``, served from memory or disk.
+
+    Only a cold cache with no file on disk blocks on the network; a stale
+    entry is returned as is while a background refresh runs.
+    """
+    entry = _providers.get(country)
+    if entry is None:
+        entry = _load_providers(country)
+        if entry is not None:
+            _providers.setdefault(country, entry)
+    if entry is None:
+        return _fetch_providers(country) or {}
+    fetched_at, providers = entry
+    if time.time() - fetched_at > PROVIDERS_TTL:
+        _refresh_in_background(country)
+    return providers
+
 
 def _format_price(amount: Optional[float], currency: Optional[str]) -> Optional[str]:
     if amount is None or currency is None:
@@ -55,18 +187,25 @@ def _best_offer_per_provider(offers: List[Dict]) -> Dict[int, Dict]:
 def _label_monetization(m: Optional[str]) -> str:
     return {"buy":"achat","rent":"location","flatrate":"abonnement","ads":"avec pub","free":"gratuit"}.get((m or "").lower(), m or "")
 
+def _fetch_title(jw: "JustWatch", it: Dict) -> Dict:
+    # the language comes from the client's locale (fr_FR for FR), not from an argument
+    with tracing.span("justwatch.get_title", title_id=it.get("id")):
+        return jw.get_title(it.get("id"), content_type="movie")
+
+
 def search(
     query: str,
     max_results: int = 20,
     country: str = "FR",
     include_subscriptions: bool = False,
 ) -> List[Movie]:
-    if not JustWatch:
+    if not _justwatch_cls():
         return []
 
-    jw = JustWatch(country=country, api_domain="https://apiv2.justwatch.com")
     try:
-        data = jw.search_for_item(query=query, content_types=["movie"])
+        jw = _client(country)
+        with tracing.span("justwatch.search", country=country):
+            data = _search_items(jw, query)
     except requests.HTTPError as err:
         logger.exception("JustWatch HTTP error during search: %s", err)
         return []
@@ -77,71 +216,80 @@ def search(
     out: List[Movie] = []
     used_urls: Set[str] = set()
 
+    prov_names = providers_map(country)
+
+    # Title details are fetched concurrently up front and consumed in ranking
+    # order; whatever is still queued is cancelled once we return.
+    candidates = items[:8]
+    ex = ThreadPoolExecutor(max_workers=DETAIL_WORKERS)
     try:
-        providers_map = {p["id"]: p["clear_name"] for p in jw.get_providers()}
-    except Exception:
-        providers_map = {}
-
-    for it in items[:8]:
-        title = it.get("title") or query
-        year = it.get("original_release_year") or None
-        full_path = it.get("full_path")
-        runtime = it.get("runtime")
-
-        offers = it.get("offers")
-        details = None
-        if offers is None or runtime is None:
-            try:
-                details = jw.get_title(content_type="movie", title_id=it.get("id"), language="fr")
-                offers = details.get("offers", []) if offers is None else offers
-                full_path = details.get("full_path", full_path)
-                if runtime is None:
-                    runtime = details.get("runtime")
-            except requests.HTTPError as err:
-                logger.exception("JustWatch HTTP error during title fetch: %s", err)
-                return []
-            except Exception:
-                offers = offers or []
-
-        duration = None
-        if isinstance(runtime, int) and runtime > 0:
-            duration = runtime if runtime < 300 else runtime // 60
-
-        allowed = {"buy", "rent"} | ({"flatrate"} if include_subscriptions else set())
-        offers = [
-            o
-            for o in (offers or [])
-            if o.get("country") == country and o.get("monetization_type") in allowed
-        ]
-        if not offers:
-            continue
+        pending = {
+            i: tracing.submit(ex, _fetch_title, jw, it)
+            for i, it in enumerate(candidates)
+            if it.get("offers") is None or it.get("runtime") is None
+        }
+        for i, it in enumerate(candidates):
+            title = it.get("title") or query
+            year = it.get("original_release_year") or None
+            full_path = it.get("full_path")
+            runtime = it.get("runtime")
 
-        best = _best_offer_per_provider(offers)
-        if not best:
-            continue
+            offers = it.get("offers")
+            details = None
+            if i in pending:
+                try:
+                    details = pending[i].result()
+                    offers = details.get("offers", []) if offers is None else offers
+                    full_path = details.get("full_path", full_path)
+                    if runtime is None:
+                        runtime = details.get("runtime")
+                except requests.HTTPError as err:
+                    logger.exception("JustWatch HTTP error during title fetch: %s", err)
+                    return []
+                except Exception:
+                    offers = offers or []
 
-        justwatch_title_url = f"https://www.justwatch.com{full_path}" if full_path else None
+            duration = None
+            if isinstance(runtime, int) and runtime > 0:
+                duration = runtime if runtime < 300 else runtime // 60
 
-        for pid, off in best.items():
-            prov_name = providers_map.get(pid, f"Plateforme {pid}")
-            mono = _label_monetization(off.get("monetization_type"))
-            price = _format_price(off.get("retail_price"), off.get("currency"))
-            urls = off.get("urls") or {}
-            url = urls.get("standard_web") or off.get("standard_web_url") or justwatch_title_url
-            if not url or url in used_urls:
+            allowed = {"buy", "rent"} | ({"flatrate"} if include_subscriptions else set())
+            offers = [
+                o
+                for o in (offers or [])
+                if o.get("country") == country and o.get("monetization_type") in allowed
+            ]
+            if not offers:
                 continue
-            used_urls.add(url)
-
-            out.append(Movie(
-                title=title,
-                year=year,
-                duration_minutes=duration,
-                description=f"Disponible sur {prov_name} – {mono}",
-                stream_url=url,
-                price=price,
-                source=prov_name,
-                extra={"monetization": mono, "provider_id": pid},
-            ))
-            if len(out) >= max_results:
-                return out
+
+            best = _best_offer_per_provider(offers)
+            if not best:
+                continue
+
+            justwatch_title_url = f"https://www.justwatch.com{full_path}" if full_path else None
+
+            for pid, off in best.items():
+                prov_name = prov_names.get(pid, f"Plateforme {pid}")
+                mono = _label_monetization(off.get("monetization_type"))
+                price = _format_price(off.get("retail_price"), off.get("currency"))
+                urls = off.get("urls") or {}
+                url = urls.get("standard_web") or off.get("standard_web_url") or justwatch_title_url
+                if not url or url in used_urls:
+                    continue
+                used_urls.add(url)
+
+                out.append(Movie(
+                    title=title,
+                    year=year,
+                    duration_minutes=duration,
+                    description=f"Disponible sur {prov_name} – {mono}",
+                    stream_url=url,
+                    price=price,
+                    source=prov_name,
+                    extra={"monetization": mono, "provider_id": pid},
+                ))
+                if len(out) >= max_results:
+                    return out
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
     return out
@@ -1,12 +1,13 @@
 ############################
 # Paid iTunes              #
 #                          #
-# Last update : 2025/08/25 #
+# Last update : 2026/10/18 #
 ############################
 
 import requests
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from .models import Movie
+from . import http_client
 
 _CURRENCY_SYMBOLS = {"EUR": "€", "USD": "$", "GBP": "£"}
 
@@ -34,19 +35,36 @@ def search(query: str, max_results: int = 20, country: str = "FR") -> List[Movie
     country: str, optional
         Two-letter country code used by the API.
     """
+    movies, _ = search_page(query, max_results, None, country)
+    return movies
+
+
+def search_page(
+    query: str,
+    page_size: int = 20,
+    cursor: Optional[int] = None,
+    country: str = "FR",
+) -> Tuple[List[Movie], Optional[int]]:
+    """One page of iTunes results; ``cursor`` is the result offset (None = 0).
+
+    Returns the movies and the offset of the next page, or None when exhausted.
+    """
+    offset = cursor or 0
     q = requests.utils.quote(query)
     url = (
         "https://itunes.apple.com/search"
-        f"?term={q}&media=movie&entity=movie&country={country}&limit={max_results}"
+        f"?term={q}&media=movie&entity=movie&country={country}&limit={page_size}&offset={offset}"
     )
     try:
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, provider="itunes")
         data = resp.json()
     except Exception:
-        return []
+        return [], None
 
+    results = data.get("results", [])[:page_size]
+    next_cursor = offset + len(results) if len(results) >= page_size else None
     out: List[Movie] = []
-    for it in data.get("results", [])[:max_results]:
+    for it in results:
         title = it.get("trackName") or query
         stream_url = it.get("trackViewUrl")
         if not stream_url:
@@ -80,6 +98,4 @@ def search(query: str, max_results: int = 20, country: str = "FR") -> List[Movie
                 extra={"monetization": mono} if mono else None,
             )
         )
-        if len(out) >= max_results:
-            break
-    return out
+    return out, next_cursor
@@ -0,0 +1,288 @@
+############################
+# Poster thumbnails        #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Affiches téléchargées une fois, réduites à la largeur des cartes et
+# ré-encodées (WebP, sinon JPEG), stockées dans <cache>/posters sous le hash
+# de leur contenu. Le dossier est plafonné à BUDGET_BYTES : les fichiers les
+# moins récemment servis sont supprimés en premier.
+# Sans Pillow, l'image d'origine est conservée telle quelle.
+
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from . import http_client, lazy, singleflight, storage
+
+DB_FILE = "posters.sqlite3"
+CARD_WIDTH = 240              # px ; la colonne d'affiche fait 1/4 de la carte
+QUALITY = 72
+BUDGET_BYTES = int(float(os.environ.get("MOVIEFINDER_POSTER_CACHE_MB", "200")) * 1024 * 1024)
+NEGATIVE_TTL = 3600           # une URL en échec (4xx, image illisible) n'est retentée qu'après ce délai
+POSTER_WORKERS = 6
+MAX_SOURCE_BYTES = 10 * 1024 * 1024
+READ_CHUNK = 64 * 1024
+TOUCH_INTERVAL = 600          # last_access n'est réécrit qu'au plus une fois par intervalle et par fichier
+
+_image = lazy.optional("PIL.Image")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS poster_urls (
+    url        TEXT PRIMARY KEY,
+    hash       TEXT,              -- NULL : téléchargement en échec
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS poster_files (
+    hash        TEXT PRIMARY KEY,
+    ext         TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS poster_files_lru ON poster_files(last_access);
+"""
+
+_inflight = singleflight.Group()
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_evict_lock = threading.Lock()
+
+
+def _conn() -> sqlite3.Connection:
+    return storage.connect(DB_FILE, _SCHEMA)
+
+
+def _dir() -> str:
+    path = os.path.join(storage.cache_dir(), "posters")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _path(digest: str, ext: str) -> str:
+    return os.path.join(_dir(), f"{digest}.{ext}")
+
+
+# ── Encoding ───────────────────────────────────────────────────────────────
+def thumbnail(data: bytes) -> Tuple[bytes, str]:
+    """Downsize ``data`` to CARD_WIDTH and re-encode it; returns (bytes, ext)."""
+    Image = _image()
+    if Image is None:
+        return data, "img"
+    with Image.open(io.BytesIO(data)) as im:
+        im.load()
+        if im.width > CARD_WIDTH:
+            im = im.resize((CARD_WIDTH, max(1, round(im.height * CARD_WIDTH / im.width))), Image.LANCZOS)
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if "transparency" in im.info else "RGB")
+        out = io.BytesIO()
+        try:
+            im.save(out, "WEBP", quality=QUALITY, method=4)
+            ext = "webp"
+        except (KeyError, OSError):
+            out = io.BytesIO()
+            im.convert("RGB").save(out, "JPEG", quality=QUALITY, optimize=True, progressive=True)
+            ext = "jpg"
+    encoded = out.getvalue()
+    # une miniature plus lourde que l'original (petites images) ne sert à rien
+    return (encoded, ext) if len(encoded) < len(data) else (data, "img")
+
+
+# ── Cache ──────────────────────────────────────────────────────────────────
+def get(url: str) -> Optional[bytes]:
+    """Cached thumbnail for ``url``, without any network access."""
+    try:
+        conn = _conn()
+        row = conn.execute(
+            "SELECT f.hash, f.ext, f.last_access FROM poster_urls u JOIN poster_files f ON f.hash = u.hash "
+            "WHERE u.url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        digest, ext, last_access = row
+        with open(_path(digest, ext), "rb") as f:
+            data = f.read()
+        now = time.time()
+        if now - last_access >= TOUCH_INTERVAL:
+            conn.execute("UPDATE poster_files SET last_access = ? WHERE hash = ?", (now, digest))
+        return data
+    except (sqlite3.Error, OSError):
+        return None
+
+
+def _rollback(conn: sqlite3.Connection) -> None:
+    # a transaction left open by an earlier failure on this thread's connection
+    if conn.in_transaction:
+        conn.execute("ROLLBACK")
+
+
+def _known_failure(url: str) -> bool:
+    try:
+        row = _conn().execute("SELECT hash, fetched_at FROM poster_urls WHERE url = ?", (url,)).fetchone()
+    except sqlite3.Error:
+        return False
+    return row is not None and row[0] is None and time.time() - row[1] < NEGATIVE_TTL
+
+
+def _remember_failure(url: str) -> None:
+    try:
+        _conn().execute(
+            "INSERT OR REPLACE INTO poster_urls (url, hash, fetched_at) VALUES (?, NULL, ?)",
+            (url, time.time()),
+        )
+    except sqlite3.Error:
+        pass
+
+
+def _read_body(resp: requests.Response, limit: int) -> bytes:
+    """At most ``limit`` bytes of the streamed body of ``resp``."""
+    out = bytearray()
+    for chunk in resp.iter_content(READ_CHUNK):
+        out += chunk
+        if len(out) >= limit:
+            break
+    return bytes(out[:limit])
+
+
+def _download(url: str) -> Optional[bytes]:
+    """Download and encode ``url``. Only permanent failures (HTTP 4xx other
+    than 408/429, oversized or undecodable images) are remembered; network
+    errors, timeouts, 5xx, rate limits and open circuits are retried on the
+    next request.
+
+    The body is streamed: an image announced (Content-Length) or found to be
+    larger than MAX_SOURCE_BYTES is rejected without reading the rest.
+    """
+    if _known_failure(url):
+        return None
+    try:
+        with http_client.get(url, provider="posters", stream=True) as resp:
+            status = resp.status_code
+            if 400 <= status < 500 and status not in (408, 429):
+                _remember_failure(url)
+                return None
+            if status != 200:
+                return None
+            length = resp.headers.get("Content-Length", "")
+            if length.isdigit() and int(length) > MAX_SOURCE_BYTES:
+                _remember_failure(url)
+                return None
+            body = _read_body(resp, MAX_SOURCE_BYTES + 1)
+    except requests.RequestException:
+        return None
+    if len(body) > MAX_SOURCE_BYTES:
+        _remember_failure(url)
+        return None
+    try:
+        data, ext = thumbnail(body)
+    except Exception:   # PIL: UnidentifiedImageError, DecompressionBombError…
+        _remember_failure(url)
+        return None
+    digest = hashlib.sha256(data).hexdigest()
+    path = _path(digest, ext)
+    try:
+        if not os.path.exists(path):
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        conn = _conn()
+        now = time.time()
+        _rollback(conn)
+        conn.execute("BEGIN")
+        conn.execute(
+            "INSERT OR REPLACE INTO poster_files (hash, ext, size, last_access) VALUES (?, ?, ?, ?)",
+            (digest, ext, len(data), now),
+        )
+        conn.execute("INSERT OR REPLACE INTO poster_urls (url, hash, fetched_at) VALUES (?, ?, ?)",
+                     (url, digest, now))
+        conn.execute("COMMIT")
+    except (sqlite3.Error, OSError):
+        return data
+    _evict()
+    return data
+
+
+def fetch(url: str) -> Optional[bytes]:
+    """Thumbnail for ``url``, downloading it once (concurrent callers share the download)."""
+    data = get(url)
+    if data is None:
+        data = _inflight.do(url, _download, url)
+    return data
+
+
+def _evict() -> None:
+    """Drop least recently served files until the cache fits BUDGET_BYTES."""
+    if not _evict_lock.acquire(blocking=False):
+        return  # another thread is already evicting
+    try:
+        conn = _conn()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM poster_files").fetchone()[0]
+        if total <= BUDGET_BYTES:
+            return
+        victims = []
+        for digest, ext, size in conn.execute("SELECT hash, ext, size FROM poster_files ORDER BY last_access"):
+            victims.append((digest, ext))
+            total -= size
+            if total <= BUDGET_BYTES * 0.9:   # marge : pas d'éviction à chaque ajout
+                break
+        _rollback(conn)
+        conn.execute("BEGIN")
+        conn.executemany("DELETE FROM poster_files WHERE hash = ?", [(d,) for d, _ in victims])
+        conn.executemany("DELETE FROM poster_urls WHERE hash = ?", [(d,) for d, _ in victims])
+        conn.execute("COMMIT")
+        for digest, ext in victims:
+            try:
+                os.remove(_path(digest, ext))
+            except OSError:
+                pass
+    except sqlite3.Error:
+        pass
+    finally:
+        _evict_lock.release()
+
+
+# ── Batch ──────────────────────────────────────────────────────────────────
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=POSTER_WORKERS, thread_name_prefix="posters")
+    return _pool
+
+
+def fetch_many(urls: Iterable[str], timeout: Optional[float] = None) -> Dict[str, bytes]:
+    """Thumbnails of ``urls`` fetched concurrently; those not ready within
+    ``timeout`` are left downloading in the background and omitted."""
+    out: Dict[str, bytes] = {}
+    missing: List[str] = []
+    for url in dict.fromkeys(u for u in urls if u):
+        data = get(url)
+        if data is not None:
+            out[url] = data
+        else:
+            missing.append(url)
+    if not missing:
+        return out
+    futures = {_executor().submit(fetch, url): url for url in missing}
+    done, _ = wait(futures, timeout=timeout)
+    for fut in done:
+        data = None if fut.exception() else fut.result()
+        if data is not None:
+            out[futures[fut]] = data
+    return out
+
+
+def prefetch(urls: Iterable[str]) -> None:
+    """Download the thumbnails of ``urls`` in the background."""
+    for url in dict.fromkeys(u for u in urls if u):
+        _executor().submit(fetch, url)
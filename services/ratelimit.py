@@ -0,0 +1,178 @@
+############################
+# Rate limiting            #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Token buckets per upstream host, shared by every thread of the process.
+# Rates can be overridden without code changes:
+#     MOVIEFINDER_RATE_LIMITS="api.themoviedb.org=20/40,itunes.apple.com=0.3/3"
+# (requests per second / burst size).
+
+import asyncio
+import email.utils
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+# host -> (requests per second, burst)
+RATES: Dict[str, Tuple[float, float]] = {
+    "api.themoviedb.org": (20.0, 40.0),
+    "archive.org": (10.0, 20.0),
+    "www.googleapis.com": (10.0, 20.0),
+    "itunes.apple.com": (0.33, 5.0),       # ~20 requests / minute
+    "api.mymemory.translated.net": (2.0, 5.0),
+    "apis.justwatch.com": (5.0, 10.0),
+    "translate.google.com": (5.0, 10.0),
+    # thumbnails, apart from the search API on the same host (http_client.upstream_key)
+    "posters@archive.org": (5.0, 10.0),
+}
+
+# Longest Retry-After we honor by waiting and retrying once (seconds).
+MAX_RETRY_AFTER = 5.0
+DEFAULT_RETRY_AFTER = 1.0
+
+
+class RateLimitExceeded(requests.RequestException):
+    """No token could be obtained within the caller's time budget."""
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        start = max(self._last, self._paused_until)
+        if now > start:
+            self._tokens = min(self.burst, self._tokens + (now - start) * self.rate)
+        self._last = now
+
+    def _reserve(self, tokens: float, timeout: Optional[float]) -> Optional[float]:
+        """Take ``tokens`` now (possibly going into debt) and return how long
+        the caller must wait before using them, or None if over ``timeout``."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self._paused_until - now)
+            deficit = tokens - self._tokens
+            if deficit > 0:
+                wait += deficit / self.rate
+            if timeout is not None and wait > timeout:
+                return None
+            self._tokens -= tokens
+            return wait
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """Block until ``tokens`` are available; False if that exceeds ``timeout``."""
+        wait = self._reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        wait = self._reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for ``seconds`` (e.g. after a 429)."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._paused_until = max(self._paused_until, now + seconds)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_lock = threading.Lock()
+
+
+def _overrides() -> Dict[str, Tuple[float, float]]:
+    out: Dict[str, Tuple[float, float]] = {}
+    for item in os.environ.get("MOVIEFINDER_RATE_LIMITS", "").split(","):
+        host, _, spec = item.strip().partition("=")
+        if not host or not spec:
+            continue
+        rate, _, burst = spec.partition("/")
+        try:
+            out[host] = (float(rate), float(burst or rate))
+        except ValueError:
+            continue
+    return out
+
+
+def _host(url_or_host: str) -> str:
+    return urlsplit(url_or_host).netloc if "://" in url_or_host else url_or_host
+
+
+def bucket_for(url_or_host: str) -> Optional[TokenBucket]:
+    """Shared bucket for a host, or None when the host is not rate limited."""
+    host = _host(url_or_host)
+    bucket = _buckets.get(host)
+    if bucket is None:
+        spec = _overrides().get(host) or RATES.get(host)
+        if spec is None:
+            return None
+        with _lock:
+            bucket = _buckets.setdefault(host, TokenBucket(*spec))
+    return bucket
+
+
+def configure(host: str, rate: float, burst: Optional[float] = None) -> None:
+    with _lock:
+        RATES[host] = (rate, burst or rate)
+        _buckets[host] = TokenBucket(rate, burst or rate)
+
+
+def acquire(url_or_host: str, timeout: Optional[float] = None) -> None:
+    """Wait for a token for ``url_or_host``; raise RateLimitExceeded past ``timeout``."""
+    bucket = bucket_for(url_or_host)
+    if bucket is not None and not bucket.acquire(timeout=timeout):
+        raise RateLimitExceeded(f"rate limit for {_host(url_or_host)} not available within {timeout}s")
+
+
+async def acquire_async(url_or_host: str, timeout: Optional[float] = None) -> None:
+    bucket = bucket_for(url_or_host)
+    if bucket is not None and not await bucket.acquire_async(timeout=timeout):
+        raise RateLimitExceeded(f"rate limit for {_host(url_or_host)} not available within {timeout}s")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def backoff(url_or_host: str, retry_after: Optional[str]) -> float:
+    """Pause the host's bucket after a 429 and return the pause length."""
+    delay = parse_retry_after(retry_after)
+    if delay is None:
+        delay = DEFAULT_RETRY_AFTER
+    bucket = bucket_for(url_or_host)
+    if bucket is not None:
+        bucket.pause(delay)
+    return delay
@@ -0,0 +1,178 @@
+############################
+# Result set               #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import Movie, SearchResults
+from . import tracing
+from .search import active_providers, iter_search
+
+
+class ResultSet:
+    """Search results fetched from the providers one page at a time.
+
+    Each round asks the requested providers that still have results for
+    their next page (``page_size`` items) through ``iter_search``; pages are
+    appended in provider order, so earlier positions never move. Rounds are
+    only run when a caller needs more items than are loaded (``ensure``),
+    optionally one page ahead in the background (``prefetch``), and only for
+    the providers being paged: paging the free results leaves the paid ones
+    alone.
+
+    Instances are thread-safe and may be shared between sessions: what they
+    report (``timed_out``, ``skipped``) describes the loaded data, which every
+    session sees alike, not the last fetch of any one of them.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        order: List[str],
+        page_size: int = 20,
+        enrich_tmdb: bool = True,
+        mode: str = "films",
+        country: str = "FR",
+        include_subscriptions: bool = False,
+        deadline_ms: Optional[int] = None,
+    ):
+        self.query = query
+        self.order = active_providers(order, mode)
+        self.page_size = page_size
+        self.enrich_tmdb = enrich_tmdb
+        self.mode = mode
+        self.country = country
+        self.include_subscriptions = include_subscriptions
+        self.deadline_ms = deadline_ms
+        self.rounds = 0
+        self._cursors: Dict[str, Any] = {}
+        self._chunks: List[Tuple[str, List[Movie]]] = []
+        self._timed_out: Set[str] = set()
+        self._skipped: Set[str] = set()
+        self._fetch_lock = threading.Lock()
+        self._prefetch_lock = threading.Lock()
+
+    # ── Loaded data ─────────────────────────────────────────────────────────
+    def items(self, keys: Optional[Iterable[str]] = None) -> List[Movie]:
+        """Loaded movies of ``keys`` (default: all), in stable display order."""
+        wanted = set(self.order if keys is None else keys)
+        return [m for k, lst in list(self._chunks) if k in wanted for m in lst]
+
+    def exhausted(self, keys: Optional[Iterable[str]] = None) -> bool:
+        """True once every provider in ``keys`` has no further page."""
+        if self.rounds == 0:
+            return False
+        keys = self.order if keys is None else keys
+        return all(k in self._cursors and self._cursors[k] is None for k in keys if k in self.order)
+
+    @property
+    def timed_out(self) -> List[str]:
+        """Providers whose latest page request was cut off by the deadline.
+
+        Their cursor was kept: the next round asks for the same page, and a
+        provider leaves this list as soon as it answers.
+        """
+        return [k for k in self.order if k in self._timed_out]
+
+    @property
+    def skipped(self) -> List[str]:
+        """Providers whose latest page request was refused by an open circuit breaker."""
+        return [k for k in self.order if k in self._skipped]
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.timed_out or self.skipped)
+
+    # ── Fetching ────────────────────────────────────────────────────────────
+    def fetch_round(
+        self,
+        on_result: Optional[Callable[[SearchResults], None]] = None,
+        keys: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Fetch the next page of every provider in ``keys`` (default: all);
+        return the number of new items.
+
+        ``on_result(partial)`` is called each time a provider's page arrives.
+        """
+        with self._fetch_lock:
+            return self._fetch_round(on_result, keys)
+
+    def _fetch_round(self, on_result, keys=None) -> int:
+        with tracing.span("fetch_round", root=True, query=self.query, round=self.rounds + 1), \
+                tracing.profiled(f"round{self.rounds + 1}-{self.query}"):
+            return self._fetch_round_traced(on_result, keys)
+
+    def _fetch_round_traced(self, on_result, keys) -> int:
+        wanted = set(self.order if keys is None else keys)
+        order = [k for k in self.order if k in wanted]
+        if not order:
+            return 0  # iter_search would fall back to the default order
+        cursors = dict(self._cursors)
+        page = SearchResults()
+        for _ in iter_search(
+            self.query,
+            max_results=self.page_size,
+            order=order,
+            enrich_tmdb=self.enrich_tmdb,
+            mode=self.mode,
+            country=self.country,
+            include_subscriptions=self.include_subscriptions,
+            deadline_ms=self.deadline_ms,
+            results=page,
+            cursors=cursors,
+        ):
+            if on_result:
+                on_result(page)
+        self._chunks.extend((k, page[k]) for k in self.order if page.get(k))
+        self._cursors = cursors
+        # every provider of the round either answered, timed out or was skipped;
+        # the others keep their status
+        answered = set(page)
+        self._timed_out = (self._timed_out - answered - set(page.skipped)) | set(page.timed_out)
+        self._skipped = (self._skipped - answered - set(page.timed_out)) | set(page.skipped)
+        self.rounds += 1
+        return sum(len(v) for v in page.values())
+
+    def ensure(self, count: int, keys: Optional[Iterable[str]] = None, on_result=None) -> None:
+        """Fetch rounds until ``count`` items of ``keys`` are loaded or none are left."""
+        keys = list(self.order if keys is None else keys)
+        while len(self.items(keys)) < count and not self.exhausted(keys):
+            with self._fetch_lock:
+                if len(self.items(keys)) >= count or self.exhausted(keys):
+                    break
+                if self._fetch_round(on_result, keys) == 0:
+                    break  # nothing new (errors or deadline): let the caller retry later
+
+    def page(self, page: int, per_page: int, keys: Optional[Iterable[str]] = None):
+        """Return ``(items, page, has_next)`` for the 1-based ``page``, fetching if needed."""
+        keys = list(self.order if keys is None else keys)
+        page = max(1, page)
+        self.ensure(page * per_page, keys)
+        loaded = self.items(keys)
+        last = max(1, (len(loaded) + per_page - 1) // per_page)
+        page = min(page, last)
+        start = (page - 1) * per_page
+        has_next = len(loaded) > page * per_page or not self.exhausted(keys)
+        return loaded[start:start + per_page], page, has_next
+
+    def prefetch(self, page: int, per_page: int, keys: Optional[Iterable[str]] = None) -> bool:
+        """Load what ``page`` needs in a background thread; False if nothing to do."""
+        keys = list(self.order if keys is None else keys)
+        if len(self.items(keys)) >= page * per_page or self.exhausted(keys):
+            return False
+        if not self._prefetch_lock.acquire(blocking=False):
+            return False  # a prefetch is already running
+
+        def run():
+            try:
+                self.ensure(page * per_page, keys)
+            except Exception:
+                pass
+            finally:
+                self._prefetch_lock.release()
+
+        threading.Thread(target=run, name="resultset-prefetch", daemon=True).start()
+        return True
@@ -1,68 +1,301 @@
-
 ############################
 # Search                   #
 #                          #
-# Last update : 2025/08/24 #
+# Last update : 2026/10/18 #
 ############################
 
-from typing import Dict, List
-from concurrent.futures import ThreadPoolExecutor
-from .models import Movie
-from . import archive_org, youtube_free, tmdb
+import copy
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from .models import Movie, SearchResults
+from . import archive_local, youtube_free, tmdb, singleflight, metrics, tracing, breaker
 from . import paid_combo as paid_links   # ⬅️ combo dynamique + fallback
 
 
 
 PROVIDERS = {
-    "archive": archive_org.search,
+    "archive": archive_local.search,   # index local, API en ligne en secours
     "youtube": youtube_free.search,
     "paid": paid_links.search,
 }
 DEFAULT_ORDER = ["archive", "youtube", "paid"]
 
+# Providers able to fetch results page by page:
+# search_page(query, page_size, cursor, ...) -> (movies, next_cursor or None).
+PAGERS = {
+    "archive": archive_local.search_page,
+    "youtube": youtube_free.search_page,
+    "paid": paid_links.search_page,   # pages suivantes : iTunes seul (offset)
+}
+
+# Upstream hosts behind each provider: a provider is skipped (and listed in
+# ``SearchResults.skipped``) while the circuit breakers of all of them are open.
+UPSTREAMS = {
+    "archive": ("archive.org",),
+    "youtube": ("www.googleapis.com",),
+    "paid": ("apis.justwatch.com", "itunes.apple.com"),
+}
+TMDB_HOST = "api.themoviedb.org"
+
+# Number of concurrent TMDB lookups during enrichment.
+ENRICH_WORKERS = 8
+
+# Identical concurrent run_search calls (e.g. several sessions searching the
+# same title) share one execution; each waiter gets its own copy of the results.
+_inflight = singleflight.Group(share=copy.deepcopy)
 
-def run_search(
-    query: str,
-    max_results: int = 20,
-    order: List[str] | None = None,
-    enrich_tmdb: bool = True,
-    mode: str = "films",
-    country: str = "FR",   # pays fixé ici
-    include_subscriptions: bool = False,
-) -> Dict[str, List[Movie]]:
-    order = order or DEFAULT_ORDER
-    results: Dict[str, List[Movie]] = {}
 
+def _tmdb_lookup(movie: Movie) -> Tuple[Optional[str], Optional[int]]:
+    return tmdb.info_for(movie.title, movie.year)
+
+
+def active_providers(order: List[str] | None, mode: str) -> List[str]:
+    """Known providers of ``order`` (default order if None) that apply to ``mode``."""
     active = []
-    for key in order:
+    for key in order or DEFAULT_ORDER:
         if key not in PROVIDERS:
             continue
         if mode == "autres" and key in ("youtube", "paid"):
             continue
         active.append(key)
+    return active
+
+
+def _circuit_open(key: str, mode: str) -> bool:
+    hosts = UPSTREAMS.get(key)
+    if not hosts or not all(breaker.is_open(h) for h in hosts):
+        return False
+    # films are still served from the local Archive.org index
+    return not (key == "archive" and mode == "films" and archive_local.ingested_at() is not None)
+
+
+def _call_provider(key, query, max_results, mode, country, include_subscriptions) -> List[Movie]:
+    if key == "archive":
+        return PROVIDERS[key](query, max_results, mode)
+    if key == "paid":
+        return PROVIDERS[key](query, max_results, country, include_subscriptions)
+    return PROVIDERS[key](query, max_results)
+
+
+def _measured(key: str, fn, *args):
+    """Run a provider call, recording its latency, errors and empty answers."""
+    start = time.perf_counter()
+    with tracing.span(f"provider:{key}") as sp:
+        try:
+            out = fn(*args)
+        except Exception:
+            metrics.inc("provider_errors_total", provider=key)
+            raise
+        finally:
+            metrics.observe("provider_seconds", time.perf_counter() - start, provider=key)
+        movies = out[0] if isinstance(out, tuple) else out
+        sp.set(results=len(movies or []))
+    if not movies:
+        metrics.inc("provider_empty_total", provider=key)
+    return out
+
+
+def _call_page(key, query, page_size, cursor, mode, country, include_subscriptions) -> Tuple[List[Movie], Any]:
+    """Fetch one page; providers without a pager return everything at once."""
+    pager = PAGERS.get(key)
+    if pager is None:
+        return _call_provider(key, query, page_size, mode, country, include_subscriptions), None
+    if key == "archive":
+        return pager(query, page_size, cursor, mode)
+    if key == "paid":
+        return pager(query, page_size, cursor, country, include_subscriptions)
+    return pager(query, page_size, cursor)
+
+
+def iter_search(
+    query: str,
+    max_results: int = 20,
+    order: List[str] | None = None,
+    enrich_tmdb: bool = True,
+    mode: str = "films",
+    country: str = "FR",
+    include_subscriptions: bool = False,
+    enrich_workers: int = ENRICH_WORKERS,
+    deadline_ms: Optional[int] = None,
+    results: Optional[SearchResults] = None,
+    cursors: Optional[Dict[str, Any]] = None,
+) -> Iterator[Tuple[str, List[Movie]]]:
+    """Yield ``(provider_key, movies)`` as soon as each provider is complete.
+
+    Providers run concurrently and are yielded in completion order. TMDB
+    enrichment is a separate stage: as soon as a free provider returns its
+    list, one lookup per movie is queued on a pool bounded by
+    ``enrich_workers``; the provider is yielded once all of its lookups are
+    done. Lookups only compute (poster, runtime); from the consuming thread,
+    each enriched movie (a copy, see ``tmdb.enriched``) then replaces its
+    entry in the provider's list.
+
+    With ``deadline_ms``, waiting stops when the budget is spent: providers
+    still enriching are yielded with the lookups finished so far, and the
+    providers that never answered are listed in ``results.timed_out``.
+    Stragglers are abandoned, never waited on. ``results``, if given, is
+    filled with every yielded list.
+
+    With ``cursors``, each provider fetches a single page of ``max_results``
+    items after ``cursors[key]`` (first page when the key is absent) and the
+    dict is updated with the next cursor; None marks an exhausted provider,
+    which is skipped. Providers without a pager, or that fail, are fetched
+    once and then marked exhausted. A provider cut off by the deadline, or
+    refused by an open circuit breaker, keeps its cursor so the same page can
+    be requested again.
 
-    with ThreadPoolExecutor(max_workers=min(8, len(active))) as ex:
+    Providers whose upstreams all have an open circuit breaker are not
+    called at all and are listed in ``results.skipped``; TMDB enrichment is
+    skipped while its breaker is open.
+    """
+    if results is None:
+        results = SearchResults()
+    active = active_providers(order, mode)
+    if cursors is not None:
+        active = [k for k in active if not (k in cursors and cursors[k] is None)]
+    results.skipped = [k for k in active if _circuit_open(k, mode)]
+    for k in results.skipped:
+        metrics.inc("provider_skipped_total", provider=k)
+    active = [k for k in active if k not in results.skipped]
+    if not active:
+        return
+    deadline = None if deadline_ms is None else time.monotonic() + deadline_ms / 1000
+
+    enrich_ex = ThreadPoolExecutor(max_workers=max(1, enrich_workers))
+    ex = ThreadPoolExecutor(max_workers=min(8, len(active)))
+    try:
         futures = {}
         for k in active:
-            if k == "archive":
-                futures[ex.submit(PROVIDERS[k], query, max_results, mode)] = k
-            elif k == "paid":
-                futures[ex.submit(PROVIDERS[k], query, max_results, country, include_subscriptions)] = k
+            if cursors is None:
+                fut = tracing.submit(ex, _measured, k, _call_provider, k, query, max_results, mode, country,
+                                include_subscriptions)
             else:
-                futures[ex.submit(PROVIDERS[k], query, max_results)] = k
-
-        for fut in futures:
-            key = futures[fut]
-            try:
-                lst = fut.result()
-                if enrich_tmdb and key != "paid":
-                    for m in lst:
-                        poster, runtime = tmdb.info_for(m.title, m.year)
-                        if not m.poster_url:
-                            m.poster_url = poster
-                        if runtime and not m.duration_minutes:
-                            m.duration_minutes = runtime
+                fut = tracing.submit(ex, _measured, k, _call_page, k, query, max_results, cursors.get(k), mode, country,
+                                include_subscriptions)
+            futures[fut] = k
+
+        enriching: Dict[str, Tuple[List[Movie], list]] = {}
+        waiting = set(futures)
+        while waiting:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, waiting = wait(waiting, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break  # budget spent
+            for fut in done:
+                key = futures.get(fut)
+                if key is None:
+                    continue  # an enrichment lookup
+                try:
+                    lst = fut.result()
+                    if cursors is not None:
+                        lst, cursors[key] = lst
+                except breaker.CircuitOpen:
+                    lst = []
+                    results.skipped.append(key)
+                except Exception:
+                    lst = []
+                    if cursors is not None:
+                        cursors[key] = None
+                if enrich_tmdb and key != "paid" and lst and not breaker.is_open(TMDB_HOST):
+                    jobs = [(i, tracing.submit(enrich_ex, _tmdb_lookup, m)) for i, m in enumerate(lst)]
+                    enriching[key] = (lst, jobs)
+                    waiting.update(f for _, f in jobs)
+                elif key in results.skipped:
+                    continue
+                else:
+                    results[key] = lst
+                    yield key, lst
+
+            for key, (lst, jobs) in list(enriching.items()):
+                if not all(f.done() for _, f in jobs):
+                    continue
+                del enriching[key]
+                _apply_jobs(lst, jobs)
                 results[key] = lst
-            except Exception:
-                results[key] = []
-    return results
+                yield key, lst
+
+        # Deadline: keep whatever enrichment finished, drop the rest.
+        for key, (lst, jobs) in enriching.items():
+            _apply_jobs(lst, jobs)
+            results[key] = lst
+            yield key, lst
+        results.timed_out = [k for k in active if k not in results and k not in results.skipped]
+        for k in results.timed_out:
+            metrics.inc("provider_timeouts_total", provider=k)
+        if results.timed_out and tracing.current():
+            tracing.current().set(timed_out=",".join(results.timed_out))
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+        enrich_ex.shutdown(wait=False, cancel_futures=True)
+
+
+def _apply_jobs(lst: List[Movie], jobs) -> None:
+    for i, f in jobs:
+        if not f.done() or f.cancelled():
+            continue
+        try:
+            lst[i] = tmdb.enriched(lst[i], f.result())
+        except Exception:
+            pass
+
+
+def run_search(
+    query: str,
+    max_results: int = 20,
+    order: List[str] | None = None,
+    enrich_tmdb: bool = True,
+    mode: str = "films",
+    country: str = "FR",   # pays fixé ici
+    include_subscriptions: bool = False,
+    enrich_workers: int = ENRICH_WORKERS,
+    deadline_ms: Optional[int] = None,
+) -> SearchResults:
+    """Run every active provider and return their results keyed by provider,
+    in ``order``. See ``iter_search`` for the streaming variant and the
+    meaning of ``deadline_ms``.
+
+    Concurrent calls with the same (normalized) arguments are coalesced; each
+    caller receives its own copy of the results.
+    """
+    key = (
+        singleflight.normalize(query), max_results, tuple(order or DEFAULT_ORDER), enrich_tmdb,
+        mode, country, include_subscriptions, enrich_workers, deadline_ms,
+    )
+    return _inflight.do(
+        key, _run_search, query, max_results, order, enrich_tmdb, mode, country,
+        include_subscriptions, enrich_workers, deadline_ms,
+    )
+
+
+def _run_search(
+    query: str,
+    max_results: int,
+    order: List[str] | None,
+    enrich_tmdb: bool,
+    mode: str,
+    country: str,
+    include_subscriptions: bool,
+    enrich_workers: int,
+    deadline_ms: Optional[int],
+) -> SearchResults:
+    with tracing.span("run_search", root=True, query=query, mode=mode), tracing.profiled(f"search-{query}"):
+        results = SearchResults()
+        for _ in iter_search(
+            query,
+            max_results=max_results,
+            order=order,
+            enrich_tmdb=enrich_tmdb,
+            mode=mode,
+            country=country,
+            include_subscriptions=include_subscriptions,
+            enrich_workers=enrich_workers,
+            deadline_ms=deadline_ms,
+            results=results,
+        ):
+            pass
+        return SearchResults(
+            ((k, results[k]) for k in active_providers(order, mode) if k in results),
+            timed_out=results.timed_out,
+            skipped=results.skipped,
+        )
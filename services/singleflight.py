@@ -0,0 +1,81 @@
+############################
+# Singleflight             #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import re
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def normalize(text: str) -> str:
+    """Key form of a free-text argument (spacing ignored).
+
+    Case is kept: results may echo the query (e.g. a store's fallback title),
+    so "NOSFERATU" must not receive the movies built for "nosferatu".
+    """
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class Group:
+    """Collapse identical concurrent calls into one.
+
+    The first caller for a key runs ``fn``; callers arriving while it runs
+    wait and receive its result (or exception). Nothing is kept once the
+    call finishes: this is coalescing, not caching.
+
+    With ``share``, each waiter receives ``share(result)`` (e.g.
+    ``copy.deepcopy``) instead of the leader's object, for results that
+    callers may modify. Without it the same object is handed to everyone,
+    which is only safe for immutable results.
+
+    If the leader is interrupted by a ``BaseException`` that is not an
+    ``Exception`` (KeyboardInterrupt, a UI framework stopping its script…),
+    the waiters run the call again instead of inheriting the interruption.
+    """
+
+    def __init__(self, share: Optional[Callable[[Any], Any]] = None):
+        self._share = share
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+            if leader:
+                break
+
+            call.done.wait()
+            if call.error is None:
+                return call.result if self._share is None else self._share(call.result)
+            if isinstance(call.error, Exception):
+                raise call.error
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,46 @@
+############################
+# Local storage            #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+# All persistent caches live in one directory so every Streamlit worker
+# process (and every restart) shares the same files.
+_ENV_DIR = "MOVIEFINDER_CACHE_DIR"
+_DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "moviefinder")
+
+_local = threading.local()
+
+
+def cache_dir() -> str:
+    path = os.environ.get(_ENV_DIR) or _DEFAULT_DIR
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def connect(filename: str, schema: Optional[str] = None) -> sqlite3.Connection:
+    """Return this thread's connection to ``filename`` inside the cache dir.
+
+    Connections are opened in WAL mode with a busy timeout so that several
+    processes can read and write the same database concurrently. ``schema``
+    (idempotent DDL script) is run on each new connection, so it is in place
+    whichever thread or cache directory opens the database first.
+    """
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    path = os.path.join(cache_dir(), filename)
+    conn = conns.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if schema:
+            conn.executescript(schema)
+        conns[path] = conn
+    return conn
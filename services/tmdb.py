@@ -1,51 +1,124 @@
-
 ############################
 # Searching tmdb movies    #
 #                          #
-# Last update : 2025/08/24 #
+# Last update : 2026/10/18 #
 ############################
 
-import streamlit as st
-import requests
+import dataclasses
 from typing import Optional, Tuple
+from .models import Movie
+from . import config, http_client, singleflight, tmdb_cache, tracing
 
 IMG = "https://image.tmdb.org/t/p/w342"
 
-def info_for(title: str, year: Optional[int] = None) -> Tuple[Optional[str], Optional[int]]:
-    api_key = st.secrets.get("TMDB_API_KEY")
-    if not api_key:
-        return None, None
+# Concurrent lookups of the same title/year share one pair of TMDB requests.
+_inflight = singleflight.Group()
+
+
+class Unavailable(Exception):
+    """TMDB gave no definitive answer (error, timeout, open circuit breaker).
+
+    ``info`` is what the lookup still returns, e.g. the poster when only the
+    details request failed.
+    """
+
+    def __init__(self, info: Tuple[Optional[str], Optional[int]] = (None, None)):
+        super().__init__("TMDB unavailable")
+        self.info = info
+
+
+def _fetch(api_key: str, title: str, year: Optional[int]):
+    """Return ``(info, complete)`` where ``info`` is ``(poster_path, runtime)``
+    or ``None`` when TMDB has no match.
+
+    Raises when the search itself fails (network error, non-2xx status such
+    as 401/429/5xx, or a body without ``results``); ``complete`` is False when
+    only the details call failed. Neither case is cached: only a successful
+    search with an empty ``results`` is a miss.
+    """
     params = {"api_key": api_key, "query": title}
     if year:
         params["year"] = year
-    try:
-        data = requests.get(
-            "https://api.themoviedb.org/3/search/movie",
-            params=params,
-            timeout=20
-        ).json()
-        res = data.get("results", [])
-        if not res:
-            return None, None
-        first = res[0]
-        p = first.get("poster_path")
-        poster = f"{IMG}{p}" if p else None
-        movie_id = first.get("id")
-        runtime = None
-        if movie_id:
+    resp = http_client.get(
+        "https://api.themoviedb.org/3/search/movie",
+        provider="tmdb",
+        params=params,
+    )
+    resp.raise_for_status()
+    data = resp.json()
+    if not isinstance(data, dict) or "results" not in data:
+        raise ValueError("TMDB search: unexpected response body")
+    res = data["results"]
+    if not res:
+        return None, True
+    first = res[0]
+    movie_id = first.get("id")
+    runtime = None
+    complete = True
+    if movie_id:
+        try:
+            resp = http_client.get(
+                f"https://api.themoviedb.org/3/movie/{movie_id}",
+                provider="tmdb",
+                params={"api_key": api_key},
+            )
+            resp.raise_for_status()
+            runtime = resp.json().get("runtime")
+        except Exception:
+            complete = False
+    return (first.get("poster_path"), runtime), complete
+
+
+def info_for(title: str, year: Optional[int] = None, strict: bool = False) -> Tuple[Optional[str], Optional[int]]:
+    """``(poster_url, runtime)`` of ``title``; ``(None, None)`` when unknown.
+
+    Failed lookups also give what they could (``(None, None)`` at worst),
+    unless ``strict``: then they raise ``Unavailable`` so that callers can
+    tell them from a definitive answer and ask again later.
+    """
+    api_key = config.secret("TMDB_API_KEY")
+    if not api_key:
+        return None, None
+
+    with tracing.span("tmdb", title=title) as sp:
+        info = tmdb_cache.get(title, year)
+        sp.set(cached=info is not tmdb_cache.MISSING)
+        if info is tmdb_cache.MISSING:
             try:
-                details = requests.get(
-                    f"https://api.themoviedb.org/3/movie/{movie_id}",
-                    params={"api_key": api_key},
-                    timeout=20,
-                ).json()
-                runtime = details.get("runtime")
-            except Exception:
-                runtime = None
-        return poster, runtime
-    except Exception:
+                info, complete = _inflight.do(tmdb_cache.make_key(title, year), _fetch, api_key, title, year)
+            except Exception as err:
+                if strict:
+                    raise Unavailable() from err
+                return None, None
+            if complete:
+                tmdb_cache.put(title, year, info)
+            elif strict:
+                raise Unavailable(_urls(info))
+    return _urls(info)
+
+
+def _urls(info) -> Tuple[Optional[str], Optional[int]]:
+    if info is None:
         return None, None
+    p, runtime = info
+    poster = f"{IMG}{p}" if p else None
+    return poster, runtime
 
 def poster_for(title: str, year: Optional[int] = None) -> Optional[str]:
     poster, _ = info_for(title, year)
     return poster
+
+
+def enriched(movie: Movie, info: Tuple[Optional[str], Optional[int]]) -> Movie:
+    """``movie`` with TMDB's ``(poster, runtime)`` filling its gaps.
+
+    Returns a copy (``movie`` itself when there is nothing to add): movies
+    may be shared between sessions and are never modified in place.
+    """
+    poster, runtime = info
+    changes = {}
+    if poster and not movie.poster_url:
+        changes["poster_url"] = poster
+    if runtime and not movie.duration_minutes:
+        changes["duration_minutes"] = runtime
+    return dataclasses.replace(movie, **changes) if changes else movie
@@ -0,0 +1,79 @@
+############################
+# TMDB cache               #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import re
+import sqlite3
+import time
+import unicodedata
+from typing import Optional, Tuple
+from . import metrics, storage
+
+DB_FILE = "tmdb.sqlite3"
+
+# Found entries rarely change (public-domain classics); misses are retried sooner.
+POSITIVE_TTL = 30 * 24 * 3600
+NEGATIVE_TTL = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tmdb_info (
+    key        TEXT PRIMARY KEY,
+    found      INTEGER NOT NULL,
+    poster     TEXT,
+    runtime    INTEGER,
+    fetched_at REAL NOT NULL
+)
+"""
+
+MISSING = object()
+
+
+def _conn() -> sqlite3.Connection:
+    return storage.connect(DB_FILE, _SCHEMA)
+
+
+def make_key(title: str, year: Optional[int] = None) -> str:
+    t = unicodedata.normalize("NFKC", title or "").casefold()
+    t = re.sub(r"\s+", " ", t).strip()
+    return f"{t}|{year or ''}"
+
+
+def get(title: str, year: Optional[int] = None):
+    """Return cached ``(poster_path, runtime)``, ``None`` for a cached miss,
+    or ``MISSING`` when nothing fresh is stored."""
+    out = _lookup(title, year)
+    metrics.cache("tmdb", out is not MISSING)
+    return out
+
+
+def _lookup(title: str, year: Optional[int]):
+    try:
+        row = _conn().execute(
+            "SELECT found, poster, runtime, fetched_at FROM tmdb_info WHERE key = ?",
+            (make_key(title, year),),
+        ).fetchone()
+    except (sqlite3.Error, OSError):
+        return MISSING
+    if row is None:
+        return MISSING
+    found, poster, runtime, fetched_at = row
+    ttl = POSITIVE_TTL if found else NEGATIVE_TTL
+    if time.time() - fetched_at > ttl:
+        return MISSING
+    return (poster, runtime) if found else None
+
+
+def put(title: str, year: Optional[int], info: Optional[Tuple[Optional[str], Optional[int]]]) -> None:
+    """Store ``(poster_path, runtime)``, or ``None`` to record a miss."""
+    poster, runtime = info if info is not None else (None, None)
+    try:
+        _conn().execute(
+            "INSERT OR REPLACE INTO tmdb_info (key, found, poster, runtime, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (make_key(title, year), int(info is not None), poster, runtime, time.time()),
+        )
+    except (sqlite3.Error, OSError):
+        pass
+
@@ -0,0 +1,212 @@
+############################
+# Tracing                  #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Spans légers pour le chemin de recherche :
+#     with tracing.span("run_search", root=True, query=q) as root: ...
+#     print(tracing.waterfall(root))   /   tracing.to_json(root)
+# Hors d'une trace (pas de span racine), ``span`` ne coûte presque rien.
+# Les pools de threads doivent soumettre via ``tracing.submit`` pour que les
+# spans des workers se rattachent à leur parent.
+#
+# Profilage : MOVIEFINDER_PROFILE=<dossier> enveloppe chaque recherche dans
+# cProfile (thread appelant + workers) et enregistre un fichier .prof.
+
+import contextvars
+import cProfile
+import json
+import os
+import pstats
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Optional
+
+# Finished root spans kept for inspection (``recent()``).
+KEEP_TRACES = 20
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("moviefinder_span", default=None)
+_profiles: contextvars.ContextVar[Optional[List[cProfile.Profile]]] = contextvars.ContextVar(
+    "moviefinder_profiles", default=None
+)
+_recent: Deque["Span"] = deque(maxlen=KEEP_TRACES)
+
+
+class Span:
+    __slots__ = ("name", "attrs", "start", "end", "thread", "error", "children", "_lock")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.thread = threading.current_thread().name
+        self.error: Optional[str] = None
+        self.children: List["Span"] = []
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def _add(self, child: "Span") -> None:
+        with self._lock:
+            self.children.append(child)
+
+    def to_dict(self, origin: Optional[float] = None) -> Dict[str, Any]:
+        origin = self.start if origin is None else origin
+        with self._lock:
+            children = list(self.children)
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 2),
+            "duration_ms": round(self.duration * 1000, 2),
+            "thread": self.thread,
+            "attrs": {k: v if isinstance(v, (int, float, bool, type(None))) else str(v) for k, v in self.attrs.items()},
+            "error": self.error,
+            "unfinished": self.end is None,
+            "children": [c.to_dict(origin) for c in sorted(children, key=lambda c: c.start)],
+        }
+
+
+class _NoSpan:
+    """Stand-in yielded outside a trace."""
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def current() -> Optional[Span]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, root: bool = False, **attrs):
+    """Time the block as a child of the current span.
+
+    Without a current span nothing is recorded, unless ``root`` is true: the
+    block then starts a new trace, kept in ``recent()`` once finished.
+    """
+    parent = _current.get()
+    if parent is None and not root:
+        yield _NO_SPAN
+        return
+    s = Span(name, attrs)
+    if parent is not None:
+        parent._add(s)
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as err:
+        s.error = repr(err)
+        raise
+    finally:
+        s.end = time.perf_counter()
+        _current.reset(token)
+        if parent is None:
+            _recent.append(s)
+
+
+def recent() -> List[Span]:
+    """Last finished traces, most recent first."""
+    return list(reversed(_recent))
+
+
+def submit(executor, fn, *args, **kwargs):
+    """``executor.submit`` that carries the current span (and profiler) to the worker."""
+    ctx = contextvars.copy_context()
+    if ctx.get(_profiles) is not None:
+        return executor.submit(ctx.run, _profiled_call, fn, *args, **kwargs)
+    return executor.submit(ctx.run, fn, *args, **kwargs)
+
+
+# ── Output ─────────────────────────────────────────────────────────────────
+def to_json(root: Span, indent: Optional[int] = 2) -> str:
+    return json.dumps(root.to_dict(), ensure_ascii=False, indent=indent)
+
+
+def waterfall(root: Span, width: int = 40) -> str:
+    """Text waterfall: one line per span with its offset, duration and a bar."""
+    d = root.to_dict()
+    total = max(d["duration_ms"], 0.001)
+    lines: List[str] = []
+
+    def walk(node: Dict[str, Any], depth: int) -> None:
+        a = int(node["start_ms"] / total * width)
+        b = max(a + 1, int((node["start_ms"] + node["duration_ms"]) / total * width))
+        bar = " " * a + "█" * min(b - a, width - a)
+        label = node["name"]
+        info = " ".join(f"{k}={v}" for k, v in node["attrs"].items())
+        flags = (" !" + node["error"]) if node["error"] else (" …" if node["unfinished"] else "")
+        lines.append(
+            f"{node['start_ms']:8.1f} {node['duration_ms']:8.1f} ms |{bar:<{width}}| "
+            f"{'  ' * depth}{label}{(' ' + info) if info else ''}{flags}"
+        )
+        for c in node["children"]:
+            walk(c, depth + 1)
+
+    walk(d, 0)
+    return "\n".join(lines)
+
+
+# ── Profiling ──────────────────────────────────────────────────────────────
+def _profiled_call(fn, *args, **kwargs):
+    profiles = _profiles.get()
+    prof = cProfile.Profile()
+    try:
+        prof.enable()
+    except ValueError:
+        return fn(*args, **kwargs)   # another profiler owns this interpreter
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        prof.disable()
+        profiles.append(prof)
+
+
+def profile_dir() -> Optional[str]:
+    return os.environ.get("MOVIEFINDER_PROFILE") or None
+
+
+@contextmanager
+def profiled(label: str):
+    """Profile the block when MOVIEFINDER_PROFILE is set and save the stats
+    (calling thread and ``submit``-ted workers merged) to that directory."""
+    directory = profile_dir()
+    if not directory or _profiles.get() is not None:
+        yield None
+        return
+    profiles: List[cProfile.Profile] = []
+    token = _profiles.set(profiles)
+    prof = cProfile.Profile()
+    try:
+        prof.enable()
+    except ValueError:
+        _profiles.reset(token)
+        yield None
+        return
+    slug = re.sub(r"[^\w-]+", "_", label)[:40]
+    path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}.prof")
+    try:
+        yield path
+    finally:
+        prof.disable()
+        _profiles.reset(token)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            stats = pstats.Stats(prof)
+            for p in profiles:
+                stats.add(p)
+            stats.dump_stats(path)
+        except (OSError, TypeError):
+            pass
@@ -0,0 +1,62 @@
+############################
+# Translation memory       #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import hashlib
+import re
+import sqlite3
+import time
+import unicodedata
+from typing import Optional
+from . import metrics, storage
+
+DB_FILE = "translations.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key        TEXT PRIMARY KEY,
+    target     TEXT NOT NULL,
+    engine     TEXT NOT NULL,
+    translated TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+def _conn() -> sqlite3.Connection:
+    return storage.connect(DB_FILE, _SCHEMA)
+
+
+def make_key(text: str, target: str) -> str:
+    t = unicodedata.normalize("NFC", text or "")
+    t = re.sub(r"\s+", " ", t).strip()
+    return hashlib.sha256(f"{target.lower()}\0{t}".encode("utf-8")).hexdigest()
+
+
+def get(text: str, target: str = "fr") -> Optional[str]:
+    try:
+        row = _conn().execute(
+            "SELECT translated FROM translations WHERE key = ?",
+            (make_key(text, target),),
+        ).fetchone()
+    except (sqlite3.Error, OSError):
+        row = None
+    metrics.cache("translation", row is not None)
+    return row[0] if row else None
+
+
+def put(text: str, translated: str, engine: str, target: str = "fr") -> None:
+    """Remember ``translated`` as the ``target`` translation of ``text``,
+    tagged with the ``engine`` that produced it."""
+    if not translated:
+        return
+    try:
+        _conn().execute(
+            "INSERT OR REPLACE INTO translations (key, target, engine, translated, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (make_key(text, target), target.lower(), engine, translated, time.time()),
+        )
+    except (sqlite3.Error, OSError):
+        pass
@@ -0,0 +1,89 @@
+############################
+# Warm-up                  #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+# Préchargement en arrière-plan (profils langdetect, imports lourds, pools HTTP)
+# et rapport du coût d'import de chaque module :
+#     python -m services.warmup --report
+
+import re
+import subprocess
+import sys
+import threading
+from typing import List, Tuple
+
+from . import http_client, i18n, langid, paid_dynamic
+
+# Modules mesurés par le rapport (chacun dans un interpréteur neuf).
+REPORT_MODULES = [
+    "requests",
+    "streamlit",
+    "langdetect",
+    "deep_translator",
+    "justwatch",
+    "services.http_client",
+    "services.langid",
+    "services.i18n",
+    "services.tmdb",
+    "services.paid_dynamic",
+    "services.search",
+    "i18n",
+]
+
+_started = False
+_lock = threading.Lock()
+
+
+def warm_up() -> None:
+    # les chargeurs des modules eux-mêmes : l'import fait ici leur profite directement
+    langid.warm_up()
+    i18n._google_translator()
+    paid_dynamic._justwatch_cls()
+    http_client.warm_up()
+
+
+def start() -> bool:
+    """Start the warm-up thread once per process; return False if already started."""
+    global _started
+    with _lock:
+        if _started:
+            return False
+        _started = True
+    threading.Thread(target=warm_up, name="moviefinder-warmup", daemon=True).start()
+    return True
+
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+def import_cost(module: str) -> Tuple[float, float]:
+    """Return (self_ms, cumulative_ms) to import ``module`` in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m and m.group(3) == module:
+            return int(m.group(1)) / 1000, int(m.group(2)) / 1000
+    return float("nan"), float("nan")
+
+
+def report(modules: List[str] = REPORT_MODULES) -> str:
+    rows = [(mod, *import_cost(mod)) for mod in modules]
+    rows.sort(key=lambda r: -(r[2] if r[2] == r[2] else -1))
+    width = max(len(r[0]) for r in rows)
+    lines = [f"{'module'.ljust(width)}  {'self ms':>9}  {'cumul ms':>9}"]
+    for mod, self_ms, cum_ms in rows:
+        lines.append(f"{mod.ljust(width)}  {self_ms:9.1f}  {cum_ms:9.1f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if "--report" in sys.argv[1:]:
+        print(report())
+    else:
+        warm_up()
@@ -1,31 +1,44 @@
 ############################
 # Searching youtube movies #
 #                          #
-# Last update : 2025/08/24 #
+# Last update : 2026/10/18 #
 ############################
 
 
-import streamlit as st
-import requests
-from typing import List
+from typing import List, Optional, Tuple
 from .models import Movie
+from . import config, http_client
 
 API_URL = "https://www.googleapis.com/youtube/v3/search"
 
 def search(query: str, max_results: int = 20) -> List[Movie]:
-    api_key = st.secrets.get("YOUTUBE_API_KEY")
+    movies, _ = search_page(query, max_results)
+    return movies
+
+def search_page(
+    query: str,
+    page_size: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Movie], Optional[str]]:
+    """One page of results; ``cursor`` is YouTube's ``pageToken`` (None = first).
+
+    Returns the movies and the next page token, or None when exhausted.
+    """
+    api_key = config.secret("YOUTUBE_API_KEY")
     if not api_key:
-        return []
+        return [], None
     params = {
         "part": "snippet",
         "q": query + " full movie",
         "type": "video",
-        "maxResults": min(max_results, 50),
+        "maxResults": min(page_size, 50),
         "videoDuration": "long",
         "safeSearch": "moderate",
         "key": api_key,
     }
-    data = requests.get(API_URL, params=params, timeout=20).json()
+    if cursor:
+        params["pageToken"] = cursor
+    data = http_client.get(API_URL, provider="youtube", params=params).json()
     out: List[Movie] = []
     for item in data.get("items", []):
         sn = item.get("snippet", {})
@@ -40,4 +53,4 @@ def search(query: str, max_results: int = 20) -> List[Movie]:
             source="YouTube (gratuit)",
             extra={"channel": sn.get("channelTitle")},
         ))
-    return out
+    return out, data.get("nextPageToken")
@@ -0,0 +1,38 @@
+############################
+# Tests : fixtures         #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import io
+
+import pytest
+import requests
+
+from services import breaker, latency, metrics, ratelimit
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Each test gets an empty cache directory, fresh per-host state and metrics."""
+    monkeypatch.setenv("MOVIEFINDER_CACHE_DIR", str(tmp_path / "cache"))
+    for var in ("MOVIEFINDER_BASE_URLS", "MOVIEFINDER_BREAKER", "MOVIEFINDER_RATE_LIMITS", "MOVIEFINDER_HEDGE"):
+        monkeypatch.delenv(var, raising=False)
+    breaker.reset()
+    latency.reset()
+    metrics.reset()
+    ratelimit._buckets.clear()
+    yield
+    breaker.reset()
+    latency.reset()
+    metrics.reset()
+    ratelimit._buckets.clear()
+
+
+def make_response(status: int = 200, body: bytes = b"{}", headers=None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp.raw = io.BytesIO(body)   # read on first access, streamed or not
+    resp.headers.update(headers or {})
+    resp.url = "https://example.test/"
+    return resp
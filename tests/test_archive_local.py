@@ -0,0 +1,123 @@
+############################
+# Tests : local archive    #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import time
+
+import pytest
+
+from services import archive_local, archive_org
+
+
+def _ids(movies):
+    return [m.extra["identifier"] for m in movies]
+
+
+@pytest.fixture
+def index(monkeypatch):
+    """Local index with three "nosferatu" films; the live API returns them
+    first, then films outside the mirrored collection (two pages)."""
+    conn = archive_local._conn()
+    for i in range(3):
+        conn.execute(
+            "INSERT INTO items (identifier, title, year, description, downloads, mediatype, ingested_at) "
+            "VALUES (?, ?, 1922, 'vampire', ?, 'movies', ?)",
+            (f"local{i}", f"Nosferatu {i}", 100 - i, time.time()),
+        )
+    conn.execute("INSERT INTO meta (key, value) VALUES ('ingested_at', ?)", (str(time.time()),))
+    live_calls = []
+
+    def live(query, size, cursor=None, mode="films"):
+        page = cursor or 1
+        live_calls.append(page)
+        ids = [f"local{i}" for i in range(3)] + [f"live{i}" for i in range(3)]
+        docs = [{"identifier": x, "title": x} for x in ids[(page - 1) * size:page * size]]
+        return [archive_org.to_movie(d) for d in docs], (page + 1 if page * size < len(ids) else None)
+
+    monkeypatch.setattr(archive_org, "search_page", live)
+    return live_calls
+
+
+def test_local_results_continue_online_without_duplicates(index):
+    movies, cursor = archive_local.search_page("nosferatu", 2)
+    assert _ids(movies) == ["local0", "local1"] and cursor == ("local", 2)
+    assert index == []
+    seen = list(movies)
+    while cursor is not None:
+        movies, cursor = archive_local.search_page("nosferatu", 2, cursor)
+        seen += movies
+    assert _ids(seen) == ["local0", "local1", "local2", "live0", "live1", "live2"]
+
+
+def test_short_local_page_is_completed_online(index):
+    movies, cursor = archive_local.search_page("nosferatu", 4)
+    assert _ids(movies) == ["local0", "local1", "local2", "live0"]
+    assert cursor == ("live", 2)
+
+
+def test_no_local_match_goes_online(index):
+    movies, cursor = archive_local.search_page("metropolis", 2)
+    assert _ids(movies) == ["local0", "local1"]     # the live API's answer, unfiltered
+    assert cursor == 2 and index == [1]
+
+
+def test_other_modes_skip_the_index(index):
+    archive_local.search_page("nosferatu", 2, None, "tout")
+    assert index == [1]
+
+
+def test_fts_query_syntax():
+    assert archive_local._match_expr("buster  keat") == '"buster" "keat"*'
+    assert archive_local._match_expr("  ") == ""
+
+
+def test_pages_never_exceed_page_size(index, monkeypatch):
+    ids = [f"live{i}" for i in range(6)]
+
+    def live(query, size, cursor=None, mode="films"):
+        page = cursor or 1
+        docs = [{"identifier": x, "title": x} for x in ids[(page - 1) * size:page * size]]
+        return [archive_org.to_movie(d) for d in docs], (page + 1 if page * size < len(ids) else None)
+
+    monkeypatch.setattr(archive_org, "search_page", live)
+    pages, cursors, cursor = [], [], None
+    while True:
+        movies, cursor = archive_local.search_page("nosferatu", 4, cursor)
+        pages.append(_ids(movies))
+        cursors.append(cursor)
+        if cursor is None:
+            break
+    assert pages == [
+        ["local0", "local1", "local2", "live0"],
+        ["live1", "live2", "live3"],
+        ["live4", "live5"],
+    ]
+    assert cursors == [("live", 1, 1), ("live", 2), None]
+
+
+def test_full_last_local_page_does_not_call_the_api(index):
+    movies, cursor = archive_local.search_page("nosferatu", 3)
+    assert len(movies) == 3 and cursor == ("live", 1)
+    assert index == []
+
+
+def _scraped(monkeypatch, n):
+    docs = [{"identifier": f"film{i}", "title": f"Film {i}", "downloads": i} for i in range(n)]
+    monkeypatch.setattr(archive_local, "_scrape", lambda query, batch: iter(docs))
+
+
+def test_limited_ingestion_does_not_enable_the_index(monkeypatch):
+    _scraped(monkeypatch, 10)
+    assert archive_local.ingest(batch=4, limit=5) == 5
+    assert archive_local.ingested_at() is None
+    assert archive_local._conn().execute("SELECT COUNT(*) FROM items").fetchone()[0] == 5
+
+
+def test_complete_ingestion_enables_the_index(monkeypatch):
+    _scraped(monkeypatch, 10)
+    assert archive_local.ingest(batch=4) == 10
+    assert archive_local.ingested_at() is not None
+    movies, _ = archive_local.search_page("film", 3)
+    assert _ids(movies) == ["film9", "film8", "film7"]
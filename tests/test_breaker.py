@@ -0,0 +1,99 @@
+############################
+# Tests : circuit breakers #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import pytest
+
+from services import breaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(breaker.time, "monotonic", c)
+    return c
+
+
+def _trip(b: breaker.Breaker) -> None:
+    for _ in range(b.failures):
+        assert b.allow()
+        b.failure()
+
+
+def test_opens_after_consecutive_failures(clock):
+    b = breaker.Breaker("h", failures=3, open_seconds=10)
+    b.failure()
+    b.failure()
+    b.success()            # the count is of consecutive failures
+    b.failure()
+    b.failure()
+    assert b.state == breaker.CLOSED
+    b.failure()
+    assert b.state == breaker.OPEN and b.is_open()
+    assert not b.allow()
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    b = breaker.Breaker("h", failures=2, open_seconds=10)
+    _trip(b)
+    clock.now += 10
+    assert b.allow()
+    assert b.state == breaker.HALF_OPEN
+    assert not b.allow()   # probe already in flight
+    b.success()
+    assert b.state == breaker.CLOSED and b.allow()
+
+
+def test_failed_probe_doubles_the_cool_down(clock):
+    b = breaker.Breaker("h", failures=2, open_seconds=10, max_open_seconds=25)
+    _trip(b)
+    clock.now += 10
+    assert b.allow()
+    b.failure()
+    assert b.state == breaker.OPEN and b.retry_in() == pytest.approx(20)
+    clock.now += 20
+    assert b.allow()
+    b.failure()
+    assert b.retry_in() == pytest.approx(25)   # capped
+    clock.now += 25
+    assert b.allow()
+    b.success()
+    _trip(b)
+    assert b.retry_in() == pytest.approx(10)   # reset after recovery
+
+
+def test_released_probe_can_be_retried(clock):
+    b = breaker.Breaker("h", failures=1, open_seconds=5)
+    _trip(b)
+    clock.now += 5
+    assert b.allow()
+    b.release()
+    assert b.allow()
+
+
+def test_check_raises_while_open(clock):
+    b = breaker.breaker_for("https://api.example.test/path")
+    assert b.host == "api.example.test"
+    for _ in range(breaker.FAILURE_THRESHOLD):
+        breaker.check("api.example.test").failure()
+    with pytest.raises(breaker.CircuitOpen):
+        breaker.check("https://api.example.test/other")
+    assert breaker.open_hosts() == ["api.example.test"]
+    assert breaker.is_open("api.example.test")
+    assert not breaker.is_open("other.example.test")
+
+
+def test_overrides_from_environment(monkeypatch):
+    monkeypatch.setenv("MOVIEFINDER_BREAKER", "failures=2,open=7,max_open=9")
+    b = breaker.breaker_for("env.example.test")
+    assert (b.failures, b.open_seconds, b.max_open_seconds) == (2, 7.0, 9.0)
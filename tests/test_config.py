@@ -0,0 +1,62 @@
+############################
+# Tests : configuration    #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import pytest
+
+from services import config
+
+
+@pytest.fixture
+def secrets_files(tmp_path, monkeypatch):
+    project = tmp_path / "project.toml"
+    home = tmp_path / "home.toml"
+    monkeypatch.setattr(config, "_secrets_files", lambda: [str(project), str(home)])
+    for name in ("TMDB_API_KEY", "YOUTUBE_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    config.reload()
+    yield project, home
+    config.reload()
+
+
+def test_first_file_wins_for_root_keys(secrets_files):
+    project, home = secrets_files
+    project.write_text('TMDB_API_KEY = "project"\n')
+    home.write_text('TMDB_API_KEY = "home"\nYOUTUBE_API_KEY = "home"\n')
+    assert config.secret("TMDB_API_KEY") == "project"
+    assert config.secret("YOUTUBE_API_KEY") == "home"
+
+
+def test_first_file_wins_for_section_keys(secrets_files):
+    project, home = secrets_files
+    project.write_text('[api]\nTMDB_API_KEY = "project"\n')
+    home.write_text('[api]\nTMDB_API_KEY = "home"\n')
+    assert config.secret("TMDB_API_KEY") == "project"
+
+
+def test_first_file_wins_across_root_and_section(secrets_files):
+    project, home = secrets_files
+    project.write_text('[api]\nTMDB_API_KEY = "project"\n')
+    home.write_text('TMDB_API_KEY = "home"\n')
+    assert config.secret("TMDB_API_KEY") == "project"
+
+
+def test_root_key_beats_section_in_the_same_file(secrets_files):
+    project, _ = secrets_files
+    project.write_text('TMDB_API_KEY = "root"\n\n[api]\nTMDB_API_KEY = "section"\n')
+    assert config.secret("TMDB_API_KEY") == "root"
+
+
+def test_environment_beats_files(secrets_files, monkeypatch):
+    project, _ = secrets_files
+    project.write_text('TMDB_API_KEY = "project"\n')
+    monkeypatch.setenv("TMDB_API_KEY", "env")
+    assert config.secret("TMDB_API_KEY") == "env"
+
+
+def test_missing_and_invalid_files_are_ignored(secrets_files):
+    project, _ = secrets_files
+    project.write_text("not = [valid toml\n")
+    assert config.secret("TMDB_API_KEY", "default") == "default"
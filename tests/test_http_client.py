@@ -0,0 +1,129 @@
+############################
+# Tests : HTTP client      #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import time
+
+import pytest
+import requests
+
+from services import breaker, http_client, ratelimit
+
+from .conftest import make_response
+
+HOST = "itunes.apple.com"
+URL = f"https://{HOST}/search"
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Session answering from ``upstream.answers`` in order (a response, or an exception)."""
+    class Upstream:
+        answers = []
+        sent = []
+
+        def request(self, method, url, **kwargs):
+            self.sent.append((method, url))
+            answer = self.answers.pop(0)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+    session = Upstream()
+    monkeypatch.setattr(http_client, "session_for", lambda url: session)
+    ratelimit.configure(HOST, 100, 100)
+    return session
+
+
+# ── 429 / Retry-After ──────────────────────────────────────────────────────
+def test_429_is_retried_after_a_short_retry_after(upstream):
+    upstream.answers = [make_response(429, headers={"Retry-After": "0.2"}), make_response(200)]
+    start = time.monotonic()
+    assert http_client.get(URL, provider="itunes").status_code == 200
+    assert time.monotonic() - start >= 0.2
+    assert len(upstream.sent) == 2
+
+
+def test_long_retry_after_is_not_waited_for(upstream):
+    upstream.answers = [make_response(429, headers={"Retry-After": "120"})]
+    start = time.monotonic()
+    assert http_client.get(URL, provider="itunes").status_code == 429
+    assert time.monotonic() - start < 1
+    with pytest.raises(ratelimit.RateLimitExceeded):
+        http_client.get(URL, provider="itunes", timeout=1)   # the host is paused
+    assert len(upstream.sent) == 1
+
+
+def test_non_idempotent_requests_are_not_retried(upstream):
+    upstream.answers = [make_response(429, headers={"Retry-After": "0"})]
+    assert http_client.post(URL, provider="itunes").status_code == 429
+    assert len(upstream.sent) == 1
+
+
+def test_second_429_pauses_the_host_again(upstream):
+    upstream.answers = [make_response(429, headers={"Retry-After": "0"}),
+                        make_response(429, headers={"Retry-After": "120"})]
+    assert http_client.get(URL, provider="itunes").status_code == 429
+    assert len(upstream.sent) == 2
+    assert not ratelimit.bucket_for(HOST).acquire(timeout=1)
+
+
+def test_wait_for_a_token_counts_against_the_timeout(upstream):
+    ratelimit.configure(HOST, 0.1, 1)
+    upstream.answers = [make_response(200)]
+    http_client.get(URL, provider="itunes")
+    with pytest.raises(ratelimit.RateLimitExceeded):
+        http_client.get(URL, provider="itunes", timeout=2)
+    assert len(upstream.sent) == 1
+
+
+# ── Circuit breaker accounting ─────────────────────────────────────────────
+def _failures():
+    return breaker.breaker_for(HOST).failures
+
+
+def test_5xx_and_network_errors_open_the_circuit(upstream):
+    n = _failures()
+    upstream.answers = [make_response(503)] * (n - 1) + [requests.ConnectionError("reset")]
+    for _ in range(n - 1):
+        assert http_client.get(URL, provider="itunes").status_code == 503
+    with pytest.raises(requests.ConnectionError):
+        http_client.get(URL, provider="itunes")
+    assert breaker.is_open(HOST)
+    with pytest.raises(breaker.CircuitOpen):
+        http_client.get(URL, provider="itunes")
+    assert len(upstream.sent) == n
+
+
+def test_client_errors_count_as_answers(upstream):
+    n = _failures()
+    upstream.answers = ([make_response(500)] * (n - 1) + [make_response(404)]
+                        + [make_response(500)] * (n - 1))
+    for _ in range(2 * n - 1):
+        http_client.get(URL, provider="itunes")
+    assert not breaker.is_open(HOST)
+
+
+def test_requests_refused_by_the_rate_limit_leave_the_probe(upstream, monkeypatch):
+    b = breaker.breaker_for(HOST)
+    for _ in range(b.failures):
+        b.failure()
+    now = time.monotonic()
+    monkeypatch.setattr(breaker.time, "monotonic", lambda: now + b.max_open_seconds + 1)
+    ratelimit.configure(HOST, 0.001, 1)
+    ratelimit.acquire(HOST, timeout=0)
+    with pytest.raises(ratelimit.RateLimitExceeded):
+        http_client.get(URL, provider="itunes", timeout=0.1)
+    assert b.state == breaker.HALF_OPEN
+    assert b.allow()                             # the probe was given back
+    assert upstream.sent == []
+
+
+def test_poster_failures_do_not_open_the_api_circuit(upstream):
+    upstream.answers = [make_response(503)] * _failures()
+    for _ in range(_failures()):
+        http_client.get(URL, provider="posters")
+    assert breaker.is_open(f"posters@{HOST}")
+    assert not breaker.is_open(HOST)
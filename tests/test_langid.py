@@ -0,0 +1,65 @@
+############################
+# Tests : language id      #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import pytest
+
+from services import http_client, langid
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    def no_network(*args, **kwargs):
+        raise AssertionError("language detection must stay offline")
+
+    monkeypatch.setattr(http_client, "request", no_network)
+    langid.reset()
+    yield
+    langid.reset()
+
+
+@pytest.mark.parametrize("text, code", [
+    ("Nosferatu\nLe comte Orlok quitte son château pour une ville de la Baltique avec ses cercueils.", "fr"),
+    ("Nosferatu\nCount Orlok leaves his castle for a town on the Baltic, and the plague follows him.", "en"),
+    ("Nosferatu\nEl conde Orlok deja su castillo y llega a la ciudad con una plaga que se extiende.", "es"),
+    ("Nosferatu\nGraf Orlok verlässt sein Schloss und die Pest kommt mit ihm in die Stadt an der Ostsee.", "de"),
+    ("Nosferatu\nIl conte Orlok lascia il suo castello e la peste arriva con lui nella città.", "it"),
+    ("Nosferatu\nO conde Orlok deixa o seu castelo e a peste chega com ele à cidade do Báltico.", "pt"),
+])
+def test_common_languages(text, code):
+    assert langid.detect(text) == code
+
+
+def test_empty_text():
+    assert langid.detect(None) is None
+    assert langid.detect("  \n ") is None
+
+
+def test_ambiguous_samples_go_to_the_fallback(monkeypatch):
+    calls = []
+    monkeypatch.setattr(langid, "_langdetect", lambda: (lambda text: calls.append(text) or "NL"))
+    assert langid.detect("Nosferatu") == "nl"
+    assert calls == ["Nosferatu"]
+
+
+def test_ambiguous_samples_without_fallback(monkeypatch):
+    monkeypatch.setattr(langid, "_langdetect", lambda: None)
+    assert langid.detect("Nosferatu") is None
+
+
+def test_fallback_errors_give_none(monkeypatch):
+    def broken(text):
+        raise ValueError("No features in text")
+
+    monkeypatch.setattr(langid, "_langdetect", lambda: broken)
+    assert langid.detect("1922") is None
+
+
+def test_results_are_memoized_on_normalized_text(monkeypatch):
+    calls = []
+    monkeypatch.setattr(langid, "score", lambda text: calls.append(text) or "en")
+    langid.detect("The  kid ")
+    langid.detect("The kid")
+    assert calls == ["The kid"]
@@ -0,0 +1,130 @@
+############################
+# Tests : timeouts         #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import threading
+import time
+
+import pytest
+
+from services import http_client, latency, metrics, ratelimit
+
+from .conftest import make_response
+
+HOST = "archive.org"
+
+
+def _observe(seconds, n=latency.MIN_SAMPLES):
+    for _ in range(n):
+        latency.record(HOST, seconds)
+
+
+def test_configured_timeout_until_enough_samples():
+    _observe(0.1, latency.MIN_SAMPLES - 1)
+    assert latency.timeout_for(HOST, 20) == 20
+    assert latency.hedge_after(HOST) is None
+    latency.record(HOST, 0.1)
+    assert latency.timeout_for(HOST, 20) == latency.MIN_TIMEOUT
+    assert latency.hedge_after(HOST) == pytest.approx(0.1)
+
+
+def test_timeout_follows_the_p99_within_bounds():
+    _observe(1.0, 99)
+    latency.record(HOST, 4.0)
+    assert latency.timeout_for(HOST, 20) == pytest.approx(4.0 * latency.TIMEOUT_FACTOR)
+    assert latency.timeout_for(HOST, 5) == 5
+    assert latency.hedge_after(HOST) == pytest.approx(1.0)
+
+
+def test_window_keeps_the_latest_requests():
+    _observe(5.0, latency.WINDOW)
+    _observe(0.5, latency.WINDOW)
+    assert latency.timeout_for(HOST, 20) == latency.MIN_TIMEOUT
+
+
+def test_requests_get_the_adaptive_timeout(monkeypatch):
+    seen = []
+
+    class Session:
+        def request(self, method, url, **kwargs):
+            seen.append(kwargs["timeout"])
+            return make_response(200)
+
+    monkeypatch.setattr(http_client, "session_for", lambda url: Session())
+    http_client.get(f"https://{HOST}/advancedsearch.php", provider="archive")
+    _observe(1.0)
+    http_client.get(f"https://{HOST}/advancedsearch.php", provider="archive")
+    http_client.get(f"https://{HOST}/advancedsearch.php", provider="archive", timeout=1)
+    assert seen == [http_client.TIMEOUTS["archive"], 3.0, 1]
+
+
+# ── Hedging ────────────────────────────────────────────────────────────────
+class SlowSession:
+    """Answers the n-th request after ``delays[n]`` seconds."""
+
+    def __init__(self, *delays):
+        self.delays = list(delays)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            n = self.calls
+            self.calls += 1
+        time.sleep(self.delays[n])
+        return make_response(200, str(n).encode())
+
+
+@pytest.fixture
+def hedging(monkeypatch):
+    monkeypatch.setattr(http_client, "HEDGE", True)
+    _observe(0.05)
+    metrics.reset()
+
+
+def _hedged(session, method="GET", **kwargs):
+    return http_client._send_hedged(session, method, f"https://{HOST}/x", HOST, kwargs)
+
+
+def _counter(name):
+    return sum(r["value"] for r in metrics.snapshot()["counters"] if r["metric"] == name)
+
+
+def test_slow_request_is_duplicated_and_the_first_answer_wins(hedging):
+    session = SlowSession(0.5, 0.0)
+    start = time.monotonic()
+    assert _hedged(session).content == b"1"
+    assert time.monotonic() - start < 0.3
+    assert session.calls == 2
+    assert _counter("hedged_requests_total") == 1 and _counter("hedge_wins_total") == 1
+
+
+def test_fast_request_is_not_duplicated(hedging):
+    session = SlowSession(0.0, 0.0)
+    assert _hedged(session).content == b"0"
+    assert session.calls == 1 and _counter("hedged_requests_total") == 0
+
+
+@pytest.mark.parametrize("method, kwargs", [("POST", {}), ("GET", {"stream": True})])
+def test_only_plain_idempotent_requests_are_hedged(hedging, method, kwargs):
+    session = SlowSession(0.2, 0.0)
+    assert _hedged(session, method, **kwargs).content == b"0"
+    assert session.calls == 1
+
+
+def test_no_hedge_without_a_rate_limit_token(hedging):
+    ratelimit.configure(HOST, 0.001, 1)
+    ratelimit.acquire(HOST, timeout=0)            # bucket now empty
+    session = SlowSession(0.2, 0.0)
+    assert _hedged(session).content == b"0"
+    assert session.calls == 1
+
+
+def test_hedging_is_opt_in(monkeypatch):
+    monkeypatch.setattr(http_client, "HEDGE", False)
+    _observe(0.05)
+    session = SlowSession(0.2, 0.0)
+    assert _hedged(session).content == b"0"
+    assert session.calls == 1
@@ -0,0 +1,77 @@
+############################
+# Tests : metrics          #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import urllib.request
+
+import pytest
+
+from services import metrics, search
+
+
+def test_histogram_quantiles_are_bucket_bounds():
+    h = metrics.Histogram((0.1, 0.5, 1.0))
+    assert h.quantile(0.5) is None
+    for v in (0.05, 0.05, 0.3, 0.7, 3.0):
+        h.observe(v)
+    assert h.counts == [2, 1, 1, 1]
+    assert h.quantile(0.5) == 0.5
+    assert h.quantile(0.95) == float("inf")
+    assert h.count == 5 and h.sum == pytest.approx(4.1)
+
+
+def test_snapshot_rows():
+    metrics.observe("provider_seconds", 0.04, provider="archive")
+    metrics.observe("provider_seconds", 0.2, provider="archive")
+    metrics.inc("provider_errors_total", provider="youtube")
+    metrics.cache("tmdb", True)
+    metrics.cache("tmdb", True)
+    metrics.cache("tmdb", False)
+    snap = metrics.snapshot()
+    assert snap["latencies"] == [{
+        "metric": "provider_seconds", "provider": "archive", "count": 2,
+        "mean_ms": 120.0, "p50_ms": 50.0, "p95_ms": 250.0,
+    }]
+    assert snap["counters"] == [{"metric": "provider_errors_total", "provider": "youtube", "value": 1}]
+    assert snap["caches"] == [{"cache": "tmdb", "hits": 2, "misses": 1, "hit_ratio": 0.667}]
+
+
+def test_prometheus_text():
+    metrics.inc("upstream_errors_total", host="archive.org", kind='http_"503"')
+    metrics.observe("upstream_request_seconds", 0.03, host="archive.org")
+    text = metrics.prometheus_text()
+    assert "# TYPE moviefinder_upstream_errors_total counter" in text
+    assert 'moviefinder_upstream_errors_total{host="archive.org",kind="http_\\"503\\""} 1' in text
+    assert "# TYPE moviefinder_upstream_request_seconds histogram" in text
+    assert 'moviefinder_upstream_request_seconds_bucket{host="archive.org",le="0.025"} 0' in text
+    assert 'moviefinder_upstream_request_seconds_bucket{host="archive.org",le="0.05"} 1' in text
+    assert 'moviefinder_upstream_request_seconds_bucket{host="archive.org",le="+Inf"} 1' in text
+    assert 'moviefinder_upstream_request_seconds_count{host="archive.org"} 1' in text
+
+
+def test_textfile_and_http_exporters(tmp_path):
+    metrics.inc("provider_empty_total", provider="paid")
+    path = tmp_path / "moviefinder.prom"
+    metrics.write_textfile(str(path))
+    assert path.read_text() == metrics.prometheus_text()
+    server = metrics.serve(0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as resp:
+            assert resp.read().decode() == metrics.prometheus_text()
+    finally:
+        server.shutdown()
+
+
+def test_provider_calls_are_measured():
+    def broken(*args):
+        raise RuntimeError("down")
+
+    search._measured("archive", lambda *args: ([], None))
+    with pytest.raises(RuntimeError):
+        search._measured("youtube", broken)
+    counters = {(r["metric"], r["provider"]): r["value"] for r in metrics.snapshot()["counters"]}
+    assert counters == {("provider_empty_total", "archive"): 1, ("provider_errors_total", "youtube"): 1}
+    assert {r["provider"] for r in metrics.snapshot()["latencies"]} == {"archive", "youtube"}
@@ -0,0 +1,131 @@
+############################
+# Tests : page preparation #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import pytest
+
+from services import i18n, langid, page_prep, tmdb
+from services.models import Movie
+
+
+@pytest.fixture(autouse=True)
+def fresh_memos(monkeypatch):
+    monkeypatch.setattr(page_prep, "_tmdb_memo", page_prep._Memo(page_prep.MEMO_SIZE))
+    monkeypatch.setattr(page_prep, "_text_memo", page_prep._Memo(page_prep.MEMO_SIZE))
+    monkeypatch.setattr(page_prep.posters, "fetch_many", lambda urls, timeout=None: {})
+
+
+MOVIE = Movie("Nosferatu", year=1922, description="A vampire comes to town.", stream_url="https://archive/nosferatu")
+
+
+@pytest.fixture
+def tmdb_answers(monkeypatch):
+    """``info_for`` pops its answers (a tuple, or an exception to raise) in order."""
+    answers, calls = [], []
+
+    def info_for(title, year=None, strict=False):
+        calls.append(title)
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    monkeypatch.setattr(tmdb, "info_for", info_for)
+    return answers, calls
+
+
+def _render(**kwargs):
+    kwargs.setdefault("auto_translate", False)
+    return page_prep.prepare([MOVIE], **kwargs)[0]
+
+
+def test_tmdb_answers_are_memoized(tmdb_answers):
+    answers, calls = tmdb_answers
+    answers.append(("https://tmdb/p.jpg", 94))
+    for _ in range(3):
+        movie, _ = _render()
+        assert movie.duration_minutes == 94
+    assert len(calls) == 1
+
+
+def test_tmdb_misses_are_memoized(tmdb_answers):
+    answers, calls = tmdb_answers
+    answers.append((None, None))
+    _render()
+    _render()
+    assert len(calls) == 1
+
+
+def test_tmdb_failures_are_retried(tmdb_answers):
+    answers, calls = tmdb_answers
+    answers.extend([tmdb.Unavailable(("https://tmdb/p.jpg", None)), ("https://tmdb/p.jpg", 94)])
+    movie, _ = _render()
+    assert movie.poster_url == "https://tmdb/p.jpg" and movie.duration_minutes is None
+    movie, _ = _render()
+    assert movie.duration_minutes == 94
+    _render()
+    assert len(calls) == 2
+
+
+def test_strict_info_for_raises_on_errors(monkeypatch):
+    monkeypatch.setenv("TMDB_API_KEY", "test")
+
+    def down(*args, **kwargs):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(tmdb.http_client, "get", down)
+    assert tmdb.info_for("Nosferatu") == (None, None)
+    with pytest.raises(tmdb.Unavailable):
+        tmdb.info_for("Nosferatu", strict=True)
+
+
+@pytest.fixture
+def translator(monkeypatch):
+    """Google translator stub; set ``translator.fail`` to make it raise."""
+    class Translator:
+        fail = False
+        calls = 0
+
+        def __init__(self, source, target):
+            pass
+
+        def translate(self, text):
+            Translator.calls += 1
+            if Translator.fail:
+                raise ConnectionError("quota")
+            return "Un vampire arrive en ville."
+
+    monkeypatch.setattr(i18n, "_google_translator", lambda: Translator)
+    return Translator
+
+
+def test_failed_translation_shows_the_original_and_is_retried(translator):
+    translator.fail = True
+    _, text = _render(enrich_tmdb=False, auto_translate=True)
+    assert text.translation == MOVIE.description
+    translator.fail = False
+    _, text = _render(enrich_tmdb=False, auto_translate=True)
+    assert text.translation == "Un vampire arrive en ville."
+    _render(enrich_tmdb=False, auto_translate=True)
+    assert translator.calls == 2
+
+
+def test_strict_translation_raises(translator):
+    translator.fail = True
+    assert i18n.translate_to_fr("A vampire comes to town.") == "A vampire comes to town."
+    with pytest.raises(i18n.TranslationUnavailable):
+        i18n.translate_to_fr("A vampire comes to town.", strict=True)
+
+
+def test_bench_cache_reset_forgets_memoized_results(tmdb_answers, tmp_path):
+    from bench.run import _reset_caches
+
+    answers, calls = tmdb_answers
+    answers.extend([("https://tmdb/p.jpg", 94), ("https://tmdb/p.jpg", 94)])
+    _render()
+    _reset_caches(str(tmp_path / "bench"))
+    assert langid._detect_normalized.cache_info().currsize == 0
+    _render()
+    assert len(calls) == 2
@@ -0,0 +1,123 @@
+############################
+# Tests : paid combo       #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import time
+
+import pytest
+
+from services import paid_combo
+from services.models import Movie
+
+
+def _offers(store, urls):
+    return [Movie(f"{store} {u}", stream_url=f"https://{u}", source=store) for u in urls]
+
+
+@pytest.fixture
+def stores(monkeypatch):
+    """Stores answering from ``answers``; iTunes pages through ``itunes`` by offset."""
+    answers = {"dynamic": [], "google_play": [], "amazon": [], "rakuten": []}
+    itunes = []
+
+    def itunes_page(query, page_size, cursor=None, country="FR"):
+        start = cursor or 0
+        end = start + page_size
+        return itunes[start:end], (end if end < len(itunes) else None)
+
+    monkeypatch.setattr(paid_combo.paid_itunes, "search_page", itunes_page)
+    monkeypatch.setattr(paid_combo, "STORES", [
+        ("dynamic", lambda q, n, c, sub: answers["dynamic"]),
+        ("itunes", lambda q, n, c, sub: paid_combo.paid_itunes.search_page(q, n, None, c)),
+        ("google_play", lambda q, n, c, sub: answers["google_play"]),
+    ])
+    return answers, itunes
+
+
+def test_next_page_skips_duplicates_already_consumed(stores):
+    answers, itunes = stores
+    answers["dynamic"] = _offers("dynamic", ["a", "b"])
+    itunes.extend(_offers("itunes", ["a", "b", "c", "d", "e", "f"]))
+    offers, cursor = paid_combo.search_page("q", 3)
+    assert [m.stream_url for m in offers] == ["https://a", "https://b", "https://c"]
+    assert cursor == 3                          # "d": a and b were merged, c was kept
+    offers, cursor = paid_combo.search_page("q", 3, cursor)
+    assert [m.stream_url for m in offers] == ["https://d", "https://e", "https://f"]
+    assert cursor is None
+
+
+def test_untruncated_first_page_continues_after_the_itunes_page(stores):
+    answers, itunes = stores
+    itunes.extend(_offers("itunes", ["a", "b", "c", "d", "e"]))
+    answers["google_play"] = _offers("google_play", ["a"])
+    offers, cursor = paid_combo.search_page("q", 3)
+    assert [m.stream_url for m in offers] == ["https://a", "https://b", "https://c"]
+    assert cursor == 3
+
+
+def test_itunes_results_cut_by_the_page_size(stores):
+    answers, itunes = stores
+    answers["dynamic"] = _offers("dynamic", ["x", "y"])
+    itunes.extend(_offers("itunes", ["a", "b", "c", "d"]))
+    offers, cursor = paid_combo.search_page("q", 3)
+    assert [m.stream_url for m in offers] == ["https://x", "https://y", "https://a"]
+    assert cursor == 1
+
+
+def test_duplicate_of_a_cut_offer_is_consumed(stores):
+    answers, itunes = stores
+    answers["dynamic"] = _offers("dynamic", ["x", "y", "z", "a"])
+    itunes.extend(_offers("itunes", ["a", "b", "c"]))
+    offers, cursor = paid_combo.search_page("q", 3)
+    assert [m.stream_url for m in offers] == ["https://x", "https://y", "https://z"]
+    assert cursor == 1                          # "a" was merged into JustWatch's offer
+
+
+def _slow(delay, offers):
+    def store(q, n, c, sub):
+        time.sleep(delay)
+        return offers
+    return store
+
+
+@pytest.fixture
+def timed_stores(monkeypatch):
+    monkeypatch.setattr(paid_combo, "STORE_TIMEOUTS", {"dynamic": 0.3})
+    monkeypatch.setattr(paid_combo, "DEFAULT_STORE_TIMEOUT", 0.15)
+
+
+def test_stores_are_queried_concurrently(monkeypatch, timed_stores):
+    monkeypatch.setattr(paid_combo, "STORES", [
+        ("dynamic", _slow(0.1, _offers("dynamic", ["a"]))),
+        ("google_play", _slow(0.1, _offers("google_play", ["b"]))),
+        ("amazon", _slow(0.1, _offers("amazon", ["c"]))),
+    ])
+    start = time.monotonic()
+    offers = paid_combo.search("q")
+    assert time.monotonic() - start < 0.25
+    assert [m.stream_url for m in offers] == ["https://a", "https://b", "https://c"]
+
+
+def test_late_store_contributes_nothing(monkeypatch, timed_stores):
+    monkeypatch.setattr(paid_combo, "STORES", [
+        ("dynamic", _slow(0.2, _offers("dynamic", ["a"]))),        # within its own 0.3 s
+        ("google_play", _slow(1.0, _offers("google_play", ["b"]))),  # past the default 0.15 s
+        ("amazon", _slow(0.0, _offers("amazon", ["c"]))),
+    ])
+    start = time.monotonic()
+    offers = paid_combo.search("q")
+    assert time.monotonic() - start < 0.5
+    assert [m.stream_url for m in offers] == ["https://a", "https://c"]
+
+
+def test_failing_store_contributes_nothing(monkeypatch, timed_stores):
+    def broken(q, n, c, sub):
+        raise RuntimeError("blocked")
+
+    monkeypatch.setattr(paid_combo, "STORES", [
+        ("dynamic", broken),
+        ("amazon", _slow(0.0, _offers("amazon", ["c", "c"]))),
+    ])
+    assert [m.stream_url for m in paid_combo.search("q")] == ["https://c"]
@@ -0,0 +1,77 @@
+############################
+# Tests : JustWatch        #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import json
+
+import pytest
+
+from services import paid_dynamic
+
+from .conftest import make_response
+
+pytest.importorskip("justwatch")
+
+LOCALES = [{"iso_3166_2": "FR", "country": "France", "full_locale": "fr_FR"}]
+
+
+@pytest.fixture
+def justwatch(monkeypatch):
+    """JustWatch API served from memory; records (method, path, json body)."""
+    calls = []
+    state = {"locales": LOCALES}
+
+    def request(method, url, provider=None, **kwargs):
+        path = url.split("/content/", 1)[1]
+        calls.append((method, path, kwargs.get("json")))
+        if path == "locales/state":
+            return make_response(200, json.dumps(state["locales"]).encode())
+        if path.endswith("/popular"):
+            items = [{"id": 1, "title": "Nosferatu", "full_path": "/fr/film/nosferatu"}]
+            return make_response(200, json.dumps({"items": items}).encode())
+        if path.startswith("titles/movie/1/"):
+            offers = [{"provider_id": 3, "monetization_type": "rent", "country": "FR", "retail_price": 2.99,
+                       "currency": "EUR", "urls": {"standard_web": "https://store/nosferatu"}}]
+            return make_response(200, json.dumps({"runtime": 94, "offers": offers}).encode())
+        if path.startswith("providers/locale/"):
+            return make_response(200, json.dumps([{"id": 3, "clear_name": "Store"}]).encode())
+        return make_response(404)
+
+    monkeypatch.setattr(paid_dynamic.http_client, "request", request)
+    monkeypatch.setattr(paid_dynamic, "_pooled", None)
+    monkeypatch.setattr(paid_dynamic, "_clients", {})
+    monkeypatch.setattr(paid_dynamic, "_providers", {})
+    return calls, state
+
+
+def test_title_details_arrive(justwatch):
+    calls, _ = justwatch
+    movies = paid_dynamic.search("nosferatu", country="FR")
+    assert [(m.title, m.duration_minutes, m.price, m.source) for m in movies] == [
+        ("Nosferatu", 94, "2,99 €", "Store"),
+    ]
+    assert ("GET", "titles/movie/1/locale/fr_FR", None) in calls
+
+
+def test_search_does_not_touch_the_shared_client(justwatch):
+    calls, _ = justwatch
+    paid_dynamic.search("nosferatu", country="FR")
+    jw = paid_dynamic._clients["FR"]
+    kwargs_before = dict(jw.kwargs)
+    paid_dynamic.search("metropolis", country="FR")
+    assert jw.kwargs == kwargs_before
+    bodies = [body for method, path, body in calls if path.endswith("/popular")]
+    assert [b["query"] for b in bodies] == ["nosferatu", "metropolis"]
+    assert all(b["content_types"] == ["movie"] for b in bodies)
+
+
+def test_fallback_locale_is_not_cached(justwatch, capsys):
+    calls, state = justwatch
+    state["locales"] = []                        # the library falls back to en_AU
+    assert paid_dynamic.search("nosferatu", country="FR") == []
+    assert "FR" not in paid_dynamic._clients
+    state["locales"] = LOCALES
+    assert paid_dynamic.search("nosferatu", country="FR")
+    assert paid_dynamic._clients["FR"].locale == "fr_FR"
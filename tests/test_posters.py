@@ -0,0 +1,147 @@
+############################
+# Tests : posters          #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import io
+
+import pytest
+import requests
+
+from services import breaker, posters, ratelimit
+
+from .conftest import make_response
+
+URL = "https://archive.org/services/img/nosferatu"
+
+
+def _png(width=600, height=900) -> bytes:
+    Image = pytest.importorskip("PIL.Image")
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(out, "PNG")
+    return out.getvalue()
+
+
+@pytest.fixture
+def answer(monkeypatch):
+    """Set ``answer.value`` to the response (or exception) of the next download."""
+    class Answer:
+        value = None
+        calls = 0
+
+    def get(url, provider=None, **kwargs):
+        Answer.calls += 1
+        if isinstance(Answer.value, Exception):
+            raise Answer.value
+        return Answer.value
+
+    monkeypatch.setattr(posters.http_client, "get", get)
+    return Answer
+
+
+def test_thumbnail_is_cached_and_served_offline(answer):
+    png = _png()
+    answer.value = make_response(200, png)
+    data = posters.fetch(URL)
+    assert data and len(data) < len(png)
+    assert posters.get(URL) == data
+    assert posters.fetch(URL) == data and answer.calls == 1
+
+
+@pytest.mark.parametrize("failure", [
+    requests.ConnectionError("down"),
+    requests.Timeout("slow"),
+    ratelimit.RateLimitExceeded("busy"),
+    breaker.CircuitOpen("open"),
+    make_response(500),
+    make_response(503),
+    make_response(429),
+    make_response(408),
+])
+def test_transient_failures_are_retried(answer, failure):
+    answer.value = failure
+    assert posters.fetch(URL) is None
+    assert not posters._known_failure(URL)
+    answer.value = make_response(200, _png())
+    assert posters.fetch(URL) is not None
+
+
+@pytest.mark.parametrize("failure", [make_response(404), make_response(403), make_response(200, b"not an image")])
+def test_permanent_failures_are_remembered(answer, failure):
+    answer.value = failure
+    assert posters.fetch(URL) is None
+    assert posters._known_failure(URL)
+    answer.value = make_response(200, _png())
+    assert posters.fetch(URL) is None and answer.calls == 1
+
+
+def test_least_recently_served_files_are_evicted_first(answer, monkeypatch):
+    answer.value = make_response(200, _png())
+    posters.fetch(URL + "/a")
+    answer.value = make_response(200, _png(700, 900))
+    posters.fetch(URL + "/b")
+    size = posters._conn().execute("SELECT MAX(size) FROM poster_files").fetchone()[0]
+    monkeypatch.setattr(posters, "BUDGET_BYTES", int(size / 0.9) + 1)   # room for one file
+    posters._conn().execute("UPDATE poster_files SET last_access = last_access - 100 "
+                            "WHERE hash = (SELECT hash FROM poster_urls WHERE url = ?)", (URL + "/b",))
+    posters._evict()
+    assert posters.get(URL + "/a") is not None
+    assert posters.get(URL + "/b") is None
+
+
+class _Body(io.BytesIO):
+    """Response body that records how much of it was read."""
+
+    read_bytes = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.read_bytes += len(chunk)
+        return chunk
+
+
+def test_body_is_streamed_and_capped(answer, monkeypatch):
+    monkeypatch.setattr(posters, "MAX_SOURCE_BYTES", 100_000)
+    resp = make_response(200)
+    resp.raw = body = _Body(b"x" * 1_000_000)
+    answer.value = resp
+    assert posters.fetch(URL) is None
+    assert posters._known_failure(URL)
+    assert body.read_bytes <= 100_001 + posters.READ_CHUNK
+
+
+def test_announced_oversize_is_rejected_unread(answer, monkeypatch):
+    monkeypatch.setattr(posters, "MAX_SOURCE_BYTES", 100_000)
+    resp = make_response(200, headers={"Content-Length": "1000000"})
+    resp.raw = body = _Body(b"x" * 1_000_000)
+    answer.value = resp
+    assert posters.fetch(URL) is None
+    assert posters._known_failure(URL) and body.read_bytes == 0
+
+
+def test_downloads_ask_for_a_stream(answer, monkeypatch):
+    seen = {}
+
+    def get(url, provider=None, **kwargs):
+        seen.update(kwargs, provider=provider)
+        return make_response(200, _png())
+
+    monkeypatch.setattr(posters.http_client, "get", get)
+    assert posters.fetch(URL) is not None
+    assert seen == {"provider": "posters", "stream": True}
+
+
+def test_last_access_is_written_at_most_once_per_interval(answer, monkeypatch):
+    answer.value = make_response(200, _png())
+    posters.fetch(URL)
+    statements = []
+    posters._conn().set_trace_callback(statements.append)
+    for _ in range(5):
+        assert posters.get(URL) is not None
+    assert not [s for s in statements if s.startswith("UPDATE")]
+    now = posters.time.time()
+    monkeypatch.setattr(posters.time, "time", lambda: now + posters.TOUCH_INTERVAL + 1)
+    posters.get(URL)
+    posters.get(URL)
+    assert len([s for s in statements if s.startswith("UPDATE")]) == 1
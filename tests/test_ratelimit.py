@@ -0,0 +1,88 @@
+############################
+# Tests : rate limiting    #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import pytest
+
+from services import http_client, ratelimit
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept += seconds
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", c.monotonic)
+    monkeypatch.setattr(ratelimit.time, "sleep", c.sleep)
+    return c
+
+
+def test_burst_then_rate(clock):
+    bucket = ratelimit.TokenBucket(rate=2, burst=3)
+    for _ in range(3):
+        assert bucket.acquire()
+    assert clock.slept == 0
+    assert bucket.acquire()
+    assert clock.slept == pytest.approx(0.5)
+
+
+def test_timeout_refuses_without_consuming(clock):
+    bucket = ratelimit.TokenBucket(rate=1, burst=1)
+    assert bucket.acquire()
+    assert not bucket.acquire(timeout=0.5)
+    clock.now += 1
+    assert bucket.acquire(timeout=0)
+
+
+def test_pause_after_429(clock):
+    bucket = ratelimit.TokenBucket(rate=10, burst=10)
+    bucket.pause(2)
+    assert not bucket.acquire(timeout=1)
+    assert bucket.acquire(timeout=3)
+    assert clock.slept >= 2
+
+
+def test_acquire_raises_and_unknown_hosts_are_unlimited(clock):
+    ratelimit.configure("limited.example.test", 1, 1)
+    ratelimit.acquire("https://limited.example.test/a")
+    with pytest.raises(ratelimit.RateLimitExceeded):
+        ratelimit.acquire("limited.example.test", timeout=0)
+    assert ratelimit.bucket_for("free.example.test") is None
+    ratelimit.acquire("free.example.test", timeout=0)
+
+
+def test_overrides_from_environment(monkeypatch):
+    monkeypatch.setenv("MOVIEFINDER_RATE_LIMITS", "env.example.test=4/8,bad=x")
+    bucket = ratelimit.bucket_for("env.example.test")
+    assert (bucket.rate, bucket.burst) == (4.0, 8.0)
+    assert ratelimit.bucket_for("bad") is None
+
+
+@pytest.mark.parametrize("value, expected", [("3", 3.0), (" 0.5 ", 0.5), ("-2", 0.0), (None, None), ("soon", None)])
+def test_parse_retry_after(value, expected):
+    assert ratelimit.parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date(monkeypatch):
+    monkeypatch.setattr(ratelimit.time, "time", lambda: 784111767.0)   # Sun, 06 Nov 1994 08:49:27 GMT
+    assert ratelimit.parse_retry_after("Sun, 06 Nov 1994 08:49:37 GMT") == pytest.approx(10)
+
+
+def test_posters_have_their_own_bucket():
+    key = http_client.upstream_key("archive.org", "posters")
+    assert key == "posters@archive.org"
+    assert http_client.upstream_key("archive.org", "archive") == "archive.org"
+    assert ratelimit.bucket_for(key) is not ratelimit.bucket_for("archive.org")
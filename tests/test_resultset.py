@@ -0,0 +1,167 @@
+############################
+# Tests : result set       #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import threading
+import time
+
+import pytest
+
+from services import breaker, page_prep, search, tmdb
+from services.models import Movie
+from services.resultset import ResultSet
+
+
+class Pager:
+    """Fake provider: ``total`` movies served ``size`` at a time, offset cursors."""
+
+    def __init__(self, name, total, delay=0.0):
+        self.name = name
+        self.total = total
+        self.delay = delay
+        self.cursors = []
+
+    def __call__(self, query, size, cursor=None, *args):
+        self.cursors.append(cursor)
+        if self.delay:
+            time.sleep(self.delay)
+        start = cursor or 0
+        end = min(self.total, start + size)
+        movies = [Movie(f"{query} {self.name} {i}", stream_url=f"https://{self.name}/{i}", source=self.name)
+                  for i in range(start, end)]
+        return movies, (end if end < self.total else None)
+
+
+@pytest.fixture
+def pagers(monkeypatch):
+    fakes = {"archive": Pager("archive", 10), "youtube": Pager("youtube", 4)}
+    monkeypatch.setitem(search.PAGERS, "archive", fakes["archive"])
+    monkeypatch.setitem(search.PAGERS, "youtube", fakes["youtube"])
+    return fakes
+
+
+def _titles(movies):
+    return [m.title.split(" ", 1)[1] for m in movies]
+
+
+def _result_set(**kwargs):
+    return ResultSet("q", ["archive", "youtube"], page_size=3, enrich_tmdb=False, **kwargs)
+
+
+def test_rounds_are_fetched_only_when_needed(pagers):
+    rs = _result_set()
+    items, page, has_next = rs.page(1, 4)
+    assert rs.rounds == 1
+    assert _titles(items) == ["archive 0", "archive 1", "archive 2", "youtube 0"]
+    assert page == 1 and has_next
+    rs.page(1, 4)
+    assert rs.rounds == 1                       # already loaded
+    items, _, _ = rs.page(2, 4)
+    assert rs.rounds == 2
+    assert pagers["archive"].cursors == [None, 3]
+    assert pagers["youtube"].cursors == [None, 3]
+    # earlier positions never move when later pages arrive
+    assert _titles(rs.items())[:6] == ["archive 0", "archive 1", "archive 2", "youtube 0", "youtube 1", "youtube 2"]
+
+
+def test_exhausted_providers_are_not_asked_again(pagers):
+    rs = _result_set()
+    rs.ensure(100)
+    assert rs.exhausted()
+    assert len(rs.items()) == 14
+    assert pagers["youtube"].cursors == [None, 3]
+    assert pagers["archive"].cursors == [None, 3, 6, 9]
+    items, page, has_next = rs.page(99, 5)
+    assert page == 3 and not has_next and len(items) == 4
+
+
+def test_keys_restrict_paging(pagers):
+    rs = _result_set()
+    items, _, has_next = rs.page(2, 2, ["youtube"])
+    assert _titles(items) == ["youtube 2", "youtube 3"]
+    assert not has_next and rs.exhausted(["youtube"]) and not rs.exhausted()
+
+
+def test_timed_out_provider_keeps_its_cursor_until_it_answers(pagers):
+    pagers["youtube"].delay = 0.3
+    rs = _result_set(deadline_ms=100)
+    rs.fetch_round()
+    assert rs.timed_out == ["youtube"] and rs.partial
+    assert not rs.items(["youtube"])
+    pagers["youtube"].delay = 0
+    rs.fetch_round()
+    assert rs.timed_out == [] and not rs.partial
+    assert pagers["youtube"].cursors == [None, None]   # same page asked again
+    assert _titles(rs.items(["youtube"])) == ["youtube 0", "youtube 1", "youtube 2"]
+
+
+def test_open_circuit_skips_the_provider(pagers):
+    b = breaker.breaker_for("www.googleapis.com")
+    for _ in range(b.failures):
+        b.failure()
+    rs = _result_set()
+    rs.fetch_round()
+    assert rs.skipped == ["youtube"]
+    assert pagers["youtube"].cursors == []
+    breaker.reset()
+    rs.fetch_round()
+    assert rs.skipped == []
+    assert pagers["youtube"].cursors == [None]
+
+
+def test_single_prefetch_at_a_time(pagers):
+    release = threading.Event()
+    original = pagers["archive"]
+
+    def blocking(*args):
+        release.wait(5)
+        return original(*args)
+
+    search.PAGERS["archive"] = blocking
+    rs = _result_set()
+    assert rs.prefetch(1, 3)
+    assert not rs.prefetch(1, 3)                # already running
+    release.set()
+    deadline = time.monotonic() + 5
+    while rs.rounds == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    assert rs.rounds == 1
+    assert not rs.prefetch(1, 3)                # nothing left to do for that page
+    assert rs.prefetch(3, 3)
+
+
+def test_page_prep_leaves_shared_movies_untouched(pagers, monkeypatch):
+    monkeypatch.setattr(tmdb, "info_for", lambda title, year=None, strict=False: ("https://tmdb/p.jpg", 90))
+    monkeypatch.setattr(page_prep.posters, "fetch_many", lambda urls, timeout=None: {})
+    rs = _result_set()
+    items, _, _ = rs.page(1, 3)
+    cards = page_prep.prepare(items, enrich_tmdb=True, auto_translate=False)
+    assert [m.duration_minutes for m, _ in cards] == [90, 90, 90]
+    assert all(m.duration_minutes is None and m.poster_url is None for m in rs.items())
+    plain = page_prep.prepare(items, enrich_tmdb=False, auto_translate=False)
+    assert [m.duration_minutes for m, _ in plain] == [None, None, None]
+    assert all(text is not None for _, text in plain)
+
+
+def test_paging_some_providers_leaves_the_others_alone(pagers, monkeypatch):
+    paid = Pager("paid", 20)
+    monkeypatch.setitem(search.PAGERS, "paid", paid)
+    rs = ResultSet("q", ["archive", "youtube", "paid"], page_size=3, enrich_tmdb=False)
+    rs.fetch_round()
+    assert len(rs.items(["paid"])) == 3
+    rs.page(3, 3, ["archive", "youtube"])
+    assert rs.rounds == 2
+    assert paid.cursors == [None]
+    assert len(rs.items(["paid"])) == 3
+    rs.prefetch(5, 3, ["archive", "youtube"])
+    rs.ensure(12, ["archive", "youtube"])
+    assert paid.cursors == [None]
+
+
+def test_round_without_providers_fetches_nothing(pagers):
+    rs = _result_set()
+    assert rs.fetch_round(keys=["paid"]) == 0
+    assert rs.rounds == 0 and pagers["archive"].cursors == []
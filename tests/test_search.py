@@ -0,0 +1,170 @@
+############################
+# Tests : search           #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import threading
+import time
+
+import pytest
+
+from services import breaker, search
+from services.models import Movie
+
+
+class Provider:
+    """Fake provider answering ``count`` movies after ``delay`` seconds."""
+
+    def __init__(self, name, count=3, delay=0.0):
+        self.name = name
+        self.count = count
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, query, max_results, *args):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if isinstance(self.count, Exception):
+            raise self.count
+        return [Movie(f"{self.name} {i}", stream_url=f"https://{self.name}/{i}", source=self.name)
+                for i in range(min(self.count, max_results))]
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    fakes = {k: Provider(k) for k in search.DEFAULT_ORDER}
+    for k, fake in fakes.items():
+        monkeypatch.setitem(search.PROVIDERS, k, fake)
+    return fakes
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """TMDB lookups answering ``(poster, 90)``; records peak concurrency."""
+    class Lookups:
+        delay = 0.0
+        titles = []
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+    def lookup(movie):
+        with Lookups.lock:
+            Lookups.titles.append(movie.title)
+            Lookups.running += 1
+            Lookups.peak = max(Lookups.peak, Lookups.running)
+        try:
+            time.sleep(Lookups.delay)
+            return f"https://tmdb/{movie.title}.jpg", 90
+        finally:
+            with Lookups.lock:
+                Lookups.running -= 1
+
+    monkeypatch.setattr(search, "_tmdb_lookup", lookup)
+    return Lookups
+
+
+def _search(**kwargs):
+    return search._run_search("q", 20, None, kwargs.pop("enrich_tmdb", True), "films", "FR", False,
+                              kwargs.pop("enrich_workers", 8), kwargs.pop("deadline_ms", None))
+
+
+# ── Enrichment stage ───────────────────────────────────────────────────────
+def test_free_results_are_enriched(providers, lookups):
+    results = _search()
+    assert [m.duration_minutes for m in results["archive"] + results["youtube"]] == [90] * 6
+    assert results["archive"][0].poster_url == "https://tmdb/archive 0.jpg"
+    assert all(m.duration_minutes is None for m in results["paid"])
+    assert sorted(lookups.titles) == sorted(f"{k} {i}" for k in ("archive", "youtube") for i in range(3))
+
+
+def test_enrichment_is_bounded_by_its_workers(providers, lookups):
+    providers["archive"].count = 12
+    lookups.delay = 0.02
+    _search(enrich_workers=3)
+    assert lookups.peak <= 3
+    assert len(lookups.titles) == 15
+
+
+def test_no_enrichment_while_tmdb_is_down(providers, lookups):
+    b = breaker.breaker_for(search.TMDB_HOST)
+    for _ in range(b.failures):
+        b.failure()
+    results = _search()
+    assert lookups.titles == []
+    assert len(results["archive"]) == 3
+
+
+def test_enrichment_can_be_disabled(providers, lookups):
+    results = _search(enrich_tmdb=False)
+    assert lookups.titles == [] and results["archive"][0].duration_minutes is None
+
+
+# ── Streaming ──────────────────────────────────────────────────────────────
+def test_providers_are_yielded_in_completion_order(providers, lookups):
+    providers["archive"].delay = 0.2
+    providers["youtube"].delay = 0.1
+    keys = [k for k, _ in search.iter_search("q")]
+    assert keys == ["paid", "youtube", "archive"]
+
+
+def test_provider_is_yielded_once_its_lookups_are_done(providers, lookups):
+    lookups.delay = 0.05
+    for key, movies in search.iter_search("q"):
+        assert all(m.duration_minutes == 90 for m in movies) or key == "paid"
+
+
+def test_results_fill_in_as_providers_arrive(providers, lookups):
+    results = search.SearchResults()
+    seen = []
+    for key, _ in search.iter_search("q", enrich_tmdb=False, results=results):
+        seen.append(sorted(results))
+    assert seen[-1] == ["archive", "paid", "youtube"]
+    assert [len(s) for s in seen] == [1, 2, 3]
+
+
+def test_failing_provider_yields_an_empty_list(providers, lookups):
+    providers["youtube"].count = RuntimeError("quota")
+    out = dict(search.iter_search("q", enrich_tmdb=False))
+    assert out["youtube"] == [] and len(out["archive"]) == 3
+
+
+def test_run_search_keeps_the_requested_order(providers, lookups):
+    providers["archive"].delay = 0.1
+    assert list(_search(enrich_tmdb=False)) == ["archive", "youtube", "paid"]
+
+
+# ── Deadline ───────────────────────────────────────────────────────────────
+def test_deadline_returns_partial_results(providers, lookups):
+    providers["youtube"].delay = 0.5
+    start = time.monotonic()
+    results = _search(enrich_tmdb=False, deadline_ms=100)
+    assert time.monotonic() - start < 0.4
+    assert results.timed_out == ["youtube"] and results.partial
+    assert list(results) == ["archive", "paid"]
+
+
+def test_deadline_keeps_finished_enrichment(providers, lookups):
+    lookups.delay = 0.5
+    results = _search(deadline_ms=100)
+    assert results.timed_out == []
+    assert len(results["archive"]) == 3
+    assert all(m.duration_minutes is None for m in results["archive"])
+
+
+def test_no_deadline_waits_for_everyone(providers, lookups):
+    providers["youtube"].delay = 0.2
+    results = _search(enrich_tmdb=False)
+    assert results.timed_out == [] and not results.partial
+    assert len(results["youtube"]) == 3
+
+
+def test_timeouts_are_counted(providers, lookups):
+    from services import metrics
+
+    providers["paid"].delay = 0.5
+    _search(enrich_tmdb=False, deadline_ms=50)
+    counters = {(r["metric"], r.get("provider")): r["value"] for r in metrics.snapshot()["counters"]}
+    assert counters[("provider_timeouts_total", "paid")] == 1
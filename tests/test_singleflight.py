@@ -0,0 +1,103 @@
+############################
+# Tests : singleflight     #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import copy
+import threading
+import time
+
+import pytest
+
+from services import singleflight
+
+
+def _run_concurrently(group, n, fn, key="k"):
+    """Start ``n`` callers; the first one is the leader. Returns results/errors in order."""
+    out = [None] * n
+
+    def call(i):
+        try:
+            out[i] = group.do(key, fn)
+        except BaseException as err:
+            out[i] = err
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(n)]
+    threads[0].start()
+    while group.in_flight() == 0:
+        time.sleep(0.001)
+    for t in threads[1:]:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return out
+
+
+def _slow(result, calls, delay=0.1):
+    def fn():
+        calls.append(1)
+        time.sleep(delay)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+    return fn
+
+
+def test_concurrent_calls_share_one_execution():
+    group = singleflight.Group()
+    calls = []
+    out = _run_concurrently(group, 4, _slow({"x": [1]}, calls))
+    assert len(calls) == 1
+    assert all(o is out[0] for o in out)
+    assert group.in_flight() == 0
+
+
+def test_share_gives_waiters_their_own_copy():
+    calls = []
+    out = _run_concurrently(singleflight.Group(share=copy.deepcopy), 3, _slow({"x": [1]}, calls))
+    assert len(calls) == 1
+    assert out[0] == out[1] == out[2]
+    assert len({id(o) for o in out}) == 3
+    out[1]["x"].append(2)
+    assert out[0] == {"x": [1]}
+
+
+def test_errors_reach_every_waiter():
+    calls = []
+    out = _run_concurrently(singleflight.Group(), 3, _slow(ValueError("boom"), calls))
+    assert len(calls) == 1
+    assert all(isinstance(o, ValueError) for o in out)
+
+
+def test_interrupted_leader_makes_waiters_retry():
+    calls = []
+
+    class Stop(BaseException):
+        pass
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.1)
+        if len(calls) == 1:
+            raise Stop()
+        return "ok"
+
+    out = _run_concurrently(singleflight.Group(), 3, fn)
+    assert isinstance(out[0], Stop)
+    assert out[1:] == ["ok", "ok"]
+
+
+def test_nothing_is_kept_after_the_call():
+    group = singleflight.Group()
+    calls = []
+    assert group.do("k", lambda: calls.append(1) or len(calls)) == 1
+    assert group.do("k", lambda: calls.append(1) or len(calls)) == 2
+
+
+@pytest.mark.parametrize("a, b, same", [
+    ("  nosferatu\t 1922 ", "nosferatu 1922", True),
+    ("Nosferatu", "nosferatu", False),   # results may echo the query's case
+])
+def test_normalize(a, b, same):
+    assert (singleflight.normalize(a) == singleflight.normalize(b)) is same
@@ -0,0 +1,116 @@
+############################
+# Tests : TMDB             #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import json
+
+import pytest
+import requests
+
+from services import tmdb, tmdb_cache
+from services.models import Movie
+
+from .conftest import make_response
+
+
+@pytest.fixture
+def tmdb_api(monkeypatch):
+    """Route TMDB calls to ``answers``: {"search": response, "details": response}."""
+    monkeypatch.setenv("TMDB_API_KEY", "test")
+    answers = {}
+
+    def get(url, provider=None, **kwargs):
+        answer = answers["search" if url.endswith("/search/movie") else "details"]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    monkeypatch.setattr(tmdb.http_client, "get", get)
+    return answers
+
+
+def _json(status, payload):
+    return make_response(status, json.dumps(payload).encode())
+
+
+def test_found_title_is_cached(tmdb_api):
+    tmdb_api["search"] = _json(200, {"results": [{"id": 7, "poster_path": "/p.jpg"}]})
+    tmdb_api["details"] = _json(200, {"runtime": 94})
+    assert tmdb.info_for("Nosferatu") == (tmdb.IMG + "/p.jpg", 94)
+    assert tmdb_cache.get("Nosferatu") == ("/p.jpg", 94)
+
+
+def test_empty_results_are_cached_as_a_miss(tmdb_api):
+    tmdb_api["search"] = _json(200, {"results": []})
+    assert tmdb.info_for("Nosferatu") == (None, None)
+    assert tmdb_cache.get("Nosferatu") is None
+
+
+@pytest.mark.parametrize("status", [401, 429, 500, 503])
+def test_search_errors_are_not_cached(tmdb_api, status):
+    tmdb_api["search"] = _json(status, {"status_message": "nope"})
+    assert tmdb.info_for("Nosferatu") == (None, None)
+    assert tmdb_cache.get("Nosferatu") is tmdb_cache.MISSING
+
+
+def test_body_without_results_is_an_error(tmdb_api):
+    tmdb_api["search"] = _json(200, {"status_message": "nope"})
+    with pytest.raises(ValueError):
+        tmdb._fetch("test", "Nosferatu", None)
+
+
+def test_network_error_is_not_cached(tmdb_api):
+    tmdb_api["search"] = requests.ConnectionError("down")
+    assert tmdb.info_for("Nosferatu") == (None, None)
+    assert tmdb_cache.get("Nosferatu") is tmdb_cache.MISSING
+
+
+def test_failed_details_are_not_cached(tmdb_api):
+    tmdb_api["search"] = _json(200, {"results": [{"id": 7, "poster_path": "/p.jpg"}]})
+    tmdb_api["details"] = _json(429, {})
+    info, complete = tmdb._fetch("test", "Nosferatu", None)
+    assert info == ("/p.jpg", None) and not complete
+    assert tmdb.info_for("Nosferatu") == (tmdb.IMG + "/p.jpg", None)
+    assert tmdb_cache.get("Nosferatu") is tmdb_cache.MISSING
+
+
+def test_negative_entries_expire(monkeypatch):
+    tmdb_cache.put("Nosferatu", 1922, None)
+    assert tmdb_cache.get("Nosferatu", 1922) is None
+    now = tmdb_cache.time.time()
+    monkeypatch.setattr(tmdb_cache.time, "time", lambda: now + tmdb_cache.NEGATIVE_TTL + 1)
+    assert tmdb_cache.get("Nosferatu", 1922) is tmdb_cache.MISSING
+
+
+def test_cache_key_ignores_case_and_spacing():
+    assert tmdb_cache.make_key("  The   Kid ", 1921) == tmdb_cache.make_key("the kid", 1921)
+
+
+def test_enriched_returns_a_copy():
+    movie = Movie("Nosferatu", duration_minutes=None, poster_url="own.jpg")
+    out = tmdb.enriched(movie, ("tmdb.jpg", 94))
+    assert out is not movie
+    assert (out.poster_url, out.duration_minutes) == ("own.jpg", 94)
+    assert movie.duration_minutes is None
+    assert tmdb.enriched(movie, (None, None)) is movie
+
+
+def test_unusable_cache_dir_is_a_cache_miss(tmdb_api, monkeypatch):
+    def no_dir():
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(tmdb_cache.storage, "cache_dir", no_dir)
+    tmdb_api["search"] = _json(200, {"results": [{"id": 7, "poster_path": "/p.jpg"}]})
+    tmdb_api["details"] = _json(200, {"runtime": 94})
+    assert tmdb.info_for("Nosferatu") == (tmdb.IMG + "/p.jpg", 94)
+
+
+def test_lookups_run_no_ddl():
+    tmdb_cache.put("Nosferatu", 1922, ("/p.jpg", 94))
+    statements = []
+    tmdb_cache._conn().set_trace_callback(statements.append)
+    assert tmdb_cache.get("Nosferatu", 1922) == ("/p.jpg", 94)
+    tmdb_cache.put("Metropolis", 1927, None)
+    assert not [s for s in statements if "CREATE" in s.upper()]
@@ -0,0 +1,87 @@
+############################
+# Tests : tracing          #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+import json
+import pstats
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services import search, tracing
+from services.models import Movie
+
+
+def test_spans_outside_a_trace_record_nothing():
+    with tracing.span("tmdb", title="x") as sp:
+        sp.set(cached=True)
+        assert tracing.current() is None
+
+
+def test_nested_spans_and_recent_traces():
+    with tracing.span("run_search", root=True, query="q") as root:
+        with tracing.span("provider:archive") as child:
+            child.set(results=3)
+    assert tracing.recent()[0] is root
+    d = root.to_dict()
+    assert d["name"] == "run_search" and d["attrs"] == {"query": "q"}
+    assert [c["name"] for c in d["children"]] == ["provider:archive"]
+    assert d["children"][0]["attrs"] == {"results": 3}
+    assert not d["unfinished"] and d["duration_ms"] >= d["children"][0]["duration_ms"]
+
+
+def test_submit_attaches_worker_spans_to_their_parent():
+    def work(i):
+        with tracing.span(f"store:{i}"):
+            return i
+
+    with tracing.span("fetch_round", root=True) as root, ThreadPoolExecutor(2) as ex:
+        assert [f.result() for f in [tracing.submit(ex, work, i) for i in range(2)]] == [0, 1]
+    assert sorted(c.name for c in root.children) == ["store:0", "store:1"]
+    assert all(c.thread != root.thread for c in root.children)
+
+
+def test_errors_are_recorded():
+    with pytest.raises(ValueError):
+        with tracing.span("run_search", root=True) as root:
+            with tracing.span("provider:youtube"):
+                raise ValueError("quota")
+    assert root.children[0].error == "ValueError('quota')"
+    assert "provider:youtube !ValueError('quota')" in tracing.waterfall(root)
+
+
+def test_outputs():
+    with tracing.span("run_search", root=True, query="q") as root:
+        with tracing.span("tmdb", movie=Movie("Nosferatu")):
+            pass
+    data = json.loads(tracing.to_json(root))
+    assert isinstance(data["children"][0]["attrs"]["movie"], str)
+    lines = tracing.waterfall(root, width=10).splitlines()
+    assert len(lines) == 2
+    assert lines[0].endswith("run_search query=q") and "  tmdb movie=" in lines[1]
+
+
+def test_run_search_is_traced(monkeypatch):
+    for k in search.DEFAULT_ORDER:
+        monkeypatch.setitem(search.PROVIDERS, k, lambda *args: [])
+    search._run_search("q", 5, None, False, "films", "FR", False, 2, None)
+    root = tracing.recent()[0]
+    assert root.name == "run_search"
+    assert sorted(c.name for c in root.children) == ["provider:archive", "provider:paid", "provider:youtube"]
+
+
+def test_profiling_is_opt_in(tmp_path, monkeypatch):
+    with tracing.profiled("q") as path:
+        assert path is None
+    monkeypatch.setenv("MOVIEFINDER_PROFILE", str(tmp_path))
+
+    def work():
+        return sum(range(1000))
+
+    with tracing.profiled("nosferatu 1922") as path, ThreadPoolExecutor(1) as ex:
+        tracing.submit(ex, work).result()
+    assert path.startswith(str(tmp_path)) and path.endswith("-nosferatu_1922.prof")
+    stats = pstats.Stats(path)
+    assert any(name == "work" for _, _, name in stats.stats)
@@ -0,0 +1,64 @@
+############################
+# Tests : translations     #
+#                          #
+# Last update : 2026/10/18 #
+############################
+
+from services import i18n, translation_memory
+
+
+def test_round_trip():
+    assert translation_memory.get("A silent film.") is None
+    translation_memory.put("A silent film.", "Un film muet.", engine="google")
+    assert translation_memory.get("A silent film.") == "Un film muet."
+    assert translation_memory.get("A silent film.", target="de") is None
+
+
+def test_key_ignores_spacing_but_not_target():
+    assert translation_memory.make_key("  A  silent\nfilm. ", "fr") == translation_memory.make_key("A silent film.", "FR")
+    assert translation_memory.make_key("A silent film.", "fr") != translation_memory.make_key("A silent film.", "de")
+
+
+def test_empty_translations_are_not_stored():
+    translation_memory.put("A silent film.", "", engine="google")
+    assert translation_memory.get("A silent film.") is None
+
+
+def test_translate_to_fr_reads_the_memory_first(monkeypatch):
+    translation_memory.put("A silent film.", "Un film muet.", engine="google")
+    monkeypatch.setattr(i18n, "_google_translator", lambda: None)
+    assert i18n.translate_to_fr("A silent film.") == "Un film muet."
+
+
+def test_translate_to_fr_remembers_new_translations(monkeypatch):
+    calls = []
+
+    class Translator:
+        def __init__(self, source, target):
+            pass
+
+        def translate(self, text):
+            calls.append(text)
+            return "Un film muet."
+
+    monkeypatch.setattr(i18n, "_google_translator", lambda: Translator)
+    assert i18n.translate_to_fr("A silent film.") == "Un film muet."
+    assert i18n.translate_to_fr("A silent film.") == "Un film muet."
+    assert calls == ["A silent film."]
+
+
+def test_unusable_cache_dir_is_a_miss(monkeypatch):
+    def no_dir():
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(translation_memory.storage, "cache_dir", no_dir)
+    translation_memory.put("A silent film.", "Un film muet.", engine="google")
+    assert translation_memory.get("A silent film.") is None
+
+
+def test_lookups_run_no_ddl():
+    translation_memory.put("A silent film.", "Un film muet.", engine="google")
+    statements = []
+    translation_memory._conn().set_trace_callback(statements.append)
+    assert translation_memory.get("A silent film.") == "Un film muet."
+    assert not [s for s in statements if "CREATE" in s.upper()]